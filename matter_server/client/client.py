@@ -21,9 +21,11 @@ from ..common.helpers.util import (
 )
 from ..common.models import (
     APICommand,
+    AttributeAggregate,
     CommandMessage,
     CommissionableNodeData,
     CommissioningParameters,
+    ConnectionOptions,
     ErrorResultMessage,
     EventMessage,
     EventType,
@@ -31,10 +33,13 @@ from ..common.models import (
     MatterNodeEvent,
     MatterSoftwareVersion,
     MessageType,
+    NetworkType,
+    NodeEventLogPage,
     NodePingResult,
     ResultMessageBase,
     ServerDiagnostics,
     ServerInfoMessage,
+    ServerMetrics,
     SuccessResultMessage,
 )
 from .connection import MatterClientConnection
@@ -42,7 +47,6 @@ from .exceptions import ConnectionClosed, InvalidState, ServerVersionTooOld
 from .models.node import (
     MatterFabricData,
     MatterNode,
-    NetworkType,
     NodeDiagnostics,
     NodeType,
 )
@@ -62,9 +66,17 @@ SUB_WILDCARD: Final = "*"
 class MatterClient:
     """Manage a Matter server over WebSockets."""
 
-    def __init__(self, ws_server_url: str, aiohttp_session: ClientSession):
+    def __init__(
+        self,
+        ws_server_url: str,
+        aiohttp_session: ClientSession,
+        connection_options: ConnectionOptions | None = None,
+        binary: bool = False,
+    ):
         """Initialize the Client class."""
-        self.connection = MatterClientConnection(ws_server_url, aiohttp_session)
+        self.connection = MatterClientConnection(
+            ws_server_url, aiohttp_session, connection_options, binary
+        )
         self.logger = logging.getLogger(__package__)
         self._nodes: dict[int, MatterNode] = {}
         self._result_futures: dict[str, asyncio.Future] = {}
@@ -473,14 +485,28 @@ class MatterClient:
         self,
         node_id: int,
         attribute_path: str | list[str],
+        max_age: float | None = None,
     ) -> dict[str, Any]:
-        """Read one or more attribute(s) on a node by specifying an attributepath."""
-        updated_values = await self.send_command(
-            APICommand.READ_ATTRIBUTE,
-            require_schema=9,
-            node_id=node_id,
-            attribute_path=attribute_path,
-        )
+        """Read one or more attribute(s) on a node by specifying an attributepath.
+
+        If max_age (in seconds) is provided, the server may answer from its cache for
+        attribute paths that were reported by the node less than max_age seconds ago.
+        """
+        if max_age is None:
+            updated_values = await self.send_command(
+                APICommand.READ_ATTRIBUTE,
+                require_schema=9,
+                node_id=node_id,
+                attribute_path=attribute_path,
+            )
+        else:
+            updated_values = await self.send_command(
+                APICommand.READ_ATTRIBUTE,
+                require_schema=12,
+                node_id=node_id,
+                attribute_path=attribute_path,
+                max_age=max_age,
+            )
         return cast(dict[str, Any], updated_values)
 
     async def refresh_attribute(
@@ -606,6 +632,99 @@ class MatterClient:
         data = await self.send_command(APICommand.SERVER_DIAGNOSTICS)
         return dataclass_from_dict(ServerDiagnostics, data)
 
+    async def set_attribute_subscriptions(
+        self, node_id: int, attribute_paths: list[str]
+    ) -> None:
+        """
+        Set the attribute paths the server subscribes to for a node.
+
+        An empty list resets the node to subscribe to all (not excluded) clusters.
+        """
+        await self.send_command(
+            APICommand.SET_ATTRIBUTE_SUBSCRIPTIONS,
+            require_schema=12,
+            node_id=node_id,
+            attribute_paths=attribute_paths,
+        )
+
+    async def get_attribute_history(
+        self,
+        node_id: int,
+        attribute_paths: list[str],
+        start: float | None = None,
+        end: float | None = None,
+    ) -> dict[str, list[tuple[float, float | None]]]:
+        """
+        Return the recorded history of attribute(s) of a node.
+
+        Returns a dictionary with the attribute path as key and a list of
+        (timestamp, value) samples (oldest first) as value.
+        """
+        data = await self.send_command(
+            APICommand.GET_ATTRIBUTE_HISTORY,
+            require_schema=12,
+            node_id=node_id,
+            attribute_paths=attribute_paths,
+            start=start,
+            end=end,
+        )
+        return {
+            attribute_path: [(sample[0], sample[1]) for sample in samples]
+            for attribute_path, samples in data.items()
+        }
+
+    async def get_attribute_aggregates(
+        self, node_id: int, attribute_paths: list[str]
+    ) -> dict[str, list[AttributeAggregate]]:
+        """Return the rolling (min/max/mean/last) aggregates of attribute(s) of a node."""
+        data = await self.send_command(
+            APICommand.GET_ATTRIBUTE_AGGREGATES,
+            require_schema=12,
+            node_id=node_id,
+            attribute_paths=attribute_paths,
+        )
+        return {
+            attribute_path: [
+                dataclass_from_dict(AttributeAggregate, aggregate)
+                for aggregate in aggregates
+            ]
+            for attribute_path, aggregates in data.items()
+        }
+
+    async def get_node_events(
+        self,
+        node_id: int | None = None,
+        cluster_id: int | None = None,
+        event_id: int | None = None,
+        since_event_number: int | None = None,
+        since_timestamp: int | None = None,
+        cursor: int | None = None,
+        limit: int = 100,
+    ) -> NodeEventLogPage:
+        """
+        Return (a page of) the node events logged by the server, oldest first.
+
+        To get the next page, pass the cursor of the returned page (with the same
+        filters).
+        """
+        data = await self.send_command(
+            APICommand.GET_NODE_EVENTS,
+            require_schema=12,
+            node_id=node_id,
+            cluster_id=cluster_id,
+            event_id=event_id,
+            since_event_number=since_event_number,
+            since_timestamp=since_timestamp,
+            cursor=cursor,
+            limit=limit,
+        )
+        return dataclass_from_dict(NodeEventLogPage, data)
+
+    async def get_metrics(self) -> ServerMetrics:
+        """Return runtime metrics of the server."""
+        data = await self.send_command(APICommand.GET_METRICS, require_schema=12)
+        return dataclass_from_dict(ServerMetrics, data)
+
     async def connect(self) -> None:
         """Connect to the Matter Server (over Websockets)."""
         self._loop = asyncio.get_running_loop()
@@ -2,19 +2,35 @@
 
 from __future__ import annotations
 
+from collections import deque
 import logging
 import os
 import pprint
-from typing import Final, cast
-
-from aiohttp import ClientSession, ClientWebSocketResponse, WSMsgType, client_exceptions
+from typing import Any, Final, cast
+import uuid
+
+from aiohttp import (
+    ClientSession,
+    ClientWebSocketResponse,
+    UnixConnector,
+    WSMsgType,
+    client_exceptions,
+)
 
-from matter_server.common.helpers.util import dataclass_from_dict
+from matter_server.common.helpers.util import dataclass_from_dict, dataclass_to_dict
 
 from ..common.const import SCHEMA_VERSION
 from ..common.helpers.json import json_dumps, json_loads
+from ..common.helpers.msgpack import (
+    MSGPACK_PROTOCOL,
+    msgpack_available,
+    msgpack_dumps,
+    msgpack_loads,
+)
 from ..common.models import (
+    APICommand,
     CommandMessage,
+    ConnectionOptions,
     ErrorResultMessage,
     EventMessage,
     MessageType,
@@ -35,6 +51,9 @@ from .exceptions import (
 LOGGER = logging.getLogger(f"{__package__}.connection")
 VERBOSE_LOGGER = os.environ.get("MATTER_VERBOSE_LOGGING")
 SUB_WILDCARD: Final = "*"
+# url scheme to connect over a unix domain socket, e.g. unix:///run/matter.sock
+UNIX_SOCKET_SCHEME: Final = "unix://"
+UNIX_SOCKET_WS_URL: Final = "http://localhost/ws"
 
 
 class MatterClientConnection:
@@ -44,13 +63,25 @@ class MatterClientConnection:
         self,
         ws_server_url: str,
         aiohttp_session: ClientSession,
+        options: ConnectionOptions | None = None,
+        binary: bool = False,
     ):
         """Initialize the Client class."""
         self.ws_server_url = ws_server_url
+        # negotiate MessagePack (binary) frames on connect (if msgpack is installed)
+        self.binary = binary and msgpack_available()
+        # whether the server accepted MessagePack frames for the connection
+        self._binary = False
+        # options of the connection, which are sent to the server on connect
+        self.options = options
         # server info is retrieved on connect
         self.server_info: ServerInfoMessage | None = None
         self._aiohttp_session = aiohttp_session
+        # session (with unix connector) owned by the connection for unix:// urls
+        self._unix_session: ClientSession | None = None
         self._ws_client: ClientWebSocketResponse | None = None
+        # messages received in the same (coalesced) frame, not yet returned
+        self._received: deque[MessageType] = deque()
 
     @property
     def connected(self) -> bool:
@@ -63,18 +94,32 @@ class MatterClientConnection:
             raise InvalidState("Already connected")
 
         LOGGER.debug("Trying to connect")
+        session = self._aiohttp_session
+        url = self.ws_server_url
+        if url.startswith(UNIX_SOCKET_SCHEME):
+            if self._unix_session is None:
+                self._unix_session = ClientSession(
+                    connector=UnixConnector(path=url[len(UNIX_SOCKET_SCHEME) :])
+                )
+            session = self._unix_session
+            url = UNIX_SOCKET_WS_URL
         try:
-            self._ws_client = await self._aiohttp_session.ws_connect(
-                self.ws_server_url,
+            self._ws_client = await session.ws_connect(
+                url,
                 heartbeat=55,
                 compress=15,
                 max_msg_size=0,
+                protocols=(MSGPACK_PROTOCOL,) if self.binary else (),
             )
         except (
             client_exceptions.WSServerHandshakeError,
             client_exceptions.ClientError,
         ) as err:
+            if self._unix_session is not None:
+                await self._unix_session.close()
+                self._unix_session = None
             raise CannotConnect(err) from err
+        self._binary = self._ws_client.protocol == MSGPACK_PROTOCOL
 
         # at connect, the server sends a single message with the server info
         info = cast(ServerInfoMessage, await self.receive_message_or_raise())
@@ -106,16 +151,25 @@ class MatterClientConnection:
             info.sdk_version,
         )
 
+        if self.options is not None:
+            await self._set_options(self.options)
+
     async def disconnect(self) -> None:
         """Disconnect the client."""
         LOGGER.debug("Closing client connection")
         if self._ws_client is not None and not self._ws_client.closed:
             await self._ws_client.close()
         self._ws_client = None
+        if self._unix_session is not None:
+            await self._unix_session.close()
+            self._unix_session = None
+        self._received.clear()
 
     async def receive_message_or_raise(self) -> MessageType:
         """Receive (raw) message or raise."""
         assert self._ws_client
+        if self._received:
+            return self._received.popleft()
         ws_msg = await self._ws_client.receive()
 
         if ws_msg.type in (WSMsgType.CLOSE, WSMsgType.CLOSED, WSMsgType.CLOSING):
@@ -124,13 +178,23 @@ class MatterClientConnection:
         if ws_msg.type == WSMsgType.ERROR:
             raise ConnectionFailed
 
-        if ws_msg.type != WSMsgType.TEXT:
+        if ws_msg.type != (WSMsgType.BINARY if self._binary else WSMsgType.TEXT):
             raise InvalidMessage(
-                f"Received non-Text message: {ws_msg.type}: {ws_msg.data}"
+                f"Received unexpected message: {ws_msg.type}: {ws_msg.data}"
             )
 
         try:
-            msg = parse_message(json_loads(ws_msg.data))
+            raw: Any = (
+                msgpack_loads(ws_msg.data) if self._binary else json_loads(ws_msg.data)
+            )
+            if isinstance(raw, list):
+                # multiple messages coalesced into a single frame
+                self._received.extend(parse_message(x) for x in raw)
+                msg = self._received.popleft()
+            else:
+                msg = parse_message(raw)
+        except IndexError as err:
+            raise InvalidMessage("Received empty list of messages.") from err
         except TypeError as err:
             raise InvalidMessage(f"Received unsupported JSON: {err}") from err
         except ValueError as err:
@@ -156,7 +220,26 @@ class MatterClientConnection:
         assert self._ws_client
         assert isinstance(message, CommandMessage)
 
-        await self._ws_client.send_json(message, dumps=json_dumps)
+        if self._binary:
+            await self._ws_client.send_bytes(msgpack_dumps(message))
+        else:
+            await self._ws_client.send_json(message, dumps=json_dumps)
+
+    async def _set_options(self, options: ConnectionOptions) -> None:
+        """Send the connection options to the server (before listening to events)."""
+        message_id = uuid.uuid4().hex
+        await self.send_message(
+            CommandMessage(
+                message_id=message_id,
+                command=APICommand.SET_CONNECTION_OPTIONS,
+                args=dataclass_to_dict(options),
+            )
+        )
+        msg = await self.receive_message_or_raise()
+        if isinstance(msg, ErrorResultMessage) and msg.message_id == message_id:
+            LOGGER.warning("Unable to set connection options: %s", msg.details)
+        elif isinstance(msg, SuccessResultMessage) and msg.message_id == message_id:
+            self.options = dataclass_from_dict(ConnectionOptions, msg.result)
 
     def __repr__(self) -> str:
         """Return the representation."""
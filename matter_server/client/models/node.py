@@ -15,6 +15,7 @@ from matter_server.common.helpers.util import (
     parse_attribute_path,
     parse_value,
 )
+from matter_server.common.models import NetworkType  # noqa: TC001 needed to resolve type hints
 
 from .device_types import (
     ALL_TYPES as DEVICE_TYPES,
@@ -379,15 +380,6 @@ class NodeType(Enum):
     UNKNOWN = "unknown"
 
 
-class NetworkType(Enum):
-    """Custom Enum with Matter network types used for diagnostics.."""
-
-    THREAD = "thread"
-    WIFI = "wifi"
-    ETHERNET = "ethernet"
-    UNKNOWN = "unknown"
-
-
 @dataclass
 class NodeDiagnostics:
     """
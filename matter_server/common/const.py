@@ -2,7 +2,7 @@
 
 # schema version is used to determine compatibility between server and client
 # bump schema if we add new features and/or make other (breaking) changes
-SCHEMA_VERSION = 11
+SCHEMA_VERSION = 12
 
 
 VERBOSE_LOG_LEVEL = 5
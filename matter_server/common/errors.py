@@ -89,6 +89,24 @@ class UpdateError(MatterError):
     error_code = 11
 
 
+class NodeBusy(MatterError):
+    """Error raised when too many interactions with a node are pending."""
+
+    error_code = 12
+
+
+class ServerBusy(MatterError):
+    """Error raised when too many interactions on a network are pending."""
+
+    error_code = 13
+
+
+class UpstreamNotConnected(MatterError):
+    """Error raised when a relay is not connected to the upstream server."""
+
+    error_code = 14
+
+
 def exception_from_error_code(error_code: int) -> type[MatterError]:
     """Return correct Exception class from error_code."""
     return ERROR_MAP.get(error_code, MatterError)
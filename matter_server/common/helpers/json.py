@@ -36,13 +36,14 @@ def json_encoder_default(obj: Any) -> Any:
     raise TypeError
 
 
-def json_dumps(data: Any) -> str:
-    """Dump json string."""
-    return orjson.dumps(
-        data,
-        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2,
-        default=json_encoder_default,
-    ).decode("utf-8")
+def json_dumps(data: Any, indent: bool = False) -> str:
+    """Dump json string (compact, unless indent is set)."""
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(data, option=option, default=json_encoder_default).decode(
+        "utf-8"
+    )
 
 
 json_loads = orjson.loads
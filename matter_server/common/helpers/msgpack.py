@@ -0,0 +1,64 @@
+"""Helpers to work with (de)serializing of MessagePack (binary websocket frames)."""
+
+from __future__ import annotations
+
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Final
+
+from .json import json_encoder_default
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+# websocket subprotocol of the MessagePack encoded API
+MSGPACK_PROTOCOL: Final = "matter.msgpack"
+
+# field names per dataclass (resolving the fields is relatively slow)
+_FIELD_NAMES: dict[type, tuple[str, ...]] = {}
+
+
+def msgpack_available() -> bool:
+    """Return if the (optional) msgpack package is installed."""
+    return msgpack is not None
+
+
+def msgpack_encoder_default(obj: Any) -> Any:
+    """Convert the objects MessagePack can not serialize natively."""
+    if (names := _FIELD_NAMES.get(type(obj))) is not None:
+        return {name: getattr(obj, name) for name in names}
+    if isinstance(obj, Enum):
+        return obj.value
+    if getattr(obj, "do_not_serialize", None):
+        return None
+    if is_dataclass(obj) and not isinstance(obj, type):
+        names = _FIELD_NAMES[type(obj)] = tuple(field.name for field in fields(obj))
+        return {name: getattr(obj, name) for name in names}
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return json_encoder_default(obj)
+
+
+def msgpack_dumps(data: Any) -> bytes:
+    """Dump MessagePack bytes (bytes values are kept as binary)."""
+    assert msgpack is not None
+    result: bytes = msgpack.packb(
+        data, default=msgpack_encoder_default, use_bin_type=True
+    )
+    return result
+
+
+def msgpack_loads(data: bytes) -> Any:
+    """Load MessagePack bytes."""
+    assert msgpack is not None
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def msgpack_array(items: list[bytes]) -> bytes:
+    """Return a MessagePack array of (already) packed items."""
+    assert msgpack is not None
+    header: bytes = msgpack.Packer().pack_array_header(len(items))
+    return header + b"".join(items)
@@ -76,6 +76,18 @@ def parse_attribute_path(
     return (endpoint_id, cluster_id, attribute_id)
 
 
+def attribute_path_matches(pattern: str, attribute_path: str) -> bool:
+    """Return True if the (concrete) attribute path matches the (wildcard) pattern."""
+    return all(
+        pattern_part is None or pattern_part == path_part
+        for pattern_part, path_part in zip(
+            parse_attribute_path(pattern),
+            parse_attribute_path(attribute_path),
+            strict=True,
+        )
+    )
+
+
 def dataclass_to_dict(obj_in: DataclassInstance) -> dict:
     """Convert dataclass instance to dict."""
 
@@ -23,6 +23,16 @@ class EventType(Enum):
     SERVER_INFO_UPDATED = "server_info_updated"
     ENDPOINT_ADDED = "endpoint_added"
     ENDPOINT_REMOVED = "endpoint_removed"
+    NODE_SETUP_PROGRESS = "node_setup_progress"
+
+
+class NetworkType(Enum):
+    """Enum with the Matter network types (for diagnostics and admission control)."""
+
+    THREAD = "thread"
+    WIFI = "wifi"
+    ETHERNET = "ethernet"
+    UNKNOWN = "unknown"
 
 
 class APICommand(str, Enum):
@@ -53,6 +63,12 @@ class APICommand(str, Enum):
     SET_DEFAULT_FABRIC_LABEL = "set_default_fabric_label"
     SET_ACL_ENTRY = "set_acl_entry"
     SET_NODE_BINDING = "set_node_binding"
+    GET_METRICS = "get_metrics"
+    SET_ATTRIBUTE_SUBSCRIPTIONS = "set_attribute_subscriptions"
+    GET_ATTRIBUTE_HISTORY = "get_attribute_history"
+    GET_ATTRIBUTE_AGGREGATES = "get_attribute_aggregates"
+    GET_NODE_EVENTS = "get_node_events"
+    SET_CONNECTION_OPTIONS = "set_connection_options"
 
 
 EventCallBackType = Callable[[EventType, Any], None]
@@ -107,6 +123,17 @@ class MatterNodeEvent:
     data: dict[str, Any] | None
 
 
+@dataclass
+class NodeEventLogPage:
+    """A page of (filtered) events from the node event log."""
+
+    events: list[MatterNodeEvent]
+    # whether more events match the filters (pass the cursor to continue)
+    more: bool
+    # (opaque) position of the last returned event, to request the next page
+    cursor: int | None = None
+
+
 @dataclass
 class ServerDiagnostics:
     """Full dump of the server information and data."""
@@ -119,9 +146,140 @@ class ServerDiagnostics:
 NodePingResult = dict[str, bool]
 
 
+@dataclass
+class NodeInteractionQueueMetrics:
+    """Metrics of the interaction queue of a node."""
+
+    in_flight: int
+    # number of waiting interactions per priority class
+    queued: dict[str, int]
+    max_queued: int
+    completed: int
+    rejected: int
+
+
+@dataclass
+class AdmissionMetrics:
+    """Metrics of the admission of interactions on a (type of) network."""
+
+    budget: int
+    in_flight: int
+    queued: int
+    max_queued: int
+    admitted: int
+    rejected: int
+    # time (in seconds) interactions had to wait for admission
+    wait_time_avg: float
+    wait_time_max: float
+
+
+@dataclass
+class ThreadAirtimeMetrics:
+    """Metrics of the (token bucket) airtime throttling on a Thread network."""
+
+    tokens: float
+    # number of background interactions waiting for a token
+    waiting: int
+    acquired: int
+    # number of (interactive) interactions charged without waiting
+    charged: int
+    # number of background interactions that had to wait for a token
+    throttled: int
+    wait_time_total: float
+
+
+@dataclass
+class NodeSetupProgress:
+    """Progress of the current round of node setups (e.g. at startup)."""
+
+    total: int
+    completed: int
+    failed: int
+    in_progress: int
+    pending: int
+    # current max number of simultaneous node setups
+    concurrency: int
+
+
+@dataclass
+class NodeRetryState:
+    """State of the (scheduled) retries of a node setup."""
+
+    attempts: int
+    # timestamps of the first failed attempt and the next retry
+    first_failure: float
+    next_retry: float
+    last_error: str | None = None
+
+
+@dataclass
+class ResubscriptionStormMetrics:
+    """Metrics of the resubscription storm detection."""
+
+    active: bool
+    # number of different nodes of which the subscription failed recently
+    failing_nodes: int
+    storms: int
+    # number of resubscriptions that were paced during a storm
+    paced: int
+
+
+@dataclass
+class AttributeAggregate:
+    """Rolling aggregate of the values of a numeric attribute over a time window."""
+
+    # length of the window in seconds
+    window: int
+    # number of values received within the window
+    count: int
+    # min/max/mean of the value over the window (including the value at its start),
+    # the mean is weighted by the time each value held
+    min: float | None
+    max: float | None
+    mean: float | None
+    # the last received value (which may be older than the window)
+    last: float | None
+
+
+@dataclass
+class WriteLaneMetrics:
+    """Metrics of a (priority) lane of the messages written to websocket clients."""
+
+    queued: int
+    written: int
+    # time (in seconds) messages waited in the queue of the connection
+    wait_time_avg: float
+    wait_time_max: float
+
+
+@dataclass
+class ServerMetrics:
+    """Runtime metrics of the server."""
+
+    node_interactions: dict[int, NodeInteractionQueueMetrics] = field(
+        default_factory=dict
+    )
+    admission: dict[str, AdmissionMetrics] = field(default_factory=dict)
+    thread_airtime: dict[str, ThreadAirtimeMetrics] = field(default_factory=dict)
+    node_setup: NodeSetupProgress | None = None
+    node_setup_retries: dict[int, NodeRetryState] = field(default_factory=dict)
+    resubscription_storm: ResubscriptionStormMetrics | None = None
+    websocket_lanes: dict[str, WriteLaneMetrics] = field(default_factory=dict)
+
+
 # API message models
 
 
+@dataclass
+class ConnectionOptions:
+    """Options of a (single) websocket connection, set by the client."""
+
+    # coalesce the queued messages into a single frame (holding a JSON array)
+    batch_messages: bool = False
+    # a frame is closed once it holds at least this number of characters
+    batch_max_size: int = 65536
+
+
 @dataclass
 class CommandMessage:
     """Model for a Message holding a command from server to client or client to server."""
@@ -0,0 +1,5 @@
+"""Relay (fan-out) of the websocket API of a Matter server to many clients."""
+
+from .relay import MatterRelay
+
+__all__ = ["MatterRelay"]
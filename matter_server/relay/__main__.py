@@ -0,0 +1,84 @@
+"""Script entry point to run the Matter Relay."""
+
+import argparse
+import asyncio
+
+from aiorun import run
+import coloredlogs
+
+from ..common.models import ConnectionOptions
+from .relay import DEFAULT_UPSTREAM_URL, MatterRelay
+
+DEFAULT_PORT = 5590
+
+# Get parsed passed in arguments.
+parser = argparse.ArgumentParser(
+    description="Relay of the websocket API of a Matter Server to many clients."
+)
+parser.add_argument(
+    "--upstream-url",
+    type=str,
+    default=DEFAULT_UPSTREAM_URL,
+    help="Websocket url of the (upstream) Matter Server, "
+    f"defaults to {DEFAULT_UPSTREAM_URL}",
+)
+parser.add_argument(
+    "--port",
+    type=int,
+    default=DEFAULT_PORT,
+    help=f"TCP Port to run the websocket relay on, defaults to {DEFAULT_PORT}",
+)
+parser.add_argument(
+    "--listen-address",
+    type=str,
+    action="append",
+    default=None,
+    help="IP address to bind the websocket relay to. "
+    "Can be specified multiple times. Defaults to all addresses.",
+)
+parser.add_argument(
+    "--binary",
+    action="store_true",
+    help="Use MessagePack (binary) frames for the upstream connection "
+    "(if the msgpack package is installed).",
+)
+parser.add_argument(
+    "--batch-messages",
+    action="store_true",
+    help="Let the upstream server coalesce pending messages into a single frame.",
+)
+parser.add_argument(
+    "--log-level",
+    type=str,
+    default="info",
+    help="Provide logging level. Example --log-level debug, default=info, "
+    "possible=(critical, error, warning, info, debug)",
+)
+
+args = parser.parse_args()
+
+
+def main() -> None:
+    """Run main execution."""
+    coloredlogs.install(level=args.log_level.upper())
+
+    relay = MatterRelay(
+        args.upstream_url,
+        args.port,
+        args.listen_address,
+        binary=args.binary,
+        connection_options=(
+            ConnectionOptions(batch_messages=True) if args.batch_messages else None
+        ),
+    )
+
+    async def handle_stop(loop: asyncio.AbstractEventLoop) -> None:
+        # pylint: disable=unused-argument
+        await relay.stop()
+
+    # run the relay
+    run(relay.start(), shutdown_callback=handle_stop)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""Relay (fan-out) of the websocket API of an upstream Matter server."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+import logging
+from typing import TYPE_CHECKING, Any, Final
+import weakref
+
+from aiohttp import ClientError, ClientSession, UnixConnector, hdrs, web
+from yarl import URL
+
+from ..client.client import MatterClient
+from ..client.connection import UNIX_SOCKET_SCHEME
+from ..client.exceptions import MatterClientException
+from ..common.errors import UpstreamNotConnected
+from ..common.helpers.api import APICommandHandler, api_command
+from ..common.models import (
+    APICommand,
+    CommandMessage,
+    ConnectionOptions,
+    EventMessage,
+    EventType,
+    MatterNodeData,
+    ServerInfoMessage,
+)
+from ..server.client_handler import WebsocketClientHandler
+from ..server.helpers.custom_web_runner import MultiHostTCPSite
+from ..server.helpers.event_bus import EventBus
+from ..server.helpers.write_lanes import create_lane_stats
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from multidict import CIMultiDictProxy
+
+DEFAULT_UPSTREAM_URL: Final = "ws://localhost:5580/ws"
+# seconds to wait before reconnecting to the upstream server
+RECONNECT_DELAY_MIN: Final = 1
+RECONNECT_DELAY_MAX: Final = 60
+
+# hop-by-hop headers, which apply to a single connection and are not forwarded
+HOP_BY_HOP_HEADERS: Final = frozenset(
+    {
+        hdrs.CONNECTION,
+        hdrs.KEEP_ALIVE,
+        hdrs.PROXY_AUTHENTICATE,
+        hdrs.PROXY_AUTHORIZATION,
+        hdrs.TE,
+        hdrs.TRAILER,
+        hdrs.TRANSFER_ENCODING,
+        hdrs.UPGRADE,
+    }
+)
+
+# commands answered by the relay itself (all other commands are forwarded)
+LOCAL_COMMANDS: Final = {
+    APICommand.START_LISTENING,
+    APICommand.SET_CONNECTION_OPTIONS,
+}
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RelayUpstreamClient(MatterClient):
+    """Matter client that mirrors the raw node data and forwards the raw events."""
+
+    def __init__(
+        self,
+        ws_server_url: str,
+        aiohttp_session: ClientSession,
+        event_callback: Callable[[EventType, Any], None],
+        connection_options: ConnectionOptions | None = None,
+        binary: bool = False,
+    ) -> None:
+        """Initialize the upstream client."""
+        super().__init__(ws_server_url, aiohttp_session, connection_options, binary)
+        self.event_callback = event_callback
+
+    def _handle_event_message(self, msg: EventMessage) -> None:
+        """Handle incoming event from the server."""
+        # keep the (raw) node data in sync, which is served to downstream clients
+        if msg.event == EventType.ATTRIBUTE_UPDATED:
+            node_id, attribute_path, new_value = msg.data
+            if node := self._nodes.get(node_id):
+                node.node_data.attributes[attribute_path] = new_value
+        elif msg.event == EventType.ENDPOINT_REMOVED and (
+            node := self._nodes.get(msg.data["node_id"])
+        ):
+            prefix = f"{msg.data['endpoint_id']}/"
+            for attribute_path in list(node.node_data.attributes):
+                if attribute_path.startswith(prefix):
+                    del node.node_data.attributes[attribute_path]
+        super()._handle_event_message(msg)
+        self.event_callback(msg.event, msg.data)
+
+
+class RelayClientHandler(WebsocketClientHandler):
+    """Handle a downstream websocket client connection of the relay."""
+
+    server: MatterRelay
+
+    def _handle_command(self, msg: CommandMessage) -> None:
+        """Handle an incoming command from the client."""
+        if msg.command in LOCAL_COMMANDS or msg.command in self.server.command_handlers:
+            super()._handle_command(msg)
+            return
+        # forward the command to the upstream server
+        asyncio.create_task(self._run_command(msg, self.server.forward_command(msg)))
+
+
+class MatterRelay:
+    """Serve the websocket API of an upstream Matter server to many clients.
+
+    The relay keeps a mirror of the nodes from a single upstream connection and
+    serves the nodes (and events) to its own clients. Commands that need the
+    upstream server (e.g. device commands) are forwarded, as are other HTTP requests
+    (e.g. for the dashboard).
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+        self,
+        upstream_url: str,
+        port: int,
+        listen_addresses: list[str] | None = None,
+        binary: bool = False,
+        connection_options: ConnectionOptions | None = None,
+    ) -> None:
+        """Initialize the relay."""
+        self.upstream_url = upstream_url
+        self.port = port
+        self.listen_addresses = listen_addresses
+        # encoding and options of the upstream connection
+        self.binary = binary
+        self.connection_options = connection_options
+        self.logger = LOGGER
+        self.app = web.Application()
+        self.command_handlers: dict[str, APICommandHandler] = {}
+        self.event_bus = EventBus()
+        self.write_lane_stats = create_lane_stats()
+        self._session: ClientSession | None = None
+        # session and base url to forward (non websocket) HTTP requests upstream
+        self._http_session: ClientSession | None = None
+        self._http_base_url = URL()
+        self._client: RelayUpstreamClient | None = None
+        self._upstream_task: asyncio.Task | None = None
+        self._clients: weakref.WeakSet[RelayClientHandler] = weakref.WeakSet()
+        self._runner: web.AppRunner | None = None
+        self._http: MultiHostTCPSite | None = None
+
+    @property
+    def client(self) -> RelayUpstreamClient:
+        """Return the client of the upstream server."""
+        assert self._client is not None
+        return self._client
+
+    async def start(self) -> None:
+        """Connect to the upstream server and start serving the websocket API."""
+        self._session = ClientSession()
+        self._client = RelayUpstreamClient(
+            self.upstream_url,
+            self._session,
+            self.event_bus.publish,
+            self.connection_options,
+            self.binary,
+        )
+        if self.upstream_url.startswith(UNIX_SOCKET_SCHEME):
+            self._http_session = ClientSession(
+                connector=UnixConnector(
+                    path=self.upstream_url[len(UNIX_SOCKET_SCHEME) :]
+                )
+            )
+            self._http_base_url = URL("http://localhost")
+        else:
+            self._http_session = self._session
+            scheme = "https" if self.upstream_url.startswith("wss:") else "http"
+            self._http_base_url = (
+                URL(self.upstream_url).with_scheme(scheme).with_path("/")
+            )
+        init_ready = asyncio.Event()
+        self._upstream_task = asyncio.create_task(self._run_upstream(init_ready))
+        await init_ready.wait()
+        self._register_api_commands()
+        self.app.router.add_route("GET", "/ws", self._handle_ws)
+        self.app.router.add_route("*", "/{path:.*}", self._handle_http)
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        self._http = MultiHostTCPSite(
+            self._runner, host=self.listen_addresses, port=self.port
+        )
+        await self._http.start()
+        self.logger.info("Matter Relay started on port %s", self.port)
+
+    async def stop(self) -> None:
+        """Stop the relay."""
+        for connection in set(self._clients):
+            await connection.disconnect()
+        if self._http is not None:
+            await self._http.stop()
+        if self._runner is not None:
+            await self._runner.cleanup()
+        if self._upstream_task is not None:
+            self._upstream_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._upstream_task
+        if self._client is not None:
+            await self._client.disconnect()
+        if self._http_session is not None and self._http_session is not self._session:
+            await self._http_session.close()
+        if self._session is not None:
+            await self._session.close()
+
+    def get_nodes(self) -> list[MatterNodeData]:
+        """Return all (mirrored) nodes."""
+        return [node.node_data for node in self.client.get_nodes()]
+
+    def subscribe(
+        self,
+        callback: Callable[[EventType, Any], None],
+        event_types: Iterable[EventType] | None = None,
+    ) -> Callable[[], None]:
+        """Subscribe to the events of the upstream server."""
+        return self.event_bus.subscribe(callback, event_types)
+
+    @api_command(APICommand.SERVER_INFO)
+    def get_info(self) -> ServerInfoMessage:
+        """Return (version)info of the upstream Matter server."""
+        assert self.client.server_info is not None
+        return self.client.server_info
+
+    @api_command(APICommand.GET_NODES)
+    def get_node_list(self, only_available: bool = False) -> list[MatterNodeData]:
+        """Return all (mirrored) nodes."""
+        return [
+            node.node_data
+            for node in self.client.get_nodes()
+            if node.available or not only_available
+        ]
+
+    @api_command(APICommand.GET_NODE)
+    def get_node(self, node_id: int) -> MatterNodeData:
+        """Return a single (mirrored) node."""
+        return self.client.get_node(node_id).node_data
+
+    async def forward_command(self, msg: CommandMessage) -> Any:
+        """Forward a command to the upstream server, return its result."""
+        if not self.client.connection.connected:
+            raise UpstreamNotConnected("Not connected to the upstream server.")
+        try:
+            return await self.client.send_command(msg.command, **(msg.args or {}))
+        except asyncio.CancelledError as err:
+            current_task = asyncio.current_task()
+            if current_task is not None and current_task.cancelling():
+                raise
+            # the (pending) result was cancelled as the upstream connection was lost
+            raise UpstreamNotConnected(
+                "Connection to the upstream server was lost."
+            ) from err
+        except (MatterClientException, ClientError, ConnectionError) as err:
+            raise UpstreamNotConnected(
+                f"Not connected to the upstream server: {err}"
+            ) from err
+
+    def _register_api_commands(self) -> None:
+        """Register the commands answered from the mirrored nodes."""
+        for attr_name in ("get_info", "get_node_list", "get_node"):
+            handler = getattr(self, attr_name)
+            self.command_handlers[handler.api_cmd] = APICommandHandler.parse(
+                handler.api_cmd, handler
+            )
+
+    async def _handle_ws(self, request: web.Request) -> web.WebSocketResponse:
+        """Handle a downstream websocket connection."""
+        connection = RelayClientHandler(self, request)
+        try:
+            self._clients.add(connection)
+            return await connection.handle_client()
+        finally:
+            self._clients.discard(connection)
+
+    async def _handle_http(self, request: web.Request) -> web.StreamResponse:
+        """Forward an HTTP request to the upstream server (streaming the bodies)."""
+        assert self._http_session is not None
+        url = self._http_base_url.join(URL(request.path_qs))
+        try:
+            upstream_resp = await self._http_session.request(
+                request.method,
+                url,
+                headers=_get_forward_headers(request.headers, hdrs.HOST),
+                data=request.content if request.body_exists else None,
+                allow_redirects=False,
+                # the (possibly compressed) body is passed on as is
+                auto_decompress=False,
+                skip_auto_headers=(hdrs.ACCEPT_ENCODING, hdrs.USER_AGENT),
+            )
+        except ClientError as err:
+            raise web.HTTPBadGateway(text=str(err)) from err
+        async with upstream_resp:
+            response = web.StreamResponse(
+                status=upstream_resp.status,
+                reason=upstream_resp.reason,
+                headers=_get_forward_headers(upstream_resp.headers),
+            )
+            await response.prepare(request)
+            async for chunk in upstream_resp.content.iter_any():
+                await response.write(chunk)
+            await response.write_eof()
+        return response
+
+    async def _run_upstream(self, init_ready: asyncio.Event) -> None:
+        """Keep the upstream connection (and the mirrored nodes) up to date."""
+        delay = RECONNECT_DELAY_MIN
+        while True:
+            listen_ready = asyncio.Event()
+            previous_nodes = {node.node_id for node in self.client.get_nodes()}
+            listen_task = asyncio.create_task(self.client.start_listening(listen_ready))
+            ready_task = asyncio.create_task(listen_ready.wait())
+            try:
+                await asyncio.wait(
+                    [listen_task, ready_task], return_when=asyncio.FIRST_COMPLETED
+                )
+                if listen_ready.is_set():
+                    delay = RECONNECT_DELAY_MIN
+                    if init_ready.is_set():
+                        self._signal_resync(previous_nodes)
+                    init_ready.set()
+                    self.logger.info(
+                        "Connected to upstream server %s", self.upstream_url
+                    )
+                await listen_task
+            except MatterClientException as err:
+                self.logger.warning(
+                    "Connection to upstream server %s failed: %s",
+                    self.upstream_url,
+                    err,
+                )
+            finally:
+                ready_task.cancel()
+                listen_task.cancel()
+            self.logger.info("Reconnecting to upstream server in %s seconds", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_DELAY_MAX)
+
+    def _signal_resync(self, previous_nodes: set[int]) -> None:
+        """Signal the (possibly changed) nodes after reconnecting upstream."""
+        nodes = self.client.get_nodes()
+        for node_id in previous_nodes - {node.node_id for node in nodes}:
+            self.event_bus.publish(EventType.NODE_REMOVED, node_id)
+        for node in nodes:
+            self.event_bus.publish(
+                EventType.NODE_UPDATED
+                if node.node_id in previous_nodes
+                else EventType.NODE_ADDED,
+                node.node_data,
+            )
+
+
+def _get_forward_headers(
+    headers: CIMultiDictProxy[str], *exclude: str
+) -> list[tuple[str, str]]:
+    """Return the headers to forward, without the hop-by-hop (and excluded) ones."""
+    skip = {name.lower() for name in (*HOP_BY_HOP_HEADERS, *exclude)}
+    # the connection header may list additional hop-by-hop headers
+    for value in headers.getall(hdrs.CONNECTION, []):
+        skip.update(name.strip().lower() for name in value.split(","))
+    return [
+        (name, value) for name, value in headers.items() if name.lower() not in skip
+    ]
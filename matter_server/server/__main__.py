@@ -16,9 +16,20 @@ import coloredlogs
 
 from matter_server.common.const import VERBOSE_LOG_LEVEL
 from matter_server.common.helpers.logger import MatterFormatter, MatterNodeFilter
+from matter_server.common.helpers.util import parse_attribute_path
+from matter_server.common.models import NetworkType
 from matter_server.server import stack
 
-from .server import MatterServer
+from .const import (
+    DEFAULT_AGGREGATE_WINDOWS,
+    DEFAULT_ATTRIBUTE_HISTORY_SIZE,
+    DEFAULT_EVENT_LOG_SIZE,
+    DEFAULT_POLL_INTERVAL_MAX,
+    DEFAULT_POLL_INTERVAL_MIN,
+    DEFAULT_UNIX_SOCKET_MODE,
+)
+from .helpers.attribute_throttle import AttributeThrottleRule
+from .server import MatterServer, ServerOptions
 
 DEFAULT_VENDOR_ID = 0xFFF1
 DEFAULT_FABRIC_ID = 1
@@ -128,9 +139,159 @@ parser.add_argument(
     help="Controls disabling server cluster interactions on a controller. This in turn disables advertisement of active controller operational identities.",
 )
 
+parser.add_argument(
+    "--interaction-budget",
+    type=str,
+    nargs="+",
+    metavar="NETWORK_TYPE=LIMIT",
+    help="Max number of simultaneous interactions with nodes per network type "
+    "(thread, wifi, ethernet, unknown). Example --interaction-budget thread=2 wifi=8",
+)
+
+parser.add_argument(
+    "--exclude-cluster",
+    type=int,
+    nargs="+",
+    metavar="CLUSTER_ID",
+    help="Cluster ID(s) to exclude from node subscriptions (e.g. chatty diagnostics "
+    "clusters), the attributes can still be read on demand.",
+)
+
+parser.add_argument(
+    "--tiered-subscriptions",
+    action="store_true",
+    help="Subscribe to the diagnostic and measurement clusters (and the "
+    "configuration clusters of the root endpoint) of nodes with a separate "
+    "subscription with a larger report interval.",
+)
+
+parser.add_argument(
+    "--attribute-throttle",
+    type=str,
+    nargs="+",
+    metavar="PATH=WINDOW[:DEADBAND]",
+    help="Throttle the updates of (chatty) attributes sent to clients to one per "
+    "WINDOW seconds and/or drop updates of numeric values that changed less than "
+    "DEADBAND. PATH is an attribute path (endpoint/cluster/attribute), * can be "
+    "used as wildcard. Example --attribute-throttle */144/*=10 */1024/0=0:100",
+)
+parser.add_argument(
+    "--poll-interval-min",
+    type=float,
+    default=DEFAULT_POLL_INTERVAL_MIN,
+    help="Interval (in seconds) at which custom attributes (of devices without "
+    "subscription support for them) are polled while their value changes, "
+    f"defaults to {DEFAULT_POLL_INTERVAL_MIN}.",
+)
+parser.add_argument(
+    "--poll-interval-max",
+    type=float,
+    default=DEFAULT_POLL_INTERVAL_MAX,
+    help="Max interval (in seconds) the poll interval of custom attributes backs "
+    f"off to while their value does not change, defaults to {DEFAULT_POLL_INTERVAL_MAX}.",
+)
+
+parser.add_argument(
+    "--attribute-history-cluster",
+    type=int,
+    nargs="+",
+    metavar="CLUSTER_ID",
+    help="Cluster ID(s) of which the (in-memory) history of the (numeric) attribute "
+    "values is kept, which can be queried with the get_attribute_history command.",
+)
+parser.add_argument(
+    "--attribute-history-size",
+    type=int,
+    default=DEFAULT_ATTRIBUTE_HISTORY_SIZE,
+    help="Number of samples of the attribute history to keep per attribute path, "
+    f"defaults to {DEFAULT_ATTRIBUTE_HISTORY_SIZE}.",
+)
+parser.add_argument(
+    "--aggregate-attribute",
+    type=str,
+    nargs="+",
+    metavar="PATH",
+    help="Attribute path(s) (endpoint/cluster/attribute, * can be used as wildcard) "
+    "of which rolling aggregates are kept, which can be queried with the "
+    "get_attribute_aggregates command. Defaults to the electrical power measurement, "
+    "temperature measurement and Eve energy attributes.",
+)
+parser.add_argument(
+    "--aggregate-window",
+    type=int,
+    nargs="+",
+    metavar="SECONDS",
+    default=list(DEFAULT_AGGREGATE_WINDOWS),
+    help="Window(s) (in seconds) of the rolling attribute aggregates, "
+    f"defaults to {' '.join(str(x) for x in DEFAULT_AGGREGATE_WINDOWS)}.",
+)
+parser.add_argument(
+    "--event-log-size",
+    type=int,
+    default=DEFAULT_EVENT_LOG_SIZE,
+    help="Max number of node events kept in the (persistent) event log, which can "
+    f"be queried with the get_node_events command, defaults to {DEFAULT_EVENT_LOG_SIZE}.",
+)
+parser.add_argument(
+    "--unix-socket",
+    type=str,
+    default=None,
+    help="Path of a unix domain socket to serve the websocket API on (in addition "
+    "to TCP), for clients running on the same host. Connect with unix://<path>.",
+)
+parser.add_argument(
+    "--unix-socket-mode",
+    type=lambda value: int(value, 8),
+    default=DEFAULT_UNIX_SOCKET_MODE,
+    help="Permissions (octal) of the unix domain socket, which gives full access to "
+    "the API, defaults to "
+    f"{DEFAULT_UNIX_SOCKET_MODE:o} (read/write for the owner and group only).",
+)
+parser.add_argument(
+    "--split-process",
+    action="store_true",
+    help="Serve the websocket API (and dashboard) from a separate front-end process, "
+    "which mirrors the nodes and connects to this (controller) process over a unix "
+    "socket, so the Matter stack and the clients do not share a single core.",
+)
+
 args = parser.parse_args()
 
 
+def _parse_interaction_budgets() -> dict[NetworkType, int] | None:
+    if not args.interaction_budget:
+        return None
+    budgets: dict[NetworkType, int] = {}
+    for item in args.interaction_budget:
+        try:
+            network_type, limit = item.split("=")
+            budget = int(limit)
+            budgets[NetworkType(network_type.lower())] = budget
+        except ValueError:
+            parser.error(f"Invalid interaction budget: {item}")
+        if budget < 1:
+            parser.error(f"Interaction budget must be at least 1: {item}")
+    return budgets
+
+
+def _parse_attribute_throttle_rules() -> list[AttributeThrottleRule]:
+    rules: list[AttributeThrottleRule] = []
+    for item in args.attribute_throttle or []:
+        try:
+            pattern, settings = item.split("=")
+            window, _, deadband = settings.partition(":")
+            rule = AttributeThrottleRule(
+                pattern=pattern,
+                window=float(window or 0),
+                deadband=float(deadband or 0),
+            )
+            parse_attribute_path(pattern)
+        except ValueError:
+            parser.error(f"Invalid attribute throttle: {item}")
+        rules.append(rule)
+    return rules
+
+
 def _setup_logging() -> None:
     log_fmt = (
         "%(asctime)s.%(msecs)03d (%(threadName)s) %(levelname)s [%(name)s] %(message)s"
@@ -216,6 +377,9 @@ def main() -> None:
 
     _setup_logging()
 
+    if args.poll_interval_min > args.poll_interval_max:
+        parser.error("--poll-interval-min can't be higher than --poll-interval-max")
+
     # Init server
     server = MatterServer(
         args.storage_path,
@@ -229,6 +393,22 @@ def main() -> None:
         args.bluetooth_adapter,
         args.ota_provider_dir,
         args.disable_server_interactions,
+        options=ServerOptions(
+            interaction_budgets=_parse_interaction_budgets(),
+            subscription_exclude_clusters=set(args.exclude_cluster or []),
+            tiered_subscriptions=args.tiered_subscriptions,
+            attribute_throttle_rules=_parse_attribute_throttle_rules(),
+            poll_interval_min=args.poll_interval_min,
+            poll_interval_max=args.poll_interval_max,
+            attribute_history_clusters=set(args.attribute_history_cluster or []),
+            attribute_history_size=args.attribute_history_size,
+            aggregated_attributes=args.aggregate_attribute,
+            aggregate_windows=args.aggregate_window,
+            event_log_size=args.event_log_size,
+            unix_socket=args.unix_socket,
+            unix_socket_mode=args.unix_socket_mode,
+            split_frontend=args.split_process,
+        ),
     )
 
     async def handle_stop(loop: asyncio.AbstractEventLoop) -> None:
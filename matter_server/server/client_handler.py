@@ -6,7 +6,7 @@ import asyncio
 from concurrent import futures
 from contextlib import suppress
 import logging
-from typing import TYPE_CHECKING, Any, Final
+from typing import TYPE_CHECKING, Any, Final, Protocol, cast
 
 from aiohttp import WSMsgType, web
 import async_timeout
@@ -14,6 +14,13 @@ from chip.exceptions import ChipStackError
 
 from matter_server.common.const import VERBOSE_LOG_LEVEL
 from matter_server.common.helpers.json import json_dumps, json_loads
+from matter_server.common.helpers.msgpack import (
+    MSGPACK_PROTOCOL,
+    msgpack_array,
+    msgpack_available,
+    msgpack_dumps,
+    msgpack_loads,
+)
 
 from ..common.errors import InvalidArguments, InvalidCommand, MatterError
 from ..common.helpers.api import parse_arguments
@@ -21,19 +28,30 @@ from ..common.helpers.util import dataclass_from_dict
 from ..common.models import (
     APICommand,
     CommandMessage,
+    ConnectionOptions,
     ErrorResultMessage,
     EventMessage,
     MessageType,
     SuccessResultMessage,
 )
+from .helpers.write_lanes import (
+    BARRIER_EVENTS,
+    WriteLane,
+    WriteLaneQueue,
+    get_event_lane,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Awaitable, Callable, Iterable
 
-    from matter_server.common.models import EventType
+    from matter_server.common.models import (
+        EventType,
+        MatterNodeData,
+        ServerInfoMessage,
+    )
 
     from ..common.helpers.api import APICommandHandler
-    from .server import MatterServer
+    from .helpers.write_lanes import WriteLaneStats
 
 MAX_PENDING_MSG = 512
 CANCELLATION_ERRORS: Final = (asyncio.CancelledError, futures.CancelledError)
@@ -50,19 +68,46 @@ class WebSocketLogAdapter(logging.LoggerAdapter):
         return f"[{self.extra['connid']}] {msg}", kwargs
 
 
+class WebsocketAPIServer(Protocol):
+    """Server (e.g. the Matter server or a relay) serving the websocket API."""
+
+    command_handlers: dict[str, APICommandHandler]
+    # statistics of the (prioritized) messages written to the clients
+    write_lane_stats: dict[WriteLane, WriteLaneStats]
+
+    def get_info(self) -> ServerInfoMessage:
+        """Return (version)info of the server."""
+
+    def get_nodes(self) -> list[MatterNodeData]:
+        """Return all nodes (sent to clients that start listening)."""
+
+    def subscribe(
+        self,
+        callback: Callable[[EventType, Any], None],
+        event_types: Iterable[EventType] | None = None,
+    ) -> Callable[[], None]:
+        """Subscribe to events, return a callable to unsubscribe."""
+
+
 class WebsocketClientHandler:
     """Handle an active websocket client connection."""
 
-    def __init__(self, server: MatterServer, request: web.Request) -> None:
+    def __init__(self, server: WebsocketAPIServer, request: web.Request) -> None:
         """Initialize an active connection."""
         self.server = server
         self.request = request
-        self.wsock = web.WebSocketResponse(heartbeat=55)
-        self._to_write: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_MSG)
+        # clients can negotiate MessagePack (binary) frames as subprotocol
+        self.wsock = web.WebSocketResponse(
+            heartbeat=55,
+            protocols=(MSGPACK_PROTOCOL,) if msgpack_available() else (),
+        )
+        self._binary = False
+        self._to_write = WriteLaneQueue(MAX_PENDING_MSG, server.write_lane_stats)
         self._handle_task: asyncio.Task | None = None
         self._writer_task: asyncio.Task | None = None
         self._logger = WebSocketLogAdapter(LOGGER, {"connid": id(self)})
         self._unsub_callback: Callable | None = None
+        self._options = ConnectionOptions()
 
     async def disconnect(self) -> None:
         """Disconnect client."""
@@ -82,13 +127,16 @@ class WebsocketClientHandler:
             self._logger.warning("Timeout preparing request from %s", request.remote)
             return wsock
 
-        self._logger.debug("Connected from %s", request.remote)
+        self._binary = wsock.ws_protocol == MSGPACK_PROTOCOL
+        self._logger.debug(
+            "Connected from %s (%s)", request.remote, wsock.ws_protocol or "json"
+        )
         self._handle_task = asyncio.current_task()
 
         self._writer_task = asyncio.create_task(self._writer())
 
         # send server(version) info when client connects
-        self._send_message(self.server.get_info())
+        self._send_message(self.server.get_info(), WriteLane.RESULT)
 
         disconnect_warn = None
 
@@ -103,18 +151,21 @@ class WebsocketClientHandler:
                     disconnect_warn = f"Received error message: {msg.data}"
                     break
 
-                if msg.type != WSMsgType.TEXT:
-                    self._logger.warning("Received non-Text message: %s", msg.data)
+                if msg.type != (WSMsgType.BINARY if self._binary else WSMsgType.TEXT):
+                    self._logger.warning("Received unexpected message: %s", msg.data)
                     continue
 
                 self._logger.log(VERBOSE_LOG_LEVEL, "Received: %s", msg.data)
 
                 try:
                     command_msg = dataclass_from_dict(
-                        CommandMessage, json_loads(msg.data)
+                        CommandMessage,
+                        msgpack_loads(msg.data)
+                        if self._binary
+                        else json_loads(msg.data),
                     )
                 except ValueError:
-                    disconnect_warn = f"Received invalid JSON: {msg.data}"
+                    disconnect_warn = f"Received invalid message: {msg.data!r}"
                     break
 
                 self._logger.log(VERBOSE_LOG_LEVEL, "Received %s", command_msg)
@@ -133,14 +184,17 @@ class WebsocketClientHandler:
                 self._unsub_callback()
 
             try:
-                self._to_write.put_nowait(None)
-                # Make sure all error messages are written before closing
-                await self._writer_task
-                await wsock.close()
-            except asyncio.QueueFull:  # can be raised by put_nowait
-                self._writer_task.cancel()
+                if self._to_write.full():
+                    # the client is not reading the messages
+                    self._writer_task.cancel()
+                else:
+                    self._to_write.close()
+                    # Make sure all error messages are written before closing
+                    await self._writer_task
+                    await wsock.close()
 
             finally:
+                self._to_write.clear()
                 if disconnect_warn is None:
                     self._logger.debug("Disconnected")
                 else:
@@ -156,6 +210,9 @@ class WebsocketClientHandler:
         if msg.command == APICommand.START_LISTENING:
             self._handle_start_listening_command(msg)
             return
+        if msg.command == APICommand.SET_CONNECTION_OPTIONS:
+            self._handle_set_connection_options_command(msg)
+            return
 
         handler = self.server.command_handlers.get(msg.command)
 
@@ -165,7 +222,8 @@ class WebsocketClientHandler:
                     msg.message_id,
                     InvalidCommand.error_code,
                     f"Invalid command: {msg.command}",
-                )
+                ),
+                WriteLane.RESULT,
             )
             self._logger.warning("Invalid command: %s", msg.command)
             return
@@ -176,26 +234,63 @@ class WebsocketClientHandler:
     def _handle_start_listening_command(self, msg: CommandMessage) -> None:
         """Send a full dump of all nodes once and start receiving events."""
         assert self._unsub_callback is None, "Listen command already called!"
-        all_nodes = self.server.device_controller.get_nodes()
-        self._send_message(SuccessResultMessage(msg.message_id, all_nodes))
+        all_nodes = self.server.get_nodes()
+        self._send_message(
+            SuccessResultMessage(msg.message_id, all_nodes), WriteLane.RESULT
+        )
 
         def handle_event(evt: EventType, data: Any) -> None:
-            self._send_message(EventMessage(event=evt, data=data))
+            self._send_message(
+                EventMessage(event=evt, data=data),
+                get_event_lane(evt),
+                evt in BARRIER_EVENTS,
+            )
 
         self._unsub_callback = self.server.subscribe(handle_event)
 
+    def _handle_set_connection_options_command(self, msg: CommandMessage) -> None:
+        """Set the options of this connection, reply with the (effective) options."""
+        try:
+            options = dataclass_from_dict(ConnectionOptions, msg.args or {})
+        except (TypeError, KeyError, ValueError) as err:
+            self._send_message(
+                ErrorResultMessage(
+                    msg.message_id, InvalidArguments.error_code, str(err)
+                ),
+                WriteLane.RESULT,
+            )
+            return
+        options.batch_max_size = max(1, options.batch_max_size)
+        self._options = options
+        self._send_message(
+            SuccessResultMessage(msg.message_id, options), WriteLane.RESULT
+        )
+
     async def _run_handler(
         self, handler: APICommandHandler, msg: CommandMessage
     ) -> None:
+        await self._run_command(msg, self._call_handler(handler, msg))
+
+    async def _call_handler(
+        self, handler: APICommandHandler, msg: CommandMessage
+    ) -> Any:
+        """Call the handler of a command with the (parsed) arguments."""
         try:
-            try:
-                args = parse_arguments(handler.signature, handler.type_hints, msg.args)
-            except (TypeError, KeyError, ValueError) as err:
-                raise InvalidArguments from err
-            result = handler.target(**args)
-            if asyncio.iscoroutine(result):
-                result = await result
-            self._send_message(SuccessResultMessage(msg.message_id, result))
+            args = parse_arguments(handler.signature, handler.type_hints, msg.args)
+        except (TypeError, KeyError, ValueError) as err:
+            raise InvalidArguments from err
+        result = handler.target(**args)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+    async def _run_command(self, msg: CommandMessage, command: Awaitable[Any]) -> None:
+        """Run a command and send its result (or error) to the client."""
+        try:
+            result = await command
+            self._send_message(
+                SuccessResultMessage(msg.message_id, result), WriteLane.RESULT
+            )
         except (ChipStackError, MatterError) as err:
             error_code = getattr(err, "error_code", MatterError.error_code)
             message_str = msg.command
@@ -208,9 +303,14 @@ class WebsocketClientHandler:
                 # only print the full stacktrace if verbose logging is enabled
                 exc_info=err if self._logger.isEnabledFor(VERBOSE_LOG_LEVEL) else None,
             )
-            self._send_message(ErrorResultMessage(msg.message_id, error_code, str(err)))
+            self._send_message(
+                ErrorResultMessage(msg.message_id, error_code, str(err)),
+                WriteLane.RESULT,
+            )
         except Exception as err:
-            self._send_message(ErrorResultMessage(msg.message_id, 0, str(err)))
+            self._send_message(
+                ErrorResultMessage(msg.message_id, 0, str(err)), WriteLane.RESULT
+            )
             raise err
 
     async def _writer(self) -> None:
@@ -218,27 +318,54 @@ class WebsocketClientHandler:
         # Exceptions if Socket disconnected or cancelled by connection handler
         with suppress(RuntimeError, ConnectionResetError, *CANCELLATION_ERRORS):
             while not self.wsock.closed:
-                if (process := await self._to_write.get()) is None:
+                if (lane := await self._to_write.next_lane()) is None:
                     break
 
-                if not isinstance(process, str):
-                    message: str = process()
+                message = _get_message(self._to_write.get_nowait())
+                if self._options.batch_messages and lane != WriteLane.RESULT:
+                    message = self._coalesce(message)
+                if isinstance(message, bytes):
+                    await self.wsock.send_bytes(message)
                 else:
-                    message = process
-                await self.wsock.send_str(message)
+                    await self.wsock.send_str(message)
 
-    def _send_message(self, message: MessageType) -> None:
+    def _coalesce(self, message: str | bytes) -> str | bytes:
+        """Coalesce the message with the (already) queued messages into one frame.
+
+        Command results are never coalesced (or delayed by the other messages).
+        """
+        messages = [message]
+        size = len(message)
+        while size < self._options.batch_max_size and self._to_write.peek_lane() in (
+            WriteLane.EVENT,
+            WriteLane.BULK,
+        ):
+            message = _get_message(self._to_write.get_nowait())
+            messages.append(message)
+            size += len(message) + 1
+        if len(messages) == 1:
+            return messages[0]
+        if self._binary:
+            return msgpack_array(cast(list[bytes], messages))
+        return f"[{','.join(cast(list[str], messages))}]"
+
+    def _send_message(
+        self, message: MessageType, lane: WriteLane, barrier: bool = False
+    ) -> None:
         """
         Send a message to the client.
 
+        Messages are written in order of (priority) lane, see WriteLaneQueue.
+        A barrier message is never reordered with other messages.
+
         Closes connection if the client is not reading the messages.
 
         Async friendly.
         """
-        _message = json_dumps(message)
+        _message = msgpack_dumps(message) if self._binary else json_dumps(message)
 
         try:
-            self._to_write.put_nowait(_message)
+            self._to_write.put_nowait(_message, lane, barrier)
         except asyncio.QueueFull:
             self._logger.error(
                 "Client exceeded max pending messages: %s", MAX_PENDING_MSG
@@ -252,3 +379,12 @@ class WebsocketClientHandler:
             self._handle_task.cancel()
         if self._writer_task is not None:
             self._writer_task.cancel()
+
+
+def _get_message(
+    process: str | bytes | Callable[[], str | bytes],
+) -> str | bytes:
+    """Return the (serialized) message of a queued item."""
+    if not isinstance(process, str | bytes):
+        return process()
+    return process
@@ -22,3 +22,32 @@ DEFAULT_PAA_ROOT_CERTS_DIR: Final[pathlib.Path] = (
 )
 
 DEFAULT_OTA_PROVIDER_DIR: Final[pathlib.Path] = pathlib.Path().cwd().joinpath("updates")
+
+# Default number of samples of the attribute history that is kept per attribute path
+DEFAULT_ATTRIBUTE_HISTORY_SIZE: Final[int] = 500
+
+# Default attribute paths of which rolling aggregates are kept: the electrical power
+# measurement cluster, the measured temperature and the Eve Watt/WattAccumulated
+DEFAULT_AGGREGATED_ATTRIBUTES: Final[tuple[str, ...]] = (
+    "*/144/*",
+    "*/1026/0",
+    "*/319486977/319422474",
+    "*/319486977/319422475",
+)
+
+# Default windows (in seconds) of the rolling attribute aggregates
+DEFAULT_AGGREGATE_WINDOWS: Final[tuple[int, ...]] = (60, 15 * 60, 3600)
+
+# Default bounds (in seconds) of the (adaptive) poll interval of custom attributes
+DEFAULT_POLL_INTERVAL_MIN: Final[int] = 30
+DEFAULT_POLL_INTERVAL_MAX: Final[int] = 300
+
+# Default max number of node events kept in the (persistent) event log
+DEFAULT_EVENT_LOG_SIZE: Final[int] = 5000
+
+# Default permissions of the unix socket the API is served on (owner and group only)
+DEFAULT_UNIX_SOCKET_MODE: Final[int] = 0o660
+
+# name of the unix socket (in the storage path) the front-end process connects to
+# when the server runs in split process mode
+CONTROLLER_SOCKET_NAME: Final[str] = "controller.sock"
@@ -9,10 +9,10 @@ pinging a device.
 from __future__ import annotations
 
 import asyncio
-from collections import deque
 from datetime import datetime
 from functools import cached_property, lru_cache
 import logging
+from pathlib import Path
 import re
 import secrets
 import time
@@ -24,6 +24,7 @@ from chip.clusters.Attribute import AttributeWriteResult, ValueDecodeFailure
 from chip.clusters.ClusterObjects import ALL_ATTRIBUTES, ALL_CLUSTERS, Cluster
 from chip.discovery import DiscoveryType
 from chip.exceptions import ChipStackError
+from chip.interaction_model import InteractionModelError
 from chip.native import PyChipError
 from zeroconf import (
     BadTypeInNameException,
@@ -41,7 +42,28 @@ from matter_server.common.models import (
     CommissioningParameters,
     MatterSoftwareVersion,
 )
+from matter_server.server.helpers.aggregates import AttributeAggregator
+from matter_server.server.helpers.attribute_history import AttributeHistory
+from matter_server.server.helpers.attribute_throttle import AttributeThrottle
 from matter_server.server.helpers.attributes import parse_attributes_from_read_result
+from matter_server.server.helpers.event_log import NodeEventLog
+from matter_server.server.helpers.interaction_queue import InteractionPriority
+from matter_server.server.helpers.polling import AdaptivePollSchedule
+from matter_server.server.helpers.retry import RetryScheduler
+from matter_server.server.helpers.setup_scheduler import (
+    NodeSetupScheduler,
+    SetupPriority,
+)
+from matter_server.server.helpers.storm import ResubscriptionStormGuard
+from matter_server.server.helpers.subscription_interval import (
+    NodeSubscriptionStats,
+    SubscriptionIntervalTuner,
+)
+from matter_server.server.helpers.subscriptions import (
+    SubscriptionTier,
+    get_subscription_paths,
+    get_tiered_subscription_paths,
+)
 from matter_server.server.helpers.utils import ping_ip
 from matter_server.server.ota import check_for_update, load_local_updates
 from matter_server.server.ota.provider import ExternalOtaProvider
@@ -49,40 +71,55 @@ from matter_server.server.sdk import ChipDeviceControllerWrapper
 
 from ..common.errors import (
     InvalidArguments,
+    MatterError,
+    NodeBusy,
     NodeCommissionFailed,
     NodeInterviewFailed,
     NodeNotExists,
     NodeNotReady,
     NodeNotResolving,
+    ServerBusy,
     UpdateCheckError,
     UpdateError,
 )
 from ..common.helpers.api import api_command
 from ..common.helpers.json import JSON_DECODE_EXCEPTIONS, json_loads
 from ..common.helpers.util import (
+    attribute_path_matches,
     create_attribute_path_from_attribute,
     dataclass_from_dict,
+    dataclass_to_dict,
     parse_attribute_path,
     parse_value,
 )
 from ..common.models import (
+    AdmissionMetrics,
     APICommand,
+    AttributeAggregate,
     EventType,
     MatterNodeData,
     MatterNodeEvent,
+    NetworkType,
+    NodeEventLogPage,
+    NodeInteractionQueueMetrics,
     NodePingResult,
+    NodeRetryState,
+    NodeSetupProgress,
+    ResubscriptionStormMetrics,
+    ThreadAirtimeMetrics,
     UpdateSource,
 )
 from .const import DATA_MODEL_SCHEMA_VERSION
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterable
-    from pathlib import Path
 
     from .server import MatterServer
 
 DATA_KEY_NODES = "nodes"
 DATA_KEY_LAST_NODE_ID = "last_node_id"
+DATA_KEY_SUBSCRIPTION_STATS = "subscription_stats"
+DATA_KEY_LAST_EVENT_NUMBERS = "last_event_numbers"
 
 LOGGER = logging.getLogger(__name__)
 NODE_SUBSCRIPTION_FLOOR_DEFAULT = 1
@@ -90,13 +127,45 @@ NODE_SUBSCRIPTION_FLOOR_ICD = 0
 NODE_SUBSCRIPTION_CEILING_WIFI = 60
 NODE_SUBSCRIPTION_CEILING_THREAD = 60
 NODE_SUBSCRIPTION_CEILING_BATTERY_POWERED = 600
+# bounds for the adaptive subscription ceiling of (stable or flaky) nodes
+NODE_SUBSCRIPTION_CEILING_MIN = 30
+NODE_SUBSCRIPTION_CEILING_MAX = 300
+# max number of attribute paths of a selective subscription, more paths than this
+# result in a wildcard subscription. The spec only guarantees 3 paths per
+# subscription, if a node refuses a selective subscription a wildcard is used.
+NODE_SUBSCRIPTION_MAX_PATHS = 16
+# report interval bounds of the slow subscription (diagnostic and measurement
+# clusters) when tiered subscriptions are enabled
+NODE_SUBSCRIPTION_FLOOR_SLOW = 30
+NODE_SUBSCRIPTION_CEILING_SLOW = 900
 NODE_RESUBSCRIBE_ATTEMPTS_UNAVAILABLE = 2
 NODE_RESUBSCRIBE_TIMEOUT_OFFLINE = 30 * 60
 NODE_RESUBSCRIBE_FORCE_TIMEOUT = 5
 NODE_PING_TIMEOUT = 10
 NODE_PING_TIMEOUT_BATTERY_POWERED = 60
 NODE_MDNS_SUBSCRIPTION_RETRY_TIMEOUT = 30 * 60
-CUSTOM_ATTRIBUTES_POLLER_INTERVAL = 30
+NODE_SETUP_RETRY_DELAY = 15
+NODE_SETUP_RETRY_DELAY_MAX = 5 * 60
+CUSTOM_ATTRIBUTES_POLLER_MIN_DELAY = 5
+
+# a resubscription storm is detected when the subscriptions of at least
+# RESUBSCRIPTION_STORM_NODES nodes fail within RESUBSCRIPTION_STORM_WINDOW seconds
+RESUBSCRIPTION_STORM_NODES = 10
+RESUBSCRIPTION_STORM_WINDOW = 30
+RESUBSCRIPTION_STORM_HOLD = 120
+# max number of (triggered) resubscriptions per second during a storm
+RESUBSCRIPTION_STORM_RATE = 2
+RESUBSCRIPTION_STORM_JITTER = 10
+
+# max number of attribute paths (of all nodes) of which the history is kept
+ATTRIBUTE_HISTORY_MAX_PATHS = 2000
+
+# an event number this much lower than the last event number of a node is a reset
+# of the event counter of the node (and not an event replayed by the node)
+EVENT_NUMBER_MAX_REPLAY = 1000
+# the last event numbers of the nodes are written to storage (at most) once per
+# LAST_EVENT_NUMBERS_SAVE_DELAY seconds
+LAST_EVENT_NUMBERS_SAVE_DELAY = 30
 
 MDNS_TYPE_OPERATIONAL_NODE = "_matter._tcp.local."
 MDNS_TYPE_COMMISSIONABLE_NODE = "_matterc._udp.local."
@@ -106,6 +175,12 @@ TEST_NODE_START = 900000
 ROUTING_ROLE_ATTRIBUTE_PATH = create_attribute_path_from_attribute(
     0, Clusters.ThreadNetworkDiagnostics.Attributes.RoutingRole
 )
+THREAD_EXTENDED_PAN_ID_ATTRIBUTE_PATH = create_attribute_path_from_attribute(
+    0, Clusters.ThreadNetworkDiagnostics.Attributes.ExtendedPanId
+)
+NETWORK_COMMISSIONING_FEATURE_MAP_ATTRIBUTE_PATH = create_attribute_path_from_attribute(
+    0, Clusters.NetworkCommissioning.Attributes.FeatureMap
+)
 DESCRIPTOR_PARTS_LIST_ATTRIBUTE_PATH = create_attribute_path_from_attribute(
     0, Clusters.Descriptor.Attributes.PartsList
 )
@@ -128,6 +203,9 @@ BASIC_INFORMATION_SOFTWARE_VERSION_STRING_ATTRIBUTE_PATH = (
 ICD_ATTR_LIST_ATTRIBUTE_PATH = create_attribute_path_from_attribute(
     0, Clusters.IcdManagement.Attributes.AttributeList
 )
+ICD_IDLE_MODE_DURATION_ATTRIBUTE_PATH = create_attribute_path_from_attribute(
+    0, Clusters.IcdManagement.Attributes.IdleModeDuration
+)
 
 RE_MDNS_SERVICE_NAME = re.compile(
     rf"^([0-9A-Fa-f]{{16}})-([0-9A-Fa-f]{{16}})\.{re.escape(MDNS_TYPE_OPERATIONAL_NODE)}$"
@@ -155,7 +233,7 @@ class MatterDeviceController:
         )
 
         # we keep the last events in memory so we can include them in the diagnostics dump
-        self.event_history: deque[Attribute.EventReadResult] = deque(maxlen=25)
+        self.event_log = NodeEventLog(server.event_log_size)
         self._compressed_fabric_id: int | None = None
         self._wifi_credentials_set: bool = False
         self._thread_credentials_set: bool = False
@@ -166,13 +244,55 @@ class MatterDeviceController:
         self._last_known_ip_addresses: dict[int, list[str]] = {}
         self._resubscription_attempt: dict[int, int] = {}
         self._first_resubscribe_attempt: dict[int, float] = {}
+        self._resubscription_storm = ResubscriptionStormGuard(
+            RESUBSCRIPTION_STORM_NODES,
+            RESUBSCRIPTION_STORM_WINDOW,
+            RESUBSCRIPTION_STORM_RATE,
+            RESUBSCRIPTION_STORM_JITTER,
+            RESUBSCRIPTION_STORM_HOLD,
+        )
+        self._resubscribe_triggers: dict[int, asyncio.Task] = {}
+        # the highest event number received per node, used to resume the event
+        # subscription and to drop events that are replayed by the node
+        self._last_event_numbers: dict[int, int] = {}
+        # nodes of which the last event number changed since it was written to storage
+        self._last_event_numbers_changed: set[int] = set()
+        self._last_event_numbers_timer: asyncio.TimerHandle | None = None
+        # nodes which (re)started since the last event was received, the events of
+        # these nodes are not filtered on event number when subscribing again
+        self._event_number_filter_skip: set[int] = set()
+        self._attribute_throttle = AttributeThrottle(
+            server.attribute_throttle_rules, self._signal_attribute_updated
+        )
+        self._attribute_history = AttributeHistory(
+            server.attribute_history_clusters,
+            server.attribute_history_size,
+            ATTRIBUTE_HISTORY_MAX_PATHS,
+        )
+        self._attribute_aggregator = AttributeAggregator(
+            server.aggregated_attributes, server.aggregate_windows
+        )
+        self._subscription_intervals = SubscriptionIntervalTuner(
+            NODE_SUBSCRIPTION_CEILING_MIN, NODE_SUBSCRIPTION_CEILING_MAX
+        )
         self._known_commissioning_params: dict[int, CommissioningParameters] = {}
         self._known_commissioning_params_timers: dict[int, asyncio.TimerHandle] = {}
         self._aiobrowser: AsyncServiceBrowser | None = None
         self._aiozc: AsyncZeroconf | None = None
-        self._thread_node_setup_throttle = asyncio.Semaphore(5)
+        self._node_setup_scheduler = NodeSetupScheduler(
+            lambda progress: self.server.signal_event(
+                EventType.NODE_SETUP_PROGRESS, progress
+            )
+        )
+        self._setup_retry = RetryScheduler(
+            self._retry_node_setup, NODE_SETUP_RETRY_DELAY, NODE_SETUP_RETRY_DELAY_MAX
+        )
         self._mdns_event_timer: dict[str, asyncio.TimerHandle] = {}
-        self._polled_attributes: dict[int, set[str]] = {}
+        # timestamp of the last received report/read, per node per attribute path
+        self._attribute_last_updated: dict[int, dict[str, float]] = {}
+        self._polled_attributes = AdaptivePollSchedule(
+            server.poll_interval_min, server.poll_interval_max
+        )
         self._custom_attribute_poller_timer: asyncio.TimerHandle | None = None
         self._custom_attribute_poller_task: asyncio.Task | None = None
         self._attribute_update_callbacks: dict[int, list[Callable]] = {}
@@ -187,6 +307,9 @@ class MatterDeviceController:
 
     async def start(self) -> None:
         """Handle logic on controller start."""
+        await self.event_log.start(
+            Path(self.server.storage_path, f"{self.compressed_fabric_id}.events.jsonl")
+        )
         # load nodes from persistent storage
         nodes: dict[str, dict | None] = self.server.storage.get(DATA_KEY_NODES, {})
         orphaned_nodes: set[str] = set()
@@ -218,9 +341,28 @@ class MatterDeviceController:
             # always mark node as unavailable at startup until subscriptions are ready
             node.available = False
             self._nodes[node_id] = node
+            self._update_node_network_type(node)
         # cleanup orhpaned nodes from storage
         for node_id_str in orphaned_nodes:
             self.server.storage.remove(DATA_KEY_NODES, node_id_str)
+        # restore the subscription statistics (used to pick the report interval)
+        subscription_stats: dict[str, dict] = self.server.storage.get(
+            DATA_KEY_SUBSCRIPTION_STATS, {}
+        )
+        for node_id_str, stats_dict in subscription_stats.items():
+            if int(node_id_str) not in self._nodes:
+                continue
+            self._subscription_intervals.set_stats(
+                int(node_id_str),
+                dataclass_from_dict(NodeSubscriptionStats, stats_dict),
+            )
+        # restore the last seen event numbers
+        last_event_numbers: dict[str, int] = self.server.storage.get(
+            DATA_KEY_LAST_EVENT_NUMBERS, {}
+        )
+        for node_id_str, event_number in last_event_numbers.items():
+            if int(node_id_str) in self._nodes:
+                self._last_event_numbers[int(node_id_str)] = event_number
         LOGGER.info("Loaded %s nodes from stored configuration", len(self._nodes))
         # set-up mdns browser
         self._aiozc = AsyncZeroconf(ip_version=IPVersion.All)
@@ -239,9 +381,15 @@ class MatterDeviceController:
             await self._aiobrowser.async_cancel()
         if self._aiozc:
             await self._aiozc.async_close()
-        # Ensure any in-progress setup tasks are cancelled
+        # Ensure any in-progress setup tasks (and scheduled retries) are cancelled
+        self._setup_retry.stop()
         for task in self._setup_node_tasks.values():
             task.cancel()
+        for task in self._resubscribe_triggers.values():
+            task.cancel()
+        self._attribute_throttle.stop()
+        self._save_last_event_numbers()
+        await self.event_log.stop()
 
         # shutdown the sdk device controller
         await self._chip_device_controller.shutdown()
@@ -277,6 +425,30 @@ class MatterDeviceController:
         """Return a logger for a specific node."""
         return logging.LoggerAdapter(logger, {"node": node_id})
 
+    def get_admission_metrics(self) -> dict[str, AdmissionMetrics]:
+        """Return the admission metrics per network type."""
+        return self._chip_device_controller.get_admission_metrics()
+
+    def get_thread_airtime_metrics(self) -> dict[str, ThreadAirtimeMetrics]:
+        """Return the airtime throttling metrics per Thread network."""
+        return self._chip_device_controller.get_thread_airtime_metrics()
+
+    def get_node_setup_progress(self) -> NodeSetupProgress:
+        """Return the progress of the current round of node setups."""
+        return self._node_setup_scheduler.get_progress()
+
+    def get_node_setup_retries(self) -> dict[int, NodeRetryState]:
+        """Return the retry state of the nodes of which the setup failed."""
+        return self._setup_retry.get_states()
+
+    def get_resubscription_storm_metrics(self) -> ResubscriptionStormMetrics:
+        """Return the metrics of the resubscription storm detection."""
+        return self._resubscription_storm.get_metrics()
+
+    def get_node_interaction_metrics(self) -> dict[int, NodeInteractionQueueMetrics]:
+        """Return the interaction queue metrics of all nodes."""
+        return self._chip_device_controller.get_node_interaction_metrics()
+
     @api_command(APICommand.GET_NODES)
     def get_nodes(self, only_available: bool = False) -> list[MatterNodeData]:
         """Return all Nodes known to the server."""
@@ -584,6 +756,7 @@ class MatterDeviceController:
                     node_id,
                     [()],
                     fabric_filtered=False,
+                    priority=InteractionPriority.BACKGROUND,
                 )
             )
         except ChipStackError as err:
@@ -643,6 +816,7 @@ class MatterDeviceController:
 
         # save updated node data
         self._nodes[node_id] = node
+        self._update_node_network_type(node)
         self._write_node_state(node_id, True)
         if is_new_node:
             # new node - first interview
@@ -721,6 +895,7 @@ class MatterDeviceController:
         node_id: int,
         attribute_path: str | list[str],
         fabric_filtered: bool = False,
+        max_age: float | None = None,
     ) -> dict[str, Any]:
         """
         Read one or more attribute(s) on a node by specifying an attributepath.
@@ -728,6 +903,10 @@ class MatterDeviceController:
         The attribute path can be a single string or a list of strings.
         The attribute path may contain wildcards (*) for cluster and/or attribute id.
 
+        If max_age (in seconds) is provided, (concrete) attribute paths that were
+        reported by the subscription of the node less than max_age seconds ago,
+        are answered from the cache without communicating with the node.
+
         The return type is a dictionary with the attribute path as key and the value as value.
         """
         if (node := self._nodes.get(node_id)) is None or not node.available:
@@ -749,6 +928,29 @@ class MatterDeviceController:
                 for attr_path in attribute_paths
             }
 
+        return await self._read_attribute(
+            node_id, attribute_paths, fabric_filtered, max_age
+        )
+
+    async def _read_attribute(
+        self,
+        node_id: int,
+        attribute_paths: list[str],
+        fabric_filtered: bool,
+        max_age: float | None = None,
+        priority: InteractionPriority = InteractionPriority.READ,
+    ) -> dict[str, Any]:
+        """Read one or more attribute path(s) on a node and update the node cache."""
+        node = self._nodes[node_id]
+        cached_attributes: dict[str, Any] = {}
+        if max_age is not None:
+            cached_attributes = self._get_fresh_attributes(
+                node_id, attribute_paths, max_age
+            )
+            attribute_paths = [x for x in attribute_paths if x not in cached_attributes]
+            if not attribute_paths:
+                return cached_attributes
+
         LOGGER.debug(
             "read_attribute called for node %s on path(s): %s - fabric_filtered: %s",
             node_id,
@@ -771,13 +973,20 @@ class MatterDeviceController:
             node_id,
             attributes,
             fabric_filtered,
+            priority,
         )
         read_atributes = parse_attributes_from_read_result(result.tlvAttributes)
         # update cached info in node attributes and signal events for updated attributes
         values_changed = False
+        last_updated = self._attribute_last_updated.setdefault(node_id, {})
+        read_time = time.time()
         for attr_path, value in read_atributes.items():
+            last_updated[attr_path] = read_time
+            # polled attributes (e.g. Eve energy) only get their values from reads
+            self._attribute_aggregator.record(node_id, attr_path, value, read_time)
             if node.attributes.get(attr_path) != value:
                 node.attributes[attr_path] = value
+                self._attribute_history.record(node_id, attr_path, value, read_time)
                 self.server.signal_event(
                     EventType.ATTRIBUTE_UPDATED,
                     # send data as tuple[node_id, attribute_path, new_value]
@@ -788,7 +997,38 @@ class MatterDeviceController:
         # schedule writing of the node state if any values changed
         if values_changed:
             self._write_node_state(node_id)
-        return read_atributes
+        # the read may have been shared with a (broader) concurrent read,
+        # only return the attribute paths that were requested
+        return {
+            **cached_attributes,
+            **{
+                attr_path: value
+                for attr_path, value in read_atributes.items()
+                if any(attribute_path_matches(x, attr_path) for x in attribute_paths)
+            },
+        }
+
+    def _get_fresh_attributes(
+        self, node_id: int, attribute_paths: list[str], max_age: float
+    ) -> dict[str, Any]:
+        """Return the cached values of attribute paths updated within max_age seconds.
+
+        Only concrete attribute paths of nodes with a healthy subscription qualify.
+        """
+        if (
+            not self._chip_device_controller.node_has_subscription(node_id)
+            or self._resubscription_attempt.get(node_id, 0) > 0
+        ):
+            return {}
+        node = self._nodes[node_id]
+        last_updated = self._attribute_last_updated.get(node_id, {})
+        min_timestamp = time.time() - max_age
+        return {
+            attr_path: node.attributes[attr_path]
+            for attr_path in attribute_paths
+            if last_updated.get(attr_path, 0) >= min_timestamp
+            and attr_path in node.attributes
+        }
 
     @api_command(APICommand.WRITE_ATTRIBUTE)
     async def write_attribute(
@@ -837,18 +1077,37 @@ class MatterDeviceController:
 
         LOGGER.info("Removing Node ID %s.", node_id)
 
+        self._setup_retry.cancel(node_id)
         if task := self._setup_node_tasks.pop(node_id, None):
             task.cancel()
 
         # shutdown any existing subscriptions
         await self._chip_device_controller.shutdown_subscription(node_id)
-        self._polled_attributes.pop(node_id, None)
+        self._chip_device_controller.invalidate_session(node_id)
+        self._polled_attributes.remove_node(node_id)
+        self._attribute_last_updated.pop(node_id, None)
+        self._subscription_intervals.remove_node(node_id)
+        self._last_event_numbers.pop(node_id, None)
+        self._last_event_numbers_changed.discard(node_id)
+        self._event_number_filter_skip.discard(node_id)
+        self._attribute_throttle.remove_node(node_id)
+        self._attribute_history.remove_node(node_id)
+        self._attribute_aggregator.remove_node(node_id)
+        self.event_log.remove_node(node_id)
 
         node = self._nodes.pop(node_id)
         self.server.storage.remove(
             DATA_KEY_NODES,
             subkey=str(node_id),
         )
+        self.server.storage.remove(
+            DATA_KEY_SUBSCRIPTION_STATS,
+            subkey=str(node_id),
+        )
+        self.server.storage.remove(
+            DATA_KEY_LAST_EVENT_NUMBERS,
+            subkey=str(node_id),
+        )
 
         LOGGER.info("Node ID %s successfully removed from Matter server.", node_id)
 
@@ -885,6 +1144,106 @@ class MatterDeviceController:
             node_id, [(endpoint, Clusters.Binding.Attributes.Binding(bindings))]
         )
 
+    @api_command(APICommand.GET_ATTRIBUTE_HISTORY)
+    async def get_attribute_history(
+        self,
+        node_id: int,
+        attribute_paths: list[str],
+        start: float | None = None,
+        end: float | None = None,
+    ) -> dict[str, list[tuple[float, float | None]]]:
+        """
+        Return the recorded history of attribute(s) of a node.
+
+        Only the attributes of the clusters for which history is enabled are recorded.
+        The attribute paths may contain wildcards (*). Optionally, the samples can be
+        limited to a time range (start and end as unix timestamps). The return type is
+        a dictionary with the attribute path as key and a list of (timestamp, value)
+        samples (oldest first) as value.
+        """
+        if node_id not in self._nodes:
+            raise NodeNotExists(
+                f"Node {node_id} does not exist or is not yet interviewed"
+            )
+        return self._attribute_history.get_history(node_id, attribute_paths, start, end)
+
+    @api_command(APICommand.GET_ATTRIBUTE_AGGREGATES)
+    async def get_attribute_aggregates(
+        self, node_id: int, attribute_paths: list[str]
+    ) -> dict[str, list[AttributeAggregate]]:
+        """
+        Return the rolling aggregates of (numeric) attribute(s) of a node.
+
+        The attribute paths may contain wildcards (*). The return type is a dictionary
+        with the attribute path as key and the (min/max/mean/last) aggregate per
+        configured window as value.
+        """
+        if node_id not in self._nodes:
+            raise NodeNotExists(
+                f"Node {node_id} does not exist or is not yet interviewed"
+            )
+        return self._attribute_aggregator.get_aggregates(
+            node_id, attribute_paths, time.time()
+        )
+
+    @api_command(APICommand.GET_NODE_EVENTS)
+    async def get_node_events(
+        self,
+        node_id: int | None = None,
+        cluster_id: int | None = None,
+        event_id: int | None = None,
+        since_event_number: int | None = None,
+        since_timestamp: int | None = None,
+        cursor: int | None = None,
+        limit: int = 100,
+    ) -> NodeEventLogPage:
+        """
+        Return (a page of) the logged node events, oldest first.
+
+        The events can be filtered by node, cluster and event id and (exclusive) by
+        event number or timestamp. To get the next page, pass the cursor of the
+        returned page (with the same filters).
+        """
+        return self.event_log.query(
+            node_id=node_id,
+            cluster_id=cluster_id,
+            event_id=event_id,
+            since_event_number=since_event_number,
+            since_timestamp=since_timestamp,
+            cursor=cursor,
+            limit=limit,
+        )
+
+    @api_command(APICommand.SET_ATTRIBUTE_SUBSCRIPTIONS)
+    async def set_attribute_subscriptions(
+        self, node_id: int, attribute_paths: list[str]
+    ) -> None:
+        """
+        Set the attribute paths to subscribe to for a node.
+
+        The attribute paths are in format endpoint/cluster/attribute and may contain
+        wildcards (*). An empty list resets the node to subscribe to all (not
+        excluded) clusters. Paths that are not subscribed can still be read on demand.
+        """
+        node = self._nodes.get(node_id)
+        if node is None:
+            raise NodeNotExists(
+                f"Node {node_id} does not exist or is not yet interviewed"
+            )
+        try:
+            attribute_subscriptions = {
+                parse_attribute_path(attribute_path)
+                for attribute_path in attribute_paths
+            }
+        except ValueError as err:
+            raise InvalidArguments(f"Invalid attribute path: {err}") from err
+        if attribute_subscriptions == node.attribute_subscriptions:
+            return
+        node.attribute_subscriptions = attribute_subscriptions
+        self._write_node_state(node_id)
+        if node.available and node_id < TEST_NODE_START:
+            await self._subscribe_node(node_id)
+
     @api_command(APICommand.PING_NODE)
     async def ping_node(self, node_id: int, attempts: int = 1) -> NodePingResult:
         """Ping node on the currently known IP-address(es)."""
@@ -1197,6 +1556,9 @@ class MatterDeviceController:
 
             # store updated value in node attributes
             node.attributes[str(path)] = new_value
+            now = time.time()
+            self._attribute_history.record(node_id, str(path), new_value, now)
+            self._attribute_aggregator.record(node_id, str(path), new_value, now)
 
             # schedule save to persistent storage
             self._write_node_state(node_id)
@@ -1205,12 +1567,15 @@ class MatterDeviceController:
                 for callback in self._attribute_update_callbacks[node_id]:
                     self._loop.create_task(callback(path, old_value, new_value))
 
-            # This callback is running in the CHIP stack thread
-            self.server.signal_event(
-                EventType.ATTRIBUTE_UPDATED,
-                # send data as tuple[node_id, attribute_path, new_value]
-                (node_id, str(path), new_value),
-            )
+            # updates of (chatty) attributes may be throttled or filtered, the
+            # latest value is always stored though
+            if self._attribute_throttle.process(node_id, str(path), new_value):
+                self._signal_attribute_updated(node_id, str(path), new_value)
+
+        def report_received_callback(now: float) -> None:
+            # the report statistics are only updated from the event loop
+            if self._subscription_intervals.record_report(node_id, now):
+                self._write_subscription_stats(node_id)
 
         def attribute_updated_callback_threadsafe(
             path: Attribute.AttributePath,
@@ -1223,7 +1588,12 @@ class MatterDeviceController:
                 return
 
             node = self._nodes[node_id]
-            old_value = node.attributes.get(str(path))
+            attr_path = str(path)
+            old_value = node.attributes.get(attr_path)
+            # a report confirms the value is current, even if it did not change
+            now = time.time()
+            self._attribute_last_updated.setdefault(node_id, {})[attr_path] = now
+            self._loop.call_soon_threadsafe(report_received_callback, now)
 
             # return early if the value did not actually change at all
             if old_value == new_value:
@@ -1243,20 +1613,39 @@ class MatterDeviceController:
                 data,
                 transaction,
             )
+            event_number = data.Header.EventNumber
+            last_event_number = self._last_event_numbers.get(node_id)
+            if last_event_number is not None and event_number <= last_event_number:
+                if (
+                    not isinstance(data.Data, Clusters.BasicInformation.Events.StartUp)
+                    and last_event_number - event_number < EVENT_NUMBER_MAX_REPLAY
+                ):
+                    # the node replayed an event we already received (and forwarded)
+                    node_logger.debug("Ignoring duplicate event %s", event_number)
+                    return
+                # the node (re)started with a reset event counter
+                node_logger.info(
+                    "Event number reset from %s to %s", last_event_number, event_number
+                )
+                self._event_number_filter_skip.add(node_id)
+            self._last_event_numbers[node_id] = event_number
+            self._schedule_save_last_event_numbers(node_id)
             node_event = MatterNodeEvent(
                 node_id=node_id,
                 endpoint_id=data.Header.EndpointId,
                 cluster_id=data.Header.ClusterId,
                 event_id=data.Header.EventId,
-                event_number=data.Header.EventNumber,
+                event_number=event_number,
                 priority=data.Header.Priority,
                 timestamp=data.Header.Timestamp,
                 timestamp_type=data.Header.TimestampType,
                 data=data.Data,
             )
-            self.event_history.append(node_event)
+            self.event_log.append(node_event)
 
             if isinstance(data.Data, Clusters.BasicInformation.Events.ShutDown):
+                # the event counter of the node may be reset when it starts again
+                self._event_number_filter_skip.add(node_id)
                 # Force resubscription after a shutdown event. Otherwise we'd have to
                 # wait for up to NODE_SUBSCRIPTION_CEILING_BATTERY_POWERED minutes for
                 # the SDK to notice the device is gone.
@@ -1289,8 +1678,22 @@ class MatterDeviceController:
                 resubscription_attempt,
             )
             self._resubscription_attempt[node_id] = resubscription_attempt + 1
+            # the session with the node is lost, do not reuse the cached device proxy
+            self._chip_device_controller.invalidate_session(node_id)
             if resubscription_attempt == 0:
                 self._first_resubscribe_attempt[node_id] = time.time()
+                self._subscription_intervals.record_failure(node_id, time.time())
+                self._write_subscription_stats(node_id)
+                storm_active = self._resubscription_storm.active
+                if self._resubscription_storm.record_failure(node_id) and not (
+                    storm_active
+                ):
+                    LOGGER.warning(
+                        "Subscriptions of %s nodes failed within %s seconds, "
+                        "pacing resubscriptions",
+                        self._resubscription_storm.failing_nodes,
+                        RESUBSCRIPTION_STORM_WINDOW,
+                    )
             # Mark node as unavailable and signal consumers.
             # We debounce it a bit so we only mark the node unavailable
             # after some resubscription attempts.
@@ -1319,6 +1722,18 @@ class MatterDeviceController:
                 node.available = True
                 self.server.signal_event(EventType.NODE_UPDATED, node)
 
+        def slow_resubscription_attempted(
+            transaction: Attribute.SubscriptionTransaction,
+            terminationError: int,
+            nextResubscribeIntervalMsec: int,
+        ) -> None:
+            # pylint: disable=unused-argument, invalid-name
+            node_logger.debug(
+                "Slow subscription failed with %s, resubscribing in %sms",
+                str(PyChipError(code=terminationError)),
+                nextResubscribeIntervalMsec,
+            )
+
         node_logger.info("Setting up attributes and events subscription.")
         # determine subscription ceiling based on routing role
         # Endpoint 0, ThreadNetworkDiagnostics Cluster, routingRole attribute
@@ -1334,47 +1749,168 @@ class MatterDeviceController:
             interval_ceiling = NODE_SUBSCRIPTION_CEILING_BATTERY_POWERED
         else:
             interval_ceiling = NODE_SUBSCRIPTION_CEILING_THREAD
+        icd_idle_mode_duration: int | None = None
         if node.attributes.get(ICD_ATTR_LIST_ATTRIBUTE_PATH) is not None:
             # for ICD devices, the interval floor must be 0 according to the spec,
             # to prevent additional battery drainage. See Matter core spec, chapter 8.5.2.2.
             # TODO: revisit this after Matter 1.4 release (as that mighht change this again).
             interval_floor = NODE_SUBSCRIPTION_FLOOR_ICD
+            icd_idle_mode_duration = node.attributes.get(
+                ICD_IDLE_MODE_DURATION_ATTRIBUTE_PATH
+            )
         else:
             interval_floor = NODE_SUBSCRIPTION_FLOOR_DEFAULT
-        self._resubscription_attempt[node_id] = 0
-        # set-up the actual subscription
-        sub: Attribute.SubscriptionTransaction = (
-            await self._chip_device_controller.read_attribute(
-                node_id,
-                [()],
-                events=[("*", 1)],
-                return_cluster_objects=False,
-                report_interval=(interval_floor, interval_ceiling),
-                auto_resubscribe=True,
-            )
+        # adapt the ceiling to the observed subscription history of the node
+        interval_ceiling = self._subscription_intervals.choose_ceiling(
+            node_id, interval_ceiling, time.time(), icd_idle_mode_duration
         )
-
-        # Make sure to clear default handler which prints to stdout
-        sub.SetAttributeUpdateCallback(None)
-        sub.SetRawAttributeUpdateCallback(attribute_updated_callback_threadsafe)
-        sub.SetEventUpdateCallback(event_callback_threadsafe)
-        sub.SetErrorCallback(error_callback)
-        sub.SetResubscriptionAttemptedCallback(resubscription_attempted)
-        sub.SetResubscriptionSucceededCallback(resubscription_succeeded)
-
-        node.available = True
-        # update attributes with current state from read request
-        tlv_attributes = sub.GetTLVAttributes()
-        node.attributes.update(parse_attributes_from_read_result(tlv_attributes))
-
-        report_interval_floor, report_interval_ceiling = (
-            sub.GetReportingIntervalsSeconds()
+        self._write_subscription_stats(node_id)
+        node_logger.debug(
+            "Using subscription report interval %s-%s seconds",
+            interval_floor,
+            interval_ceiling,
         )
-        node_logger.info(
-            "Subscription succeeded with report interval [%d, %d]",
-            report_interval_floor,
-            report_interval_ceiling,
+        # subscribe to the configured attribute subscriptions (or all clusters minus
+        # the excluded clusters), excluded paths can still be read on demand
+        tiered_paths = (
+            get_tiered_subscription_paths(
+                node,
+                self.server.subscription_exclude_clusters,
+                NODE_SUBSCRIPTION_MAX_PATHS,
+            )
+            if self.server.tiered_subscriptions
+            else None
         )
+        subscriptions: list[
+            tuple[SubscriptionTier, list[Any] | None, tuple[int, int]]
+        ] = []
+        if tiered_paths is not None:
+            # the diagnostic, measurement and (root endpoint) configuration
+            # clusters get their own subscription with a larger report interval,
+            # so they do not report as often
+            # (the floor of ICD devices must be 0, see above)
+            slow_floor = (
+                NODE_SUBSCRIPTION_FLOOR_ICD
+                if interval_floor == NODE_SUBSCRIPTION_FLOOR_ICD
+                else NODE_SUBSCRIPTION_FLOOR_SLOW
+            )
+            subscriptions.append(
+                (
+                    SubscriptionTier.FAST,
+                    tiered_paths[SubscriptionTier.FAST],
+                    (interval_floor, interval_ceiling),
+                )
+            )
+            subscriptions.append(
+                (
+                    SubscriptionTier.SLOW,
+                    tiered_paths[SubscriptionTier.SLOW],
+                    (
+                        slow_floor,
+                        max(interval_ceiling, NODE_SUBSCRIPTION_CEILING_SLOW),
+                    ),
+                )
+            )
+            node_logger.debug("Using tiered (fast and slow) subscriptions")
+        else:
+            subscription_paths = get_subscription_paths(
+                node,
+                self.server.subscription_exclude_clusters,
+                NODE_SUBSCRIPTION_MAX_PATHS,
+            )
+            if subscription_paths is not None:
+                node_logger.debug(
+                    "Using selective subscription for %s attribute path(s)",
+                    len(subscription_paths),
+                )
+            subscriptions.append(
+                (
+                    SubscriptionTier.FAST,
+                    subscription_paths,
+                    (interval_floor, interval_ceiling),
+                )
+            )
+        # resume the events after the last event we received (e.g. before a restart),
+        # unless the node restarted since (its event counter may have been reset,
+        # which would hide all of its new events), duplicates are dropped anyway
+        event_number_filter: int | None = None
+        if node_id in self._event_number_filter_skip:
+            self._event_number_filter_skip.discard(node_id)
+        elif (last_event_number := self._last_event_numbers.get(node_id)) is not None:
+            event_number_filter = last_event_number + 1
+        self._resubscription_attempt[node_id] = 0
+        self._attribute_last_updated[node_id] = {}
+
+        async def subscribe(
+            tier: SubscriptionTier,
+            attribute_paths: list[Any] | None,
+            report_interval: tuple[int, int],
+        ) -> None:
+            # set-up the actual subscription
+            sub: Attribute.SubscriptionTransaction = (
+                await self._chip_device_controller.read_attribute(
+                    node_id,
+                    attribute_paths or [()],
+                    # events are only subscribed to with the fast subscription
+                    events=[("*", 1)] if tier == SubscriptionTier.FAST else None,
+                    event_number_filter=(
+                        event_number_filter if tier == SubscriptionTier.FAST else None
+                    ),
+                    return_cluster_objects=False,
+                    report_interval=report_interval,
+                    auto_resubscribe=True,
+                    priority=InteractionPriority.BACKGROUND,
+                    subscription_tier=tier,
+                )
+            )
+
+            # Make sure to clear default handler which prints to stdout
+            sub.SetAttributeUpdateCallback(None)
+            sub.SetRawAttributeUpdateCallback(attribute_updated_callback_threadsafe)
+            sub.SetEventUpdateCallback(event_callback_threadsafe)
+            sub.SetErrorCallback(error_callback)
+            if tier == SubscriptionTier.FAST:
+                # the availability of the node follows the fast subscription
+                sub.SetResubscriptionAttemptedCallback(resubscription_attempted)
+                sub.SetResubscriptionSucceededCallback(resubscription_succeeded)
+            else:
+                sub.SetResubscriptionAttemptedCallback(slow_resubscription_attempted)
+
+            node.available = True
+            # update attributes with current state from read request
+            tlv_attributes = sub.GetTLVAttributes()
+            sub_attributes = parse_attributes_from_read_result(tlv_attributes)
+            node.attributes.update(sub_attributes)
+            self._attribute_last_updated[node_id].update(
+                dict.fromkeys(sub_attributes, time.time())
+            )
+
+            report_interval_floor, report_interval_ceiling = (
+                sub.GetReportingIntervalsSeconds()
+            )
+            node_logger.info(
+                "Subscription (%s) succeeded with report interval [%d, %d]",
+                tier.value,
+                report_interval_floor,
+                report_interval_ceiling,
+            )
+
+        try:
+            for tier, attribute_paths, report_interval in subscriptions:
+                await subscribe(tier, attribute_paths, report_interval)
+        except (ChipStackError, InteractionModelError) as err:
+            if all(paths is None for _, paths, _ in subscriptions):
+                raise
+            # the node may support fewer paths per subscription than we assume
+            # (the spec only guarantees 3), fall back to a wildcard subscription
+            node_logger.warning(
+                "Selective subscription failed (%s), using a wildcard subscription",
+                str(err) or err.__class__.__name__,
+            )
+            await self._chip_device_controller.shutdown_subscription(node_id)
+            await subscribe(
+                SubscriptionTier.FAST, None, (interval_floor, interval_ceiling)
+            )
 
         self.server.signal_event(EventType.NODE_UPDATED, node)
 
@@ -1391,19 +1927,14 @@ class MatterDeviceController:
     ) -> None:
         """Handle set-up of subscriptions and interview (if needed) for known/discovered node."""
         node_data = self._nodes[node_id]
-        is_thread_node = (
-            node_data.attributes.get(ROUTING_ROLE_ATTRIBUTE_PATH) is not None
-        )
 
-        # use semaphore for thread based devices to (somewhat)
-        # throttle the traffic that setup/initial subscription generates
-        if is_thread_node:
-            await self._thread_node_setup_throttle.acquire()
-
-        try:
+        # the setup scheduler throttles the traffic that setup/initial subscription
+        # generates and sets up routers before end devices and sleepy devices
+        async with self._node_setup_scheduler.slot(self._get_setup_priority(node_data)):
             node_logger.info("Setting-up node...")
 
             # try to resolve the node using the sdk first before do anything else
+            case_start = time.monotonic()
             try:
                 await self._chip_device_controller.find_or_establish_case_session(
                     node_id=node_id
@@ -1416,6 +1947,7 @@ class MatterDeviceController:
                     exc_info=err if LOGGER.isEnabledFor(VERBOSE_LOG_LEVEL) else None,
                 )
                 raise err
+            setup_latency = time.monotonic() - case_start
 
             # (re)interview node (only) if needed
             if (
@@ -1426,7 +1958,7 @@ class MatterDeviceController:
             ):
                 try:
                     await self._interview_node(node_id)
-                except NodeInterviewFailed as err:
+                except (NodeInterviewFailed, NodeBusy, ServerBusy) as err:
                     node_logger.warning(
                         "Setup for node failed: %s",
                         str(err) or err.__class__.__name__,
@@ -1438,9 +1970,10 @@ class MatterDeviceController:
                     raise err
 
             # setup subscriptions for the node
+            subscribe_start = time.monotonic()
             try:
                 await self._subscribe_node(node_id)
-            except ChipStackError as err:
+            except (ChipStackError, NodeBusy, ServerBusy) as err:
                 node_logger.warning(
                     "Unable to subscribe to Node: %s",
                     str(err) or err.__class__.__name__,
@@ -1448,14 +1981,16 @@ class MatterDeviceController:
                     exc_info=err if LOGGER.isEnabledFor(VERBOSE_LOG_LEVEL) else None,
                 )
                 raise err
+            # adapt the setup concurrency to the observed CASE/subscribe latency
+            setup_latency += time.monotonic() - subscribe_start
+            self._node_setup_scheduler.report_latency(setup_latency)
 
             # check if this node has any custom clusters that need to be polled
             if polled_attributes := check_polled_attributes(node_data):
-                self._polled_attributes[node_id] = polled_attributes
+                self._polled_attributes.set_attributes(
+                    node_id, polled_attributes, time.time()
+                )
                 self._schedule_custom_attributes_poller()
-        finally:
-            if is_thread_node:
-                self._thread_node_setup_throttle.release()
 
     async def _setup_node(self, node_id: int) -> None:
         if node_id not in self._nodes:
@@ -1463,25 +1998,56 @@ class MatterDeviceController:
 
         node_logger = self.get_node_logger(LOGGER, node_id)
 
-        while True:
-            try:
-                await self._setup_node_try_once(node_logger, node_id)
-                break
-            except (NodeNotResolving, NodeInterviewFailed, ChipStackError):
-                if (
-                    time.time() - self._node_last_seen_on_mdns.get(node_id, 0)
-                    > NODE_MDNS_SUBSCRIPTION_RETRY_TIMEOUT
-                ):
-                    # NOTE: assume the node will be picked up by mdns discovery later
-                    # automatically when it becomes available again.
-                    node_logger.warning(
-                        "Node setup not completed after %s minutes, giving up.",
-                        NODE_MDNS_SUBSCRIPTION_RETRY_TIMEOUT // 60,
-                    )
-                    break
+        try:
+            await self._setup_node_try_once(node_logger, node_id)
+        except (
+            NodeNotResolving,
+            NodeInterviewFailed,
+            NodeBusy,
+            ServerBusy,
+            ChipStackError,
+        ) as err:
+            if (
+                time.time() - self._node_last_seen_on_mdns.get(node_id, 0)
+                > NODE_MDNS_SUBSCRIPTION_RETRY_TIMEOUT
+            ):
+                # NOTE: assume the node will be picked up by mdns discovery later
+                # automatically when it becomes available again.
+                node_logger.warning(
+                    "Node setup not completed after %s minutes, giving up.",
+                    NODE_MDNS_SUBSCRIPTION_RETRY_TIMEOUT // 60,
+                )
+                self._setup_retry.cancel(node_id)
+                return
+            # the retry is scheduled centrally (and woken early by mDNS activity)
+            delay = self._setup_retry.schedule(
+                node_id, str(err) or err.__class__.__name__
+            )
+            node_logger.info("Retrying node setup in %s seconds...", round(delay))
+        else:
+            self._setup_retry.cancel(node_id)
 
-            node_logger.info("Retrying node setup in 60 seconds...")
-            await asyncio.sleep(60)
+    def _retry_node_setup(self, node_id: int) -> None:
+        """Handle a scheduled retry of a node setup."""
+        if node_id not in self._nodes:
+            self._setup_retry.cancel(node_id)
+            return
+        self._setup_node_create_task(node_id)
+
+    def _get_setup_priority(self, node: MatterNodeData) -> SetupPriority:
+        """Return the priority to set up the node with."""
+        routing_role = node.attributes.get(ROUTING_ROLE_ATTRIBUTE_PATH)
+        roles = Clusters.ThreadNetworkDiagnostics.Enums.RoutingRoleEnum
+        if routing_role is None or routing_role in (
+            roles.kReed,
+            roles.kRouter,
+            roles.kLeader,
+        ):
+            # mains powered Thread (router eligible) devices and WiFi/Ethernet nodes
+            return SetupPriority.ROUTER
+        if routing_role == roles.kSleepyEndDevice:
+            return SetupPriority.SLEEPY_END_DEVICE
+        return SetupPriority.END_DEVICE
 
     def _setup_node_create_task(self, node_id: int) -> asyncio.Task | None:
         """Create a task for setting up a node with retry."""
@@ -1596,7 +2162,9 @@ class MatterDeviceController:
         if not self._chip_device_controller.node_has_subscription(node_id):
             node_logger.info("Discovered on mDNS")
             # Setup the node - this will setup the subscriptions etc.
-            self._setup_node_create_task(node_id)
+            # If a retry of the setup is scheduled already, retry it early instead.
+            if not self._setup_retry.wake(node_id):
+                self._setup_node_create_task(node_id)
         elif state_change == ServiceStateChange.Added:
             # Trigger node re-subscriptions when mDNS entry got added
             # Note: Users seem to get such mDNS messages fairly regularly, and often
@@ -1606,11 +2174,7 @@ class MatterDeviceController:
             # But this does speedup the resubscription process in case the subscription
             # is already in resubscribe mode.
             node_logger.debug("Activity on mDNS, trigger resubscribe if scheduled")
-            asyncio.create_task(
-                self._chip_device_controller.trigger_resubscribe_if_scheduled(
-                    node_id, "mDNS state change detected"
-                )
-            )
+            self._trigger_resubscribe(node_id, "mDNS state change detected")
 
     def _on_mdns_commissionable_node_state(
         self, name: str, state_change: ServiceStateChange
@@ -1650,10 +2214,85 @@ class MatterDeviceController:
             force=force,
         )
 
+    def _update_node_network_type(self, node: MatterNodeData) -> None:
+        """Inform the SDK wrapper about the (type of) network the node is on."""
+        network_type = NetworkType.UNKNOWN
+        feature_map = node.attributes.get(
+            NETWORK_COMMISSIONING_FEATURE_MAP_ATTRIBUTE_PATH, 0
+        )
+        features = Clusters.NetworkCommissioning.Bitmaps.Feature
+        # thread devices always have the ThreadNetworkDiagnostics cluster
+        if node.attributes.get(ROUTING_ROLE_ATTRIBUTE_PATH) is not None or (
+            feature_map & features.kThreadNetworkInterface
+        ):
+            network_type = NetworkType.THREAD
+        elif feature_map & features.kWiFiNetworkInterface:
+            network_type = NetworkType.WIFI
+        elif feature_map & features.kEthernetNetworkInterface:
+            network_type = NetworkType.ETHERNET
+        # the extended PAN ID identifies the Thread network the node is on
+        extended_pan_id = node.attributes.get(THREAD_EXTENDED_PAN_ID_ATTRIBUTE_PATH)
+        self._chip_device_controller.set_node_network_type(
+            node.node_id,
+            network_type,
+            extended_pan_id if isinstance(extended_pan_id, int) else None,
+        )
+
+    def _signal_attribute_updated(
+        self, node_id: int, attribute_path: str, value: Any
+    ) -> None:
+        """Signal an attribute update of a node to the clients."""
+        if node_id not in self._nodes:
+            return  # guard
+        self.server.signal_event(
+            EventType.ATTRIBUTE_UPDATED,
+            # send data as tuple[node_id, attribute_path, new_value]
+            (node_id, attribute_path, value),
+        )
+
+    def _write_subscription_stats(self, node_id: int) -> None:
+        """Schedule the write of the subscription statistics of a node to storage."""
+        if node_id >= TEST_NODE_START:
+            return  # test nodes are stored in memory only
+        if (stats := self._subscription_intervals.get_stats(node_id)) is None:
+            return
+        self.server.storage.set(
+            DATA_KEY_SUBSCRIPTION_STATS,
+            value=dataclass_to_dict(stats),
+            subkey=str(node_id),
+        )
+
+    def _schedule_save_last_event_numbers(self, node_id: int) -> None:
+        """Schedule the (batched) write of the last event number of a node."""
+        if node_id >= TEST_NODE_START:
+            return  # test nodes are stored in memory only
+        self._last_event_numbers_changed.add(node_id)
+        if self._last_event_numbers_timer is None:
+            self._last_event_numbers_timer = self._loop.call_later(
+                LAST_EVENT_NUMBERS_SAVE_DELAY, self._save_last_event_numbers
+            )
+
+    def _save_last_event_numbers(self) -> None:
+        """Write the changed last event numbers to storage."""
+        if self._last_event_numbers_timer is not None:
+            self._last_event_numbers_timer.cancel()
+            self._last_event_numbers_timer = None
+        for node_id in self._last_event_numbers_changed:
+            if (event_number := self._last_event_numbers.get(node_id)) is None:
+                continue
+            self.server.storage.set(
+                DATA_KEY_LAST_EVENT_NUMBERS,
+                value=event_number,
+                subkey=str(node_id),
+            )
+        self._last_event_numbers_changed.clear()
+
     def _node_unavailable(
         self, node_id: int, force_resubscription: bool = False
     ) -> None:
         """Mark node as unavailable."""
+        # the session with the node is lost, do not reuse the cached device proxy
+        self._chip_device_controller.invalidate_session(node_id)
         # mark node as unavailable (if it wasn't already)
         node = self._nodes[node_id]
         if not node.available:
@@ -1663,35 +2302,53 @@ class MatterDeviceController:
         node_logger = self.get_node_logger(LOGGER, node_id)
         node_logger.info("Marked node as unavailable")
         if force_resubscription:
-            # Make sure the subscriptions are expiring very soon to trigger subscription
-            # resumption logic quickly. This is especially important for battery operated
-            # devices so subscription resumption logic kicks in quickly.
-            node_logger.info(
-                "Forcing subscription timeout in %ds", NODE_RESUBSCRIBE_FORCE_TIMEOUT
-            )
-            asyncio.create_task(
-                self._chip_device_controller.subscription_override_liveness_timeout(
-                    node_id, NODE_RESUBSCRIBE_FORCE_TIMEOUT * 1000
-                )
-            )
-            # Clear the timeout soon after the scheduled timeout above. This causes the
-            # SDK to use the default liveness timeout again, which is what we want for
-            # the once resumed subscription.
-            self._loop.call_later(
-                NODE_RESUBSCRIBE_FORCE_TIMEOUT + 1,
-                lambda: asyncio.create_task(
-                    self._chip_device_controller.subscription_override_liveness_timeout(
-                        node_id, 0
-                    )
-                ),
+            asyncio.create_task(self._force_resubscription(node_id))
+
+    async def _force_resubscription(self, node_id: int) -> None:
+        """Force the subscription of a node to expire soon to resubscribe quickly."""
+        node_logger = self.get_node_logger(LOGGER, node_id)
+        # during a resubscription storm, resubscriptions are paced
+        await self._resubscription_storm.pace()
+        # Make sure the subscriptions are expiring very soon to trigger subscription
+        # resumption logic quickly. This is especially important for battery operated
+        # devices so subscription resumption logic kicks in quickly.
+        node_logger.info(
+            "Forcing subscription timeout in %ds", NODE_RESUBSCRIBE_FORCE_TIMEOUT
+        )
+        await self._chip_device_controller.subscription_override_liveness_timeout(
+            node_id, NODE_RESUBSCRIBE_FORCE_TIMEOUT * 1000
+        )
+        # Clear the timeout soon after the scheduled timeout above. This causes the
+        # SDK to use the default liveness timeout again, which is what we want for
+        # the once resumed subscription.
+        await asyncio.sleep(NODE_RESUBSCRIBE_FORCE_TIMEOUT + 1)
+        await self._chip_device_controller.subscription_override_liveness_timeout(
+            node_id, 0
+        )
+
+    def _trigger_resubscribe(self, node_id: int, reason: str) -> None:
+        """Trigger resubscribe of a node (if scheduled), paced during a storm."""
+        if node_id in self._resubscribe_triggers:
+            # a (paced) trigger is pending already
+            return
+
+        async def _trigger() -> None:
+            await self._resubscription_storm.pace()
+            await self._chip_device_controller.trigger_resubscribe_if_scheduled(
+                node_id, reason
             )
 
+        task = asyncio.create_task(_trigger())
+        task.add_done_callback(lambda _: self._resubscribe_triggers.pop(node_id, None))
+        self._resubscribe_triggers[node_id] = task
+
     async def _node_offline(self, node_id: int) -> None:
         """Mark node as offline."""
         # shutdown existing subscriptions
         node_logger = self.get_node_logger(LOGGER, node_id)
         node_logger.info("Node considered offline, shutdown subscription")
         await self._chip_device_controller.shutdown_subscription(node_id)
+        self._attribute_last_updated.pop(node_id, None)
 
         # inform listeners for update callbacks that this subscription is now offline
         if node_id in self._attribute_update_callbacks:
@@ -1703,17 +2360,26 @@ class MatterDeviceController:
 
     async def _custom_attributes_poller(self) -> None:
         """Poll custom clusters/attributes for changes."""
-        for node_id in tuple(self._polled_attributes):
-            node = self._nodes[node_id]
+        due_attributes = self._polled_attributes.get_due(time.time())
+        for node_id, attribute_paths in due_attributes.items():
+            node = self._nodes.get(node_id)
+            if node is None:
+                continue
             if not node.available:
+                for attr_path in attribute_paths:
+                    self._polled_attributes.postpone(node_id, attr_path, time.time())
                 continue
-            attribute_paths = list(self._polled_attributes[node_id])
+            # keep the current values so we can work out which polled paths changed
+            prev_attributes = dict(node.attributes)
             try:
                 # try to read the attribute(s) - this will fire an event if the value changed
-                await self.read_attribute(
-                    node_id, attribute_paths, fabric_filtered=False
+                read_attributes = await self._read_attribute(
+                    node_id,
+                    attribute_paths,
+                    fabric_filtered=False,
+                    priority=InteractionPriority.BACKGROUND,
                 )
-            except (ChipStackError, NodeNotReady) as err:
+            except (ChipStackError, MatterError) as err:
                 LOGGER.warning(
                     "Polling custom attribute(s) %s for node %s failed: %s",
                     ",".join(attribute_paths),
@@ -1722,28 +2388,44 @@ class MatterDeviceController:
                     # log full stack trace if verbose logging is enabled
                     exc_info=err if LOGGER.isEnabledFor(VERBOSE_LOG_LEVEL) else None,
                 )
+                for attr_path in attribute_paths:
+                    self._polled_attributes.postpone(node_id, attr_path, time.time())
+            else:
+                # back off the poll interval of attributes that did not change and
+                # tighten it again for the ones that did
+                now = time.time()
+                for attr_path in attribute_paths:
+                    changed = any(
+                        prev_attributes.get(read_path) != value
+                        for read_path, value in read_attributes.items()
+                        if attribute_path_matches(attr_path, read_path)
+                    )
+                    self._polled_attributes.report(node_id, attr_path, changed, now)
             # polling attributes is heavy on network traffic, so we throttle it a bit
             await asyncio.sleep(2)
-        # reschedule self to run at next interval
+        # reschedule self to run when the next attribute(s) are due
         self._schedule_custom_attributes_poller()
 
     def _schedule_custom_attributes_poller(self) -> None:
-        """Schedule running the custom clusters/attributes poller at X interval."""
+        """Schedule running the custom clusters/attributes poller when next poll is due."""
         if existing := self._custom_attribute_poller_timer:
             existing.cancel()
+            self._custom_attribute_poller_timer = None
 
         def run_custom_attributes_poller() -> None:
             self._custom_attribute_poller_timer = None
             if (existing := self._custom_attribute_poller_task) and not existing.done():
-                existing.cancel()
+                # the running poller reschedules itself once it is done
+                return
             self._custom_attribute_poller_task = asyncio.create_task(
                 self._custom_attributes_poller()
             )
 
         # no need to schedule the poll if we have no (more) custom attributes to poll
-        if not self._polled_attributes:
+        if (next_poll := self._polled_attributes.next_poll()) is None:
             return
 
         self._custom_attribute_poller_timer = self._loop.call_later(
-            CUSTOM_ATTRIBUTES_POLLER_INTERVAL, run_custom_attributes_poller
+            max(next_poll - time.time(), CUSTOM_ATTRIBUTES_POLLER_MIN_DELAY),
+            run_custom_attributes_poller,
         )
@@ -0,0 +1,107 @@
+"""Global admission control of interactions with nodes, per type of network."""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import time
+from typing import TYPE_CHECKING
+
+from ...common.errors import NodeBusy, ServerBusy
+from ...common.models import AdmissionMetrics, NetworkType
+from .interaction_queue import NodeInteractionQueue
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from .interaction_queue import InteractionPriority
+
+# max number of simultaneous interactions per type of network
+DEFAULT_ADMISSION_BUDGETS: dict[NetworkType, int] = {
+    NetworkType.THREAD: 4,
+    NetworkType.WIFI: 16,
+    NetworkType.ETHERNET: 32,
+    NetworkType.UNKNOWN: 8,
+}
+# max number of interactions that may wait for admission per type of network
+DEFAULT_ADMISSION_MAX_QUEUED = 256
+
+
+@dataclass
+class _WaitTimes:
+    """Statistics of the time interactions waited for admission."""
+
+    count: int = 0
+    total: float = 0
+    max: float = 0
+
+    def add(self, wait_time: float) -> None:
+        """Add the wait time of an admitted interaction."""
+        self.count += 1
+        self.total += wait_time
+        self.max = max(self.max, wait_time)
+
+
+class AdmissionController:
+    """Bound the number of simultaneous interactions per type of network.
+
+    Each network type has a budget of interactions that may be in flight at the same
+    time (across all nodes on that type of network). Interactions beyond the budget
+    wait for admission in order of priority, or are rejected with ServerBusy when
+    too many interactions are waiting already.
+    """
+
+    def __init__(
+        self,
+        budgets: dict[NetworkType, int] | None = None,
+        max_queued: int = DEFAULT_ADMISSION_MAX_QUEUED,
+    ) -> None:
+        """Initialize the admission controller."""
+        self.budgets = {**DEFAULT_ADMISSION_BUDGETS, **(budgets or {})}
+        if any(budget < 1 for budget in self.budgets.values()):
+            raise ValueError("Admission budget must be at least 1.")
+        self._queues = {
+            network_type: NodeInteractionQueue(budget, max_queued)
+            for network_type, budget in self.budgets.items()
+        }
+        self._wait_times = {network_type: _WaitTimes() for network_type in NetworkType}
+
+    @asynccontextmanager
+    async def admit(
+        self, network_type: NetworkType, priority: InteractionPriority
+    ) -> AsyncIterator[None]:
+        """Wait for (and hold) admission of an interaction on the given network type."""
+        queue = self._queues[network_type]
+        start = time.monotonic()
+        try:
+            await queue.acquire(priority)
+        except NodeBusy as err:
+            raise ServerBusy(
+                f"Too many ({queue.queued}) pending interactions "
+                f"on {network_type.value} network."
+            ) from err
+        self._wait_times[network_type].add(time.monotonic() - start)
+        try:
+            yield
+        finally:
+            queue.release()
+
+    def get_metrics(self) -> dict[str, AdmissionMetrics]:
+        """Return the admission metrics per network type."""
+        result: dict[str, AdmissionMetrics] = {}
+        for network_type, queue in self._queues.items():
+            queue_metrics = queue.get_metrics()
+            wait_times = self._wait_times[network_type]
+            result[network_type.value] = AdmissionMetrics(
+                budget=self.budgets[network_type],
+                in_flight=queue_metrics.in_flight,
+                queued=sum(queue_metrics.queued.values()),
+                max_queued=queue_metrics.max_queued,
+                admitted=wait_times.count,
+                rejected=queue_metrics.rejected,
+                wait_time_avg=(
+                    wait_times.total / wait_times.count if wait_times.count else 0
+                ),
+                wait_time_max=wait_times.max,
+            )
+        return result
@@ -0,0 +1,166 @@
+"""Rolling (windowed) aggregates of numeric attribute values."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Final
+
+from ...common.helpers.util import attribute_path_matches
+from ...common.models import AttributeAggregate
+
+# max number of values kept per window (e.g. for very chatty attributes)
+MAX_WINDOW_VALUES: Final = 10000
+
+
+class RollingWindow:
+    """Incrementally maintained min/max/mean of the values within a time window.
+
+    A value holds until the next value is added, so the mean is weighted by time
+    (and not biased towards periods with many reports) and the value at the start
+    of the window counts as well. The values are kept in a queue (of at most
+    max_values) and the min/max in monotonic queues, so adding a value and querying
+    the aggregate are (amortized) O(1).
+    """
+
+    def __init__(self, window: int, max_values: int = MAX_WINDOW_VALUES) -> None:
+        """Initialize the rolling window."""
+        self.window = window
+        self.max_values = max_values
+        self._values: deque[tuple[float, float]] = deque()
+        # (timestamp, value) candidates for the min (increasing values) and the max
+        # (decreasing values) of the window, the first entry is the min/max
+        self._min: deque[tuple[float, float]] = deque()
+        self._max: deque[tuple[float, float]] = deque()
+        # time integral of the values from the first to the last value
+        self._area = 0.0
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a value to the window."""
+        if self._values:
+            last_timestamp, last_value = self._values[-1]
+            self._area += last_value * (timestamp - last_timestamp)
+        self._values.append((timestamp, value))
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((timestamp, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((timestamp, value))
+        if len(self._values) > self.max_values:
+            self._drop_first()
+        self._expire(timestamp)
+
+    def get_aggregate(self, now: float, last: float | None) -> AttributeAggregate:
+        """Return the aggregate of the values within the window."""
+        self._expire(now)
+        if not self._values:
+            return AttributeAggregate(
+                window=self.window, count=0, min=None, max=None, mean=None, last=last
+            )
+        oldest = now - self.window
+        start, start_value = self._values[0]
+        last_timestamp, last_value = self._values[-1]
+        area = self._area + last_value * (now - last_timestamp)
+        count = len(self._values)
+        if start < oldest:
+            # the first value was added before (and holds at) the start of the window
+            area -= start_value * (oldest - start)
+            start = oldest
+            count -= 1
+        duration = now - start
+        return AttributeAggregate(
+            window=self.window,
+            count=count,
+            min=self._min[0][1],
+            max=self._max[0][1],
+            mean=area / duration if duration > 0 else last_value,
+            last=last,
+        )
+
+    def _expire(self, now: float) -> None:
+        """Drop the values that no longer hold within the window."""
+        oldest = now - self.window
+        while len(self._values) > 1 and self._values[1][0] <= oldest:
+            self._drop_first()
+
+    def _drop_first(self) -> None:
+        """Drop the first (oldest) value."""
+        timestamp, value = self._values.popleft()
+        if len(self._values) < 2:
+            # avoid accumulating floating point errors
+            self._area = 0.0
+        else:
+            self._area -= value * (self._values[0][0] - timestamp)
+        first = self._values[0][0]
+        while self._min[0][0] < first:
+            self._min.popleft()
+        while self._max[0][0] < first:
+            self._max.popleft()
+
+
+@dataclass
+class _AggregatedAttribute:
+    """Rolling windows (and the last value) of a single attribute path."""
+
+    windows: list[RollingWindow]
+    last: float | None = None
+
+
+class AttributeAggregator:
+    """Keep rolling aggregates of the numeric attributes matching the patterns."""
+
+    def __init__(self, patterns: list[str], windows: list[int]) -> None:
+        """Initialize the attribute aggregator."""
+        self.patterns = patterns
+        self.windows = windows
+        self._attributes: dict[int, dict[str, _AggregatedAttribute]] = {}
+        # whether any of the patterns matches the attribute path
+        self._path_matches: dict[str, bool] = {}
+
+    def record(
+        self, node_id: int, attribute_path: str, value: Any, timestamp: float
+    ) -> bool:
+        """Add an attribute value to the aggregates, return True if it was added."""
+        if (
+            not self.windows
+            or not isinstance(value, int | float)
+            or isinstance(value, bool)
+            or not self._matches(attribute_path)
+        ):
+            return False
+        node_attributes = self._attributes.setdefault(node_id, {})
+        if (attribute := node_attributes.get(attribute_path)) is None:
+            attribute = node_attributes[attribute_path] = _AggregatedAttribute(
+                windows=[RollingWindow(window) for window in self.windows]
+            )
+        attribute.last = value
+        for window in attribute.windows:
+            window.add(timestamp, value)
+        return True
+
+    def get_aggregates(
+        self, node_id: int, attribute_paths: list[str], now: float
+    ) -> dict[str, list[AttributeAggregate]]:
+        """Return the aggregates of the (wildcard) attribute paths of a node."""
+        return {
+            attribute_path: [
+                window.get_aggregate(now, attribute.last)
+                for window in attribute.windows
+            ]
+            for attribute_path, attribute in self._attributes.get(node_id, {}).items()
+            if any(attribute_path_matches(x, attribute_path) for x in attribute_paths)
+        }
+
+    def remove_node(self, node_id: int) -> None:
+        """Forget the aggregates of a node."""
+        self._attributes.pop(node_id, None)
+
+    def _matches(self, attribute_path: str) -> bool:
+        """Return if the attribute path is aggregated."""
+        if (matches := self._path_matches.get(attribute_path)) is None:
+            matches = self._path_matches[attribute_path] = any(
+                attribute_path_matches(pattern, attribute_path)
+                for pattern in self.patterns
+            )
+        return matches
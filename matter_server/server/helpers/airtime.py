@@ -0,0 +1,123 @@
+"""Token-bucket throttling of the (background) traffic on Thread networks."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from ...common.models import ThreadAirtimeMetrics
+
+# number of tokens (interactions) added to the bucket of a Thread network per second
+DEFAULT_THREAD_AIRTIME_RATE = 2.0
+# max number of tokens a bucket can hold (size of a burst of background interactions)
+DEFAULT_THREAD_AIRTIME_BURST = 10
+
+
+class TokenBucket:
+    """Token bucket which is refilled at a fixed rate, up to its capacity.
+
+    Waiting for tokens is done in order of arrival. Tokens can also be charged
+    without waiting, which may bring the balance below zero and thereby delays
+    the interactions waiting for tokens.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Initialize the token bucket (full)."""
+        if rate <= 0 or capacity < 1:
+            raise ValueError("Rate must be positive and capacity at least 1.")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._waiting = 0
+        self._acquired = 0
+        self._charged = 0
+        self._throttled = 0
+        self._wait_time_total = 0.0
+
+    @property
+    def tokens(self) -> float:
+        """Return the current number of tokens in the bucket."""
+        self._refill()
+        return self._tokens
+
+    def _refill(self) -> None:
+        """Add the tokens that accumulated since the last update."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def charge(self, tokens: float = 1) -> None:
+        """Take tokens from the bucket without waiting (balance may go negative)."""
+        self._refill()
+        self._tokens -= tokens
+        self._charged += 1
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """Wait until the given number of tokens is available and take them."""
+        start = time.monotonic()
+        throttled = self._lock.locked()
+        self._waiting += 1
+        try:
+            async with self._lock:
+                while (available := self.tokens) < tokens:
+                    throttled = True
+                    await asyncio.sleep((tokens - available) / self.rate)
+                self._tokens -= tokens
+        finally:
+            self._waiting -= 1
+        self._acquired += 1
+        if throttled:
+            self._throttled += 1
+            self._wait_time_total += time.monotonic() - start
+
+    def get_metrics(self) -> ThreadAirtimeMetrics:
+        """Return the metrics of this bucket."""
+        return ThreadAirtimeMetrics(
+            tokens=round(self.tokens, 2),
+            waiting=self._waiting,
+            acquired=self._acquired,
+            charged=self._charged,
+            throttled=self._throttled,
+            wait_time_total=round(self._wait_time_total, 3),
+        )
+
+
+class ThreadAirtimeThrottle:
+    """Keep a token bucket per Thread network (identified by its extended PAN ID).
+
+    Background interactions with a Thread node need to acquire a token from the
+    bucket of the node's network, interactive traffic is charged without waiting
+    and thereby preempts the background traffic on the same network.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_THREAD_AIRTIME_RATE,
+        burst: float = DEFAULT_THREAD_AIRTIME_BURST,
+    ) -> None:
+        """Initialize the throttle."""
+        self.rate = rate
+        self.burst = burst
+        self._buckets: dict[int | None, TokenBucket] = {}
+
+    def get_bucket(self, extended_pan_id: int | None) -> TokenBucket:
+        """Return the token bucket of the given Thread network.
+
+        Thread nodes of which the network is not (yet) known share a single bucket.
+        """
+        if extended_pan_id not in self._buckets:
+            self._buckets[extended_pan_id] = TokenBucket(self.rate, self.burst)
+        return self._buckets[extended_pan_id]
+
+    def get_metrics(self) -> dict[str, ThreadAirtimeMetrics]:
+        """Return the metrics per Thread network (keyed by hex extended PAN ID)."""
+        return {
+            "unknown" if extended_pan_id is None else f"{extended_pan_id:016x}": (
+                bucket.get_metrics()
+            )
+            for extended_pan_id, bucket in self._buckets.items()
+        }
@@ -0,0 +1,130 @@
+"""In-memory history (time series) of attribute values."""
+
+from __future__ import annotations
+
+from array import array
+import math
+from typing import Any
+
+from ...common.helpers.util import attribute_path_matches, parse_attribute_path
+
+# max delta between two samples that can be stored (in milliseconds)
+MAX_DELTA_MS = 2**32 - 1
+
+
+class AttributeRingBuffer:
+    """Fixed size ring buffer of (timestamp, value) samples of a numeric attribute.
+
+    The values are stored as doubles (None as NaN) and the timestamps as deltas (in
+    milliseconds) to the previous sample, which uses 12 bytes per sample.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize the ring buffer."""
+        self.capacity = capacity
+        self._values = array("d", bytes(8 * capacity))
+        self._deltas = array("I", bytes(4 * capacity))
+        self._start = 0
+        self._count = 0
+        # timestamps of the oldest and the newest sample
+        self._first_timestamp = 0.0
+        self._last_timestamp = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of samples in the buffer."""
+        return self._count
+
+    def append(self, timestamp: float, value: float | None) -> None:
+        """Add a sample, the oldest sample is dropped if the buffer is full."""
+        if self._count == 0:
+            delta = 0
+            self._first_timestamp = self._last_timestamp = timestamp
+        else:
+            delta = min(
+                MAX_DELTA_MS, max(0, round((timestamp - self._last_timestamp) * 1000))
+            )
+            # keep the quantized timestamp so timestamps do not drift
+            self._last_timestamp += delta / 1000
+        if self._count == self.capacity:
+            # drop the oldest sample, the next sample becomes the oldest
+            self._start = (self._start + 1) % self.capacity
+            self._first_timestamp += self._deltas[self._start] / 1000
+            self._count -= 1
+        index = (self._start + self._count) % self.capacity
+        self._values[index] = math.nan if value is None else value
+        self._deltas[index] = delta
+        self._count += 1
+
+    def get_samples(
+        self, start: float | None = None, end: float | None = None
+    ) -> list[tuple[float, float | None]]:
+        """Return the samples within the (optional) time range, oldest first."""
+        result: list[tuple[float, float | None]] = []
+        timestamp = self._first_timestamp
+        for offset in range(self._count):
+            index = (self._start + offset) % self.capacity
+            if offset:
+                timestamp += self._deltas[index] / 1000
+            if end is not None and timestamp > end:
+                break
+            if start is not None and timestamp < start:
+                continue
+            value = self._values[index]
+            result.append((timestamp, None if math.isnan(value) else value))
+        return result
+
+
+class AttributeHistory:
+    """Keep the recent history of the attributes of the opted-in clusters.
+
+    Only numeric (and boolean) values are recorded. Memory use is bounded by the
+    number of samples per attribute path and the max number of attribute paths.
+    """
+
+    def __init__(self, clusters: set[int], capacity: int, max_buffers: int) -> None:
+        """Initialize the attribute history."""
+        if capacity < 1:
+            raise ValueError("The history must hold at least one sample per path.")
+        self.clusters = clusters
+        self.capacity = capacity
+        self.max_buffers = max_buffers
+        self._buffers: dict[int, dict[str, AttributeRingBuffer]] = {}
+        self._buffer_count = 0
+
+    def record(
+        self, node_id: int, attribute_path: str, value: Any, timestamp: float
+    ) -> bool:
+        """Record an attribute value, return True if it was recorded."""
+        if not self.clusters or (
+            value is not None and not isinstance(value, int | float)
+        ):
+            return False
+        if (buffer := self._buffers.get(node_id, {}).get(attribute_path)) is None:
+            if (
+                parse_attribute_path(attribute_path)[1] not in self.clusters
+                or self._buffer_count >= self.max_buffers
+            ):
+                return False
+            buffer = AttributeRingBuffer(self.capacity)
+            self._buffers.setdefault(node_id, {})[attribute_path] = buffer
+            self._buffer_count += 1
+        buffer.append(timestamp, value)
+        return True
+
+    def get_history(
+        self,
+        node_id: int,
+        attribute_paths: list[str],
+        start: float | None = None,
+        end: float | None = None,
+    ) -> dict[str, list[tuple[float, float | None]]]:
+        """Return the recorded samples of the (wildcard) attribute paths of a node."""
+        return {
+            attribute_path: buffer.get_samples(start, end)
+            for attribute_path, buffer in self._buffers.get(node_id, {}).items()
+            if any(attribute_path_matches(x, attribute_path) for x in attribute_paths)
+        }
+
+    def remove_node(self, node_id: int) -> None:
+        """Forget the history of a node."""
+        self._buffer_count -= len(self._buffers.pop(node_id, {}))
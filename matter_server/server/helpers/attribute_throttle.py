@@ -0,0 +1,132 @@
+"""Throttling and deadband filtering of attribute updates sent to clients."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import time
+from typing import TYPE_CHECKING, Any
+
+from ...common.helpers.util import attribute_path_matches
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+@dataclass
+class AttributeThrottleRule:
+    """Throttle window and deadband for the attribute paths matching the pattern."""
+
+    # attribute path pattern (endpoint/cluster/attribute), * can be used as wildcard
+    pattern: str
+    # min number of seconds between two updates of the same attribute path
+    window: float = 0
+    # min (absolute) change of a numeric value before an update is sent
+    deadband: float = 0
+
+
+@dataclass
+class _ThrottleState:
+    """Throttle state of a single attribute path of a node."""
+
+    value: Any
+    timestamp: float
+    pending: bool = False
+    latest: Any = None
+    timer: asyncio.TimerHandle | None = None
+
+
+def _is_number(value: Any) -> bool:
+    """Return if the value is a (non boolean) number."""
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+class AttributeThrottle:
+    """Decide which attribute updates are sent (immediately) to clients.
+
+    The first rule that matches an attribute path applies. Updates within the
+    deadband of the last sent value are dropped. Updates within the throttle window
+    of the last sent update are held back, the latest of those is flushed (with the
+    flush callback) when the window closes.
+    """
+
+    def __init__(
+        self,
+        rules: list[AttributeThrottleRule],
+        flush_callback: Callable[[int, str, Any], None],
+    ) -> None:
+        """Initialize the attribute throttle."""
+        self.rules = rules
+        self.flush_callback = flush_callback
+        self._states: dict[tuple[int, str], _ThrottleState] = {}
+        # the matching rule per attribute path (None if no rule matches)
+        self._path_rules: dict[str, AttributeThrottleRule | None] = {}
+
+    def process(self, node_id: int, attribute_path: str, value: Any) -> bool:
+        """Process an updated attribute value, return True if it should be sent now."""
+        if not self.rules or (rule := self._get_rule(attribute_path)) is None:
+            return True
+        now = time.monotonic()
+        key = (node_id, attribute_path)
+        if (state := self._states.get(key)) is None:
+            self._states[key] = _ThrottleState(value=value, timestamp=now)
+            return True
+        if (
+            rule.deadband
+            and _is_number(value)
+            and _is_number(state.value)
+            and abs(value - state.value) < rule.deadband
+        ):
+            # the value is (again) close to the last sent value
+            state.pending = False
+            return False
+        if now - state.timestamp >= rule.window:
+            state.value = value
+            state.timestamp = now
+            state.pending = False
+            return True
+        state.latest = value
+        state.pending = True
+        if state.timer is None:
+            state.timer = asyncio.get_running_loop().call_later(
+                state.timestamp + rule.window - now, self._flush, key
+            )
+        return False
+
+    def remove_node(self, node_id: int) -> None:
+        """Forget the state of all attribute paths of a node."""
+        for key in [key for key in self._states if key[0] == node_id]:
+            if timer := self._states.pop(key).timer:
+                timer.cancel()
+
+    def stop(self) -> None:
+        """Cancel all pending (trailing) updates."""
+        for state in self._states.values():
+            if state.timer:
+                state.timer.cancel()
+        self._states.clear()
+
+    def _get_rule(self, attribute_path: str) -> AttributeThrottleRule | None:
+        """Return the rule that applies to the attribute path (if any)."""
+        if attribute_path not in self._path_rules:
+            self._path_rules[attribute_path] = next(
+                (
+                    rule
+                    for rule in self.rules
+                    if attribute_path_matches(rule.pattern, attribute_path)
+                ),
+                None,
+            )
+        return self._path_rules[attribute_path]
+
+    def _flush(self, key: tuple[int, str]) -> None:
+        """Send the latest held back update when the throttle window closes."""
+        if (state := self._states.get(key)) is None:
+            return
+        state.timer = None
+        if not state.pending:
+            return
+        state.value = state.latest
+        state.timestamp = time.monotonic()
+        state.pending = False
+        self.flush_callback(key[0], key[1], state.value)
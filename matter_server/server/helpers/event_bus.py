@@ -0,0 +1,113 @@
+"""Dispatching of server events to (in-process) subscribers."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import logging
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from ...common.models import EventType
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _Subscription:
+    """A registered subscriber callback."""
+
+    callback: Callable[[EventType, Any], Any]
+    # resolved once when subscribing (instead of for every event)
+    is_coroutine: bool
+    active: bool = True
+
+
+class EventBus:
+    """Dispatch events to the subscribers of the event type.
+
+    Subscribers are registered per event type (or for all events). Events are
+    queued and dispatched in batches from a single loop callback, only to the
+    subscribers interested in the event. A callback is registered (and called)
+    once per event, even if it is subscribed more than once.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        """Initialize the event bus."""
+        # loop the events are dispatched in (the running loop if not set), which
+        # allows publishing from code that does not run in the loop (e.g. callbacks)
+        self.loop = loop
+        # subscriptions per event type (None for all events) by callback
+        self._registry: dict[
+            EventType | None, dict[Callable[[EventType, Any], Any], _Subscription]
+        ] = {}
+        self._pending: list[tuple[EventType, Any]] = []
+        self._dispatch_scheduled = False
+
+    def subscribe(
+        self,
+        callback: Callable[[EventType, Any], Any],
+        event_types: Iterable[EventType] | None = None,
+    ) -> Callable[[], None]:
+        """Subscribe to (a subset of) the events, return a callable to unsubscribe."""
+        keys: list[EventType | None] = (
+            [None] if event_types is None else list(set(event_types))
+        )
+        for key in keys:
+            subscriptions = self._registry.setdefault(key, {})
+            if callback not in subscriptions:
+                subscriptions[callback] = _Subscription(
+                    callback=callback,
+                    is_coroutine=asyncio.iscoroutinefunction(callback),
+                )
+
+        def unsubscribe() -> None:
+            for key in keys:
+                if (subscriptions := self._registry.get(key)) is None:
+                    continue
+                if (subscription := subscriptions.pop(callback, None)) is not None:
+                    subscription.active = False
+                if not subscriptions:
+                    del self._registry[key]
+
+        return unsubscribe
+
+    def has_subscribers(self, evt: EventType) -> bool:
+        """Return if there are any subscribers for the event type."""
+        return evt in self._registry or None in self._registry
+
+    def publish(self, evt: EventType, data: Any = None) -> None:
+        """Queue an event for dispatch to its subscribers."""
+        if not self.has_subscribers(evt):
+            return
+        self._pending.append((evt, data))
+        if not self._dispatch_scheduled:
+            self._dispatch_scheduled = True
+            (self.loop or asyncio.get_running_loop()).call_soon(self._dispatch)
+
+    def _get_subscriptions(self, evt: EventType) -> Iterable[_Subscription]:
+        """Return the subscriptions the event should be dispatched to."""
+        all_events = self._registry.get(None)
+        event_type = self._registry.get(evt)
+        if all_events is None or event_type is None:
+            return tuple((all_events or event_type or {}).values())
+        # a callback subscribed to all events and to the event type is called once
+        return tuple({**event_type, **all_events}.values())
+
+    def _dispatch(self) -> None:
+        """Dispatch all queued events."""
+        pending, self._pending = self._pending, []
+        self._dispatch_scheduled = False
+        for evt, data in pending:
+            for subscription in self._get_subscriptions(evt):
+                if not subscription.active:
+                    continue
+                if subscription.is_coroutine:
+                    asyncio.create_task(subscription.callback(evt, data))
+                    continue
+                try:
+                    subscription.callback(evt, data)
+                except Exception:  # pylint: disable=broad-except
+                    LOGGER.exception("Error in event subscriber for %s", evt)
@@ -0,0 +1,239 @@
+"""Bounded, persistent and queryable log of node events."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import logging
+from typing import TYPE_CHECKING
+
+from atomicwrites import atomic_write
+import orjson
+
+from ...common.helpers.json import JSON_DECODE_EXCEPTIONS, json_encoder_default
+from ...common.helpers.util import dataclass_from_dict
+from ...common.models import MatterNodeEvent, NodeEventLogPage
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+LOGGER = logging.getLogger(__name__)
+
+# max number of events returned by a single query
+EVENT_LOG_MAX_PAGE_SIZE = 1000
+
+EventKey = tuple[int, int, int]
+# an event with the sequence number assigned when it was added to the log
+LoggedEvent = tuple[int, MatterNodeEvent]
+
+
+def _dump_event(logged_event: LoggedEvent) -> bytes:
+    """Serialize an event (and its sequence number) to a (single) line of json."""
+    sequence, event = logged_event
+    return (
+        orjson.dumps(
+            {"sequence": sequence, "event": event}, default=json_encoder_default
+        )
+        + b"\n"
+    )
+
+
+class NodeEventLog:
+    """Keep the most recent node events in memory and (append-only) on disk.
+
+    The events are indexed by node and by (node, cluster, event id) and get an
+    (increasing) sequence number, which is used as the cursor to paginate. At most
+    `max_events` events are kept in memory, the oldest events are dropped first.
+    The file on disk is compacted when it holds twice the number of events.
+    """
+
+    def __init__(self, max_events: int, flush_delay: float = 5) -> None:
+        """Initialize the event log."""
+        self.max_events = max_events
+        self.flush_delay = flush_delay
+        self._filename: Path | None = None
+        self._events: deque[LoggedEvent] = deque()
+        self._by_node: dict[int, deque[LoggedEvent]] = {}
+        self._by_event: dict[EventKey, deque[LoggedEvent]] = {}
+        self._sequence = 0
+        # events not yet written to disk and the number of events in the file
+        self._pending: list[LoggedEvent] = []
+        self._file_events = 0
+        self._compact = False
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task[None] | None = None
+        self._write_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of events in the log."""
+        return len(self._events)
+
+    async def start(self, filename: Path) -> None:
+        """Load the events from disk."""
+        self._filename = filename
+
+        def _load() -> list[LoggedEvent]:
+            events: deque[LoggedEvent] = deque(maxlen=self.max_events)
+            try:
+                with open(filename, "rb") as _file:
+                    for line in _file:
+                        try:
+                            data = orjson.loads(line)
+                            event = dataclass_from_dict(MatterNodeEvent, data["event"])
+                            events.append((data["sequence"], event))
+                        except (*JSON_DECODE_EXCEPTIONS, KeyError, TypeError):
+                            LOGGER.warning("Skipping invalid line in %s", filename)
+                        self._file_events += 1
+            except FileNotFoundError:
+                pass
+            return list(events)
+
+        loop = asyncio.get_running_loop()
+        for sequence, event in await loop.run_in_executor(None, _load):
+            self._add(event, sequence)
+        LOGGER.debug("Loaded %s events from %s", len(self._events), filename)
+
+    async def stop(self) -> None:
+        """Write the pending events to disk."""
+        if self._flush_timer:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if self._flush_task:
+            await self._flush_task
+        await self._flush()
+
+    def append(self, event: MatterNodeEvent) -> None:
+        """Add an event to the log (and schedule the write to disk)."""
+        self._pending.append(self._add(event))
+        self._schedule_flush()
+
+    def remove_node(self, node_id: int) -> None:
+        """Remove all events of a node."""
+        if self._by_node.pop(node_id, None) is None:
+            return
+        self._events = deque(x for x in self._events if x[1].node_id != node_id)
+        for key in [key for key in self._by_event if key[0] == node_id]:
+            del self._by_event[key]
+        self._pending = [x for x in self._pending if x[1].node_id != node_id]
+        self._compact = True
+        self._schedule_flush()
+
+    def get_latest(self, count: int) -> list[MatterNodeEvent]:
+        """Return the latest events (of all nodes), oldest first."""
+        return [event for _, event in list(self._events)[-count:]] if count else []
+
+    def query(
+        self,
+        node_id: int | None = None,
+        cluster_id: int | None = None,
+        event_id: int | None = None,
+        since_event_number: int | None = None,
+        since_timestamp: int | None = None,
+        cursor: int | None = None,
+        limit: int = 100,
+    ) -> NodeEventLogPage:
+        """Return the (oldest first) events matching the filters.
+
+        The since filters are exclusive. To request the next page, pass the cursor
+        of the returned page (with the same filters).
+        """
+        source: Iterable[LoggedEvent]
+        if node_id is not None and cluster_id is not None and event_id is not None:
+            source = self._by_event.get((node_id, cluster_id, event_id), ())
+        elif node_id is not None:
+            source = self._by_node.get(node_id, ())
+        else:
+            source = self._events
+        limit = max(1, min(limit, EVENT_LOG_MAX_PAGE_SIZE))
+        events: list[MatterNodeEvent] = []
+        for sequence, event in source:
+            if (
+                (cursor is not None and sequence <= cursor)
+                or (cluster_id is not None and event.cluster_id != cluster_id)
+                or (event_id is not None and event.event_id != event_id)
+                or (
+                    since_event_number is not None
+                    and event.event_number <= since_event_number
+                )
+                or (since_timestamp is not None and event.timestamp <= since_timestamp)
+            ):
+                continue
+            if len(events) == limit:
+                return NodeEventLogPage(events=events, more=True, cursor=cursor)
+            events.append(event)
+            cursor = sequence
+        return NodeEventLogPage(events=events, more=False, cursor=cursor)
+
+    def _add(self, event: MatterNodeEvent, sequence: int | None = None) -> LoggedEvent:
+        """Add an event to the (in memory) log and indexes."""
+        if sequence is None or sequence <= self._sequence:
+            sequence = self._sequence + 1
+        self._sequence = sequence
+        logged_event = (sequence, event)
+        self._events.append(logged_event)
+        self._by_node.setdefault(event.node_id, deque()).append(logged_event)
+        key = (event.node_id, event.cluster_id, event.event_id)
+        self._by_event.setdefault(key, deque()).append(logged_event)
+        while len(self._events) > self.max_events:
+            # the oldest event is also the oldest event in its indexes
+            _, oldest = self._events.popleft()
+            self._by_node[oldest.node_id].popleft()
+            if not self._by_node[oldest.node_id]:
+                del self._by_node[oldest.node_id]
+            key = (oldest.node_id, oldest.cluster_id, oldest.event_id)
+            self._by_event[key].popleft()
+            if not self._by_event[key]:
+                del self._by_event[key]
+        return logged_event
+
+    def _schedule_flush(self) -> None:
+        """Schedule the write of the pending events to disk."""
+        if self._flush_timer is None and self._filename is not None:
+            self._flush_timer = asyncio.get_running_loop().call_later(
+                self.flush_delay, self._start_flush
+            )
+
+    def _start_flush(self) -> None:
+        """Start the (scheduled) write of the pending events to disk."""
+        self._flush_timer = None
+        self._flush_task = asyncio.create_task(self._flush())
+        self._flush_task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task: asyncio.Task[None]) -> None:
+        """Forget the flush task when it is done."""
+        if task is self._flush_task:
+            self._flush_task = None
+
+    async def _flush(self) -> None:
+        """Write the pending events to disk, compact the file if needed."""
+        # the events to write are taken while holding the lock, so an append never
+        # runs after a compaction which already wrote its events
+        async with self._write_lock:
+            if self._filename is None or not (self._pending or self._compact):
+                return
+            filename = self._filename
+            pending, self._pending = self._pending, []
+            compact = self._compact or self._file_events + len(pending) > (
+                2 * self.max_events
+            )
+            events = list(self._events) if compact else pending
+            self._compact = False
+
+            def _write() -> None:
+                data = b"".join(_dump_event(event) for event in events)
+                if compact:
+                    with atomic_write(filename, mode="wb", overwrite=True) as _file:
+                        _file.write(data)
+                else:
+                    with open(filename, "ab") as _file:
+                        _file.write(data)
+
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, _write)
+            except OSError as err:
+                LOGGER.warning("Unable to write event log %s: %s", filename, err)
+                return
+            self._file_events = (
+                len(events) if compact else self._file_events + len(events)
+            )
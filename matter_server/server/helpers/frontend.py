@@ -0,0 +1,107 @@
+"""Supervision of the (websocket) front-end process in split process mode."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+import logging
+import time
+
+LOGGER = logging.getLogger(__name__)
+
+# seconds to wait before restarting the front-end process after it exited, which
+# doubles after each consecutive quick exit (up to the maximum)
+FRONTEND_RESTART_DELAY_MIN = 1
+FRONTEND_RESTART_DELAY_MAX = 60
+# seconds the front-end process must run before its exit is no longer considered a
+# (consecutive) quick exit
+FRONTEND_STABLE_TIME = 60
+# number of consecutive quick exits after which the front-end is no longer restarted
+FRONTEND_MAX_FAILURES = 10
+# seconds to wait for the front-end process to exit before it is killed
+FRONTEND_STOP_TIMEOUT = 10
+
+
+class FrontendProcess:
+    """Run (and restart when it exits) the front-end in a separate process.
+
+    The restart delay backs off while the process keeps exiting quickly and the
+    process is given up on after too many consecutive quick exits (a crash loop).
+    """
+
+    def __init__(self, command: list[str]) -> None:
+        """Initialize the front-end process."""
+        self.command = command
+        self.restarts = 0
+        self._process: asyncio.subprocess.Process | None = None
+        self._started = 0.0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pid(self) -> int | None:
+        """Return the process id of the running front-end (if any)."""
+        if self._process is None or self._process.returncode is not None:
+            return None
+        return self._process.pid
+
+    async def start(self) -> None:
+        """Start the front-end process."""
+        await self._spawn()
+        self._task = asyncio.create_task(self._supervise())
+
+    async def wait(self) -> None:
+        """Wait until the front-end process is given up on (after a crash loop)."""
+        assert self._task is not None
+        await self._task
+
+    async def stop(self) -> None:
+        """Stop the front-end process."""
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if (process := self._process) is None or process.returncode is not None:
+            return
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), FRONTEND_STOP_TIMEOUT)
+        except TimeoutError:
+            LOGGER.warning("Front-end process did not stop in time, killing it")
+            process.kill()
+            await process.wait()
+
+    async def _spawn(self) -> None:
+        """Start a (new) front-end process."""
+        self._process = await asyncio.create_subprocess_exec(*self.command)
+        self._started = time.monotonic()
+        LOGGER.info("Started front-end process (pid %s)", self._process.pid)
+
+    async def _supervise(self) -> None:
+        """Restart the front-end process when it exits."""
+        delay = FRONTEND_RESTART_DELAY_MIN
+        failures = 0
+        while True:
+            assert self._process is not None
+            returncode = await self._process.wait()
+            if time.monotonic() - self._started >= FRONTEND_STABLE_TIME:
+                delay = FRONTEND_RESTART_DELAY_MIN
+                failures = 0
+            failures += 1
+            if failures >= FRONTEND_MAX_FAILURES:
+                LOGGER.error(
+                    "Front-end process exited (code %s) %s times in a row, "
+                    "not restarting it",
+                    returncode,
+                    failures,
+                )
+                return
+            LOGGER.warning(
+                "Front-end process exited (code %s), restarting in %s seconds",
+                returncode,
+                delay,
+            )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, FRONTEND_RESTART_DELAY_MAX)
+            await self._spawn()
+            self.restarts += 1
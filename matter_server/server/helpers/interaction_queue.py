@@ -0,0 +1,112 @@
+"""Prioritized queue to schedule interactions with a single node."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from enum import IntEnum
+import heapq
+import itertools
+from typing import TYPE_CHECKING
+
+from ...common.errors import NodeBusy
+from ...common.models import NodeInteractionQueueMetrics
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+
+class InteractionPriority(IntEnum):
+    """Priority class of an interaction with a node, lower values are served first."""
+
+    COMMAND = 0
+    WRITE = 1
+    READ = 2
+    BACKGROUND = 3
+
+
+class NodeInteractionQueue:
+    """Bounded, prioritized queue for the interactions with a node.
+
+    At most `concurrency` interactions run at the same time. Waiting interactions are
+    served in order of priority and, within the same priority, in order of arrival.
+    """
+
+    def __init__(self, concurrency: int = 1, max_queued: int = 64) -> None:
+        """Initialize the queue."""
+        self.concurrency = concurrency
+        self.max_queued = max_queued
+        self._in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+        self._completed = 0
+        self._rejected = 0
+        self._max_queued_seen = 0
+
+    @property
+    def queued(self) -> int:
+        """Return the number of interactions waiting for a slot."""
+        return sum(1 for _, _, waiter in self._waiters if not waiter.done())
+
+    @property
+    def idle(self) -> bool:
+        """Return if there are no running or waiting interactions."""
+        return self._in_flight == 0 and self.queued == 0
+
+    @asynccontextmanager
+    async def slot(self, priority: InteractionPriority) -> AsyncIterator[None]:
+        """Wait for (and hold) a slot to interact with the node."""
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: InteractionPriority) -> None:
+        """Wait for a slot to interact with the node.
+
+        Raises NodeBusy if too many interactions are waiting already.
+        """
+        if self._in_flight < self.concurrency and self.queued == 0:
+            self._in_flight += 1
+            return
+        if (queued := self.queued) >= self.max_queued:
+            self._rejected += 1
+            raise NodeBusy(f"Too many ({queued}) pending interactions with node.")
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), waiter))
+        self._max_queued_seen = max(self._max_queued_seen, queued + 1)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # we were handed a slot right before getting cancelled, pass it on
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Release a slot and hand it to the next waiting interaction (if any)."""
+        self._in_flight -= 1
+        self._completed += 1
+        while self._waiters and self._in_flight < self.concurrency:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if waiter.done():
+                # cancelled while waiting
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
+
+    def get_metrics(self) -> NodeInteractionQueueMetrics:
+        """Return the metrics of this queue."""
+        queued: dict[str, int] = {x.name.lower(): 0 for x in InteractionPriority}
+        for priority, _, waiter in self._waiters:
+            if not waiter.done():
+                queued[InteractionPriority(priority).name.lower()] += 1
+        return NodeInteractionQueueMetrics(
+            in_flight=self._in_flight,
+            queued=queued,
+            max_queued=self._max_queued_seen,
+            completed=self._completed,
+            rejected=self._rejected,
+        )
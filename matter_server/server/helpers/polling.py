@@ -0,0 +1,111 @@
+"""Helpers to (adaptively) schedule the polling of attributes."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass
+class PolledAttribute:
+    """State of a single polled attribute path."""
+
+    attribute_path: str
+    interval: float
+    next_poll: float
+
+
+class AdaptivePollSchedule:
+    """Keep track of the poll interval of polled attribute paths.
+
+    Each path starts at the minimum interval. Every poll that yields no change
+    multiplies the interval with the backoff factor (bounded by the maximum interval),
+    a poll that does yield a change resets the interval to the minimum again.
+    """
+
+    def __init__(
+        self,
+        min_interval: float,
+        max_interval: float,
+        backoff_factor: float = 2,
+    ) -> None:
+        """Initialize the poll schedule."""
+        if min_interval > max_interval:
+            raise ValueError("Minimum interval can't be higher than maximum interval.")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self._nodes: dict[int, dict[str, PolledAttribute]] = {}
+
+    def __bool__(self) -> bool:
+        """Return if there are any attributes to poll."""
+        return bool(self._nodes)
+
+    def __contains__(self, node_id: int) -> bool:
+        """Return if the given node has attributes to poll."""
+        return node_id in self._nodes
+
+    def set_attributes(
+        self, node_id: int, attribute_paths: set[str], now: float
+    ) -> None:
+        """Set the attribute paths to poll for a node.
+
+        The state of paths that were already known is retained.
+        """
+        existing = self._nodes.get(node_id, {})
+        self._nodes[node_id] = {
+            attr_path: existing.get(attr_path)
+            or PolledAttribute(
+                attribute_path=attr_path,
+                interval=self.min_interval,
+                next_poll=now + self.min_interval,
+            )
+            for attr_path in attribute_paths
+        }
+
+    def remove_node(self, node_id: int) -> None:
+        """Stop polling all attributes of a node."""
+        self._nodes.pop(node_id, None)
+
+    def get_attributes(self, node_id: int) -> dict[str, PolledAttribute]:
+        """Return the polled attributes of a node."""
+        return self._nodes.get(node_id, {})
+
+    def get_due(self, now: float) -> dict[int, list[str]]:
+        """Return the attribute paths (per node) that are due for polling."""
+        result: dict[int, list[str]] = {}
+        for node_id, attributes in self._nodes.items():
+            if due := [
+                x.attribute_path for x in attributes.values() if x.next_poll <= now
+            ]:
+                result[node_id] = due
+        return result
+
+    def next_poll(self) -> float | None:
+        """Return the timestamp at which the next poll is due."""
+        return min(
+            (
+                attribute.next_poll
+                for attributes in self._nodes.values()
+                for attribute in attributes.values()
+            ),
+            default=None,
+        )
+
+    def report(
+        self, node_id: int, attribute_path: str, changed: bool, now: float
+    ) -> None:
+        """Report the outcome of a poll and schedule the next one."""
+        if not (attribute := self._nodes.get(node_id, {}).get(attribute_path)):
+            return
+        if changed:
+            attribute.interval = self.min_interval
+        else:
+            attribute.interval = min(
+                attribute.interval * self.backoff_factor, self.max_interval
+            )
+        attribute.next_poll = now + attribute.interval
+
+    def postpone(self, node_id: int, attribute_path: str, now: float) -> None:
+        """Postpone the next poll (e.g. after a failed poll) without backing off."""
+        if attribute := self._nodes.get(node_id, {}).get(attribute_path):
+            attribute.next_poll = now + attribute.interval
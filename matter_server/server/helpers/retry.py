@@ -0,0 +1,126 @@
+"""Central scheduler for (node setup) retries with jittered exponential backoff."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import random
+import time
+from typing import TYPE_CHECKING
+
+from ...common.models import NodeRetryState
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class RetryScheduler:
+    """Schedule retries for many nodes from a single timer.
+
+    Every failed attempt doubles the delay until the next retry (bounded by the
+    maximum delay). The delay is randomized with the jitter factor so nodes that
+    failed at the same moment (e.g. after a restart) do not retry in lockstep.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[int], None],
+        base_delay: float,
+        max_delay: float,
+        jitter: float = 0.2,
+        wake_delay: float = 5,
+    ) -> None:
+        """Initialize the retry scheduler."""
+        self.callback = callback
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.wake_delay = wake_delay
+        self._states: dict[int, NodeRetryState] = {}
+        # heap of (due timestamp, node_id), outdated entries are skipped when popped
+        self._heap: list[tuple[float, int]] = []
+        self._timer: asyncio.TimerHandle | None = None
+
+    def __contains__(self, node_id: int) -> bool:
+        """Return if a retry is scheduled for the given node."""
+        return node_id in self._states
+
+    def schedule(self, node_id: int, error: str | None = None) -> float:
+        """Register a failed attempt and schedule the next retry, return the delay."""
+        now = time.time()
+        if (state := self._states.get(node_id)) is None:
+            state = self._states[node_id] = NodeRetryState(
+                attempts=0, first_failure=now, next_retry=now
+            )
+        state.attempts += 1
+        state.last_error = error
+        delay = min(self.max_delay, self.base_delay * 2.0 ** (state.attempts - 1))
+        delay *= random.uniform(1 - self.jitter, 1 + self.jitter)  # noqa: S311
+        self._set_next_retry(node_id, now + delay)
+        return delay
+
+    def wake(self, node_id: int) -> bool:
+        """Retry (almost) immediately, e.g. when the node was seen on the network.
+
+        A small random delay is used to spread the retries if many nodes show up at
+        the same time. Returns False if there is no retry scheduled for the node.
+        """
+        if (state := self._states.get(node_id)) is None:
+            return False
+        next_retry = time.time() + random.uniform(0, self.wake_delay)  # noqa: S311
+        if next_retry < state.next_retry:
+            self._set_next_retry(node_id, next_retry)
+        return True
+
+    def cancel(self, node_id: int) -> None:
+        """Forget the retry state of a node (e.g. after a successful attempt)."""
+        self._states.pop(node_id, None)
+
+    def stop(self) -> None:
+        """Cancel all scheduled retries."""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        self._states.clear()
+        self._heap.clear()
+
+    def get_states(self) -> dict[int, NodeRetryState]:
+        """Return the retry state of all nodes with a scheduled retry."""
+        return dict(self._states)
+
+    def _set_next_retry(self, node_id: int, next_retry: float) -> None:
+        """Set the timestamp of the next retry for the node and update the timer."""
+        self._states[node_id].next_retry = next_retry
+        heapq.heappush(self._heap, (next_retry, node_id))
+        self._schedule_timer()
+
+    def _schedule_timer(self) -> None:
+        """(Re)schedule the timer for the first due retry."""
+        while self._heap and not self._is_valid(*self._heap[0]):
+            heapq.heappop(self._heap)
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if not self._heap:
+            return
+        delay = max(0.0, self._heap[0][0] - time.time())
+        self._timer = asyncio.get_running_loop().call_later(delay, self._run_due)
+
+    def _is_valid(self, due: float, node_id: int) -> bool:
+        """Return if the heap entry is (still) the scheduled retry of the node."""
+        return (state := self._states.get(node_id)) is not None and (
+            state.next_retry == due
+        )
+
+    def _run_due(self) -> None:
+        """Run all retries that are due."""
+        self._timer = None
+        now = time.time()
+        due_nodes: list[int] = []
+        while self._heap and self._heap[0][0] <= now:
+            due, node_id = heapq.heappop(self._heap)
+            if self._is_valid(due, node_id):
+                due_nodes.append(node_id)
+        self._schedule_timer()
+        for node_id in due_nodes:
+            self.callback(node_id)
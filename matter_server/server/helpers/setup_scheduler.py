@@ -0,0 +1,155 @@
+"""Scheduler for the (prioritized) set-up of nodes."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from enum import IntEnum
+import heapq
+import itertools
+import time
+from typing import TYPE_CHECKING
+
+from ...common.models import NodeSetupProgress
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+
+
+class SetupPriority(IntEnum):
+    """Priority class of a node setup, lower values are set up first."""
+
+    # mains powered Thread routers (and router eligible devices) and IP nodes,
+    # routers are set up first as they improve the mesh for the other nodes
+    ROUTER = 0
+    END_DEVICE = 1
+    SLEEPY_END_DEVICE = 2
+
+
+class NodeSetupScheduler:
+    """Run node setups in order of priority, with adaptive concurrency.
+
+    Setups that are waiting for a slot are served in order of priority and, within
+    the same priority, in order of arrival. The number of simultaneous setups is
+    adjusted based on the reported (CASE session + subscription) latency: setups
+    within the target latency slowly increase the concurrency (additive increase),
+    slower setups halve it (multiplicative decrease).
+    """
+
+    def __init__(
+        self,
+        progress_callback: Callable[[NodeSetupProgress], None] | None = None,
+        initial_concurrency: int = 5,
+        min_concurrency: int = 1,
+        max_concurrency: int = 20,
+        target_latency: float = 15,
+    ) -> None:
+        """Initialize the scheduler."""
+        if not min_concurrency <= initial_concurrency <= max_concurrency:
+            raise ValueError("Initial concurrency must be within min/max concurrency.")
+        self.progress_callback = progress_callback
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self._concurrency = float(initial_concurrency)
+        self._last_decrease = 0.0
+        self._in_progress = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+        # progress of the current round of setups (reset when all are done)
+        self._total = 0
+        self._completed = 0
+        self._failed = 0
+
+    @property
+    def concurrency(self) -> int:
+        """Return the current max number of simultaneous setups."""
+        return int(self._concurrency)
+
+    @property
+    def pending(self) -> int:
+        """Return the number of setups waiting for a slot."""
+        return sum(1 for _, _, waiter in self._waiters if not waiter.done())
+
+    @asynccontextmanager
+    async def slot(self, priority: SetupPriority) -> AsyncIterator[None]:
+        """Wait for (and hold) a slot to set up a node."""
+        await self._acquire(priority)
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            self._release(success)
+
+    def report_latency(self, latency: float) -> None:
+        """Report the (CASE session + subscription) latency of a node setup."""
+        if latency <= self.target_latency:
+            self._concurrency = min(
+                self.max_concurrency, self._concurrency + 1 / self._concurrency
+            )
+        elif (now := time.monotonic()) - self._last_decrease > self.target_latency:
+            # decrease at most once per target latency period, as all setups which
+            # are in progress at the moment are likely to be slow as well
+            self._last_decrease = now
+            self._concurrency = max(self.min_concurrency, self._concurrency / 2)
+        self._dispatch()
+
+    def get_progress(self) -> NodeSetupProgress:
+        """Return the progress of the current round of node setups."""
+        return NodeSetupProgress(
+            total=self._total,
+            completed=self._completed,
+            failed=self._failed,
+            in_progress=self._in_progress,
+            pending=self.pending,
+            concurrency=self.concurrency,
+        )
+
+    async def _acquire(self, priority: SetupPriority) -> None:
+        """Wait for a slot to set up a node."""
+        if self._in_progress == 0 and self.pending == 0:
+            # start of a new round of setups
+            self._total = self._completed = self._failed = 0
+        self._total += 1
+        if self._in_progress < self.concurrency and self.pending == 0:
+            self._in_progress += 1
+            self._signal_progress()
+            return
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), waiter))
+        self._signal_progress()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            self._total -= 1
+            if waiter.done() and not waiter.cancelled():
+                # we were handed a slot right before getting cancelled, pass it on
+                self._in_progress -= 1
+                self._dispatch()
+            raise
+
+    def _release(self, success: bool) -> None:
+        """Release a slot and hand it to the next waiting setup (if any)."""
+        self._in_progress -= 1
+        if success:
+            self._completed += 1
+        else:
+            self._failed += 1
+        self._dispatch()
+        self._signal_progress()
+
+    def _dispatch(self) -> None:
+        """Hand out free slots to waiting setups."""
+        while self._waiters and self._in_progress < self.concurrency:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if waiter.done():
+                # cancelled while waiting
+                continue
+            self._in_progress += 1
+            waiter.set_result(None)
+
+    def _signal_progress(self) -> None:
+        """Inform the progress callback (if any)."""
+        if self.progress_callback is not None:
+            self.progress_callback(self.get_progress())
@@ -0,0 +1,88 @@
+"""Detection of (and protection against) fleet-wide resubscription storms."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import random
+import time
+
+from ...common.models import ResubscriptionStormMetrics
+
+
+class ResubscriptionStormGuard:
+    """Detect resubscription storms and pace resubscriptions while a storm lasts.
+
+    A storm is detected when the subscriptions of at least `threshold` different
+    nodes fail within `window` seconds, which typically happens when a border router
+    (or the network) went down. The storm is considered over `hold` seconds after
+    it was (last) detected. While a storm lasts, (triggered) resubscriptions are
+    paced to `rate` per second, with an additional random delay of up to `jitter`
+    seconds, so the nodes do not all resubscribe at the same moment.
+    """
+
+    def __init__(
+        self,
+        threshold: int,
+        window: float,
+        rate: float,
+        jitter: float,
+        hold: float,
+    ) -> None:
+        """Initialize the storm guard."""
+        self.threshold = threshold
+        self.window = window
+        self.rate = rate
+        self.jitter = jitter
+        self.hold = hold
+        # (monotonic timestamp, node_id) of recent subscription failures
+        self._failures: deque[tuple[float, int]] = deque()
+        self._storm_until = 0.0
+        self._next_slot = 0.0
+        self._storms = 0
+        self._paced = 0
+
+    @property
+    def active(self) -> bool:
+        """Return if a resubscription storm is currently going on."""
+        return time.monotonic() < self._storm_until
+
+    @property
+    def failing_nodes(self) -> int:
+        """Return the number of different nodes that failed within the window."""
+        self._prune(time.monotonic())
+        return len({node_id for _, node_id in self._failures})
+
+    def record_failure(self, node_id: int) -> bool:
+        """Record a failed subscription of a node, return True if a storm is going on."""
+        now = time.monotonic()
+        self._failures.append((now, node_id))
+        if self.failing_nodes >= self.threshold:
+            if not self.active:
+                self._storms += 1
+            self._storm_until = now + self.hold
+        return self.active
+
+    async def pace(self) -> None:
+        """Wait for a (jittered) slot to resubscribe if a storm is going on."""
+        if not self.active:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + 1 / self.rate
+        self._paced += 1
+        await asyncio.sleep(slot - now + random.uniform(0, self.jitter))  # noqa: S311
+
+    def get_metrics(self) -> ResubscriptionStormMetrics:
+        """Return the metrics of the storm guard."""
+        return ResubscriptionStormMetrics(
+            active=self.active,
+            failing_nodes=self.failing_nodes,
+            storms=self._storms,
+            paced=self._paced,
+        )
+
+    def _prune(self, now: float) -> None:
+        """Forget the failures that are outside of the window."""
+        while self._failures and now - self._failures[0][0] > self.window:
+            self._failures.popleft()
@@ -0,0 +1,131 @@
+"""Adaptive selection of the subscription (max) report interval of nodes."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+# failures older than this (in seconds) are not taken into account
+SUBSCRIPTION_FAILURE_WINDOW = 24 * 3600
+
+
+@dataclass
+class NodeSubscriptionStats:
+    """(Persisted) subscription statistics of a node."""
+
+    # the last chosen max report interval (ceiling), 0 if never chosen
+    ceiling: int = 0
+    # timestamps of the recent subscription failures
+    failures: list[float] = field(default_factory=list)
+    # (smoothed) number of attribute reports per hour
+    reports_per_hour: float = 0
+    # timestamp since when the subscription of the node did not fail
+    stable_since: float = 0
+
+
+class SubscriptionIntervalTuner:
+    """Choose the subscription ceiling per node based on its observed behavior.
+
+    - Flaky nodes (several subscription failures within a day) get a shorter
+      ceiling, so a lost subscription is detected faster.
+    - Stable nodes which do not report often get a longer ceiling (doubled on every
+      (re)subscription, up to the max), so less keepalive traffic is sent. Nodes
+      which report often keep their subscription alive with the reports anyway, so
+      they keep the default ceiling for fast failure detection.
+    - The ceiling of ICD nodes is never shorter than their idle mode duration.
+    """
+
+    def __init__(
+        self,
+        min_ceiling: int,
+        max_ceiling: int,
+        stable_period: float = 24 * 3600,
+        flaky_failures: int = 3,
+    ) -> None:
+        """Initialize the tuner."""
+        self.min_ceiling = min_ceiling
+        self.max_ceiling = max_ceiling
+        self.stable_period = stable_period
+        self.flaky_failures = flaky_failures
+        self._stats: dict[int, NodeSubscriptionStats] = {}
+        # number of reports (and since when) that were not yet added to the stats
+        self._report_counts: dict[int, tuple[int, float]] = {}
+
+    def get_stats(self, node_id: int) -> NodeSubscriptionStats | None:
+        """Return the subscription statistics of a node (if any)."""
+        return self._stats.get(node_id)
+
+    def set_stats(self, node_id: int, stats: NodeSubscriptionStats) -> None:
+        """Set the (restored) subscription statistics of a node."""
+        self._stats[node_id] = stats
+
+    def remove_node(self, node_id: int) -> None:
+        """Forget all statistics of a node."""
+        self._stats.pop(node_id, None)
+        self._report_counts.pop(node_id, None)
+
+    def record_report(self, node_id: int, now: float) -> bool:
+        """Record an (attribute) report received from the node.
+
+        Returns True if the report rate in the statistics got updated.
+        """
+        if (count := self._report_counts.get(node_id)) is None:
+            return False
+        self._report_counts[node_id] = (count[0] + 1, count[1])
+        if now - count[1] < 3600:
+            return False
+        self._update_stats(node_id, now)
+        return True
+
+    def record_failure(self, node_id: int, now: float) -> NodeSubscriptionStats:
+        """Record a failure of the subscription of the node."""
+        stats = self._update_stats(node_id, now)
+        stats.failures.append(now)
+        stats.stable_since = now
+        return stats
+
+    def choose_ceiling(
+        self,
+        node_id: int,
+        default_ceiling: int,
+        now: float,
+        icd_idle_mode_duration: int | None = None,
+    ) -> int:
+        """Choose the ceiling for a new subscription of the node."""
+        stats = self._update_stats(node_id, now)
+        ceiling = default_ceiling
+        if len(stats.failures) >= self.flaky_failures:
+            ceiling = max(self.min_ceiling, default_ceiling // 2)
+        elif (
+            not stats.failures
+            and now - stats.stable_since >= self.stable_period
+            # the node does not report more often than the default ceiling
+            and stats.reports_per_hour * default_ceiling < 3600
+        ):
+            ceiling = max(
+                default_ceiling,
+                min(self.max_ceiling, max(stats.ceiling, default_ceiling) * 2),
+            )
+        if icd_idle_mode_duration:
+            ceiling = max(ceiling, icd_idle_mode_duration)
+        stats.ceiling = ceiling
+        # start counting the reports of the new subscription
+        self._report_counts[node_id] = (0, now)
+        return ceiling
+
+    def _update_stats(self, node_id: int, now: float) -> NodeSubscriptionStats:
+        """Return the stats of the node, updated with the reports counted since."""
+        if (stats := self._stats.get(node_id)) is None:
+            stats = self._stats[node_id] = NodeSubscriptionStats(stable_since=now)
+        stats.failures = [
+            x for x in stats.failures if now - x <= SUBSCRIPTION_FAILURE_WINDOW
+        ]
+        count, since = self._report_counts.get(node_id, (0, now))
+        if (elapsed := now - since) >= 3600:
+            reports_per_hour = count * 3600 / elapsed
+            stats.reports_per_hour = (
+                (stats.reports_per_hour + reports_per_hour) / 2
+                if stats.reports_per_hour
+                else reports_per_hour
+            )
+            self._report_counts[node_id] = (0, now)
+        return stats
@@ -0,0 +1,202 @@
+"""Helpers to determine the attribute paths to subscribe to on a node."""
+
+from __future__ import annotations
+
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+from chip.clusters import Objects as Clusters
+from chip.clusters.ClusterObjects import ALL_ATTRIBUTES, ALL_CLUSTERS
+
+from ...common.helpers.util import parse_attribute_path
+
+if TYPE_CHECKING:
+    from ...common.models import MatterNodeData
+
+# clusters the server itself relies on, these are always subscribed to
+ESSENTIAL_CLUSTERS = frozenset(
+    {
+        Clusters.Descriptor.id,
+        Clusters.BasicInformation.id,
+    }
+)
+
+# diagnostic and measurement clusters, these are subscribed to with the slow
+# subscription (larger report interval) when tiered subscriptions are enabled
+SLOW_CLUSTERS = frozenset(
+    {
+        Clusters.PowerSource.id,
+        Clusters.GeneralDiagnostics.id,
+        Clusters.SoftwareDiagnostics.id,
+        Clusters.ThreadNetworkDiagnostics.id,
+        Clusters.WiFiNetworkDiagnostics.id,
+        Clusters.EthernetNetworkDiagnostics.id,
+        Clusters.IlluminanceMeasurement.id,
+        Clusters.TemperatureMeasurement.id,
+        Clusters.PressureMeasurement.id,
+        Clusters.FlowMeasurement.id,
+        Clusters.RelativeHumidityMeasurement.id,
+        Clusters.ElectricalPowerMeasurement.id,
+        Clusters.ElectricalEnergyMeasurement.id,
+    }
+)
+
+# clusters of the root endpoint that are subscribed to with the fast subscription
+# when tiered subscriptions are enabled, all other clusters of the root endpoint
+# (configuration, commissioning and diagnostics) go to the slow subscription
+FAST_ROOT_CLUSTERS = ESSENTIAL_CLUSTERS | {Clusters.OtaSoftwareUpdateRequestor.id}
+
+ROOT_ENDPOINT = 0
+
+AttributePathTuple = tuple[int | None, int | None, int | None]
+
+
+class SubscriptionTier(StrEnum):
+    """Tier of a node subscription."""
+
+    # the (only) subscription of a node if tiered subscriptions are disabled,
+    # otherwise the subscription for the interactive clusters
+    FAST = "fast"
+    # the subscription for the diagnostic and measurement clusters
+    SLOW = "slow"
+
+
+def _to_sdk_path(
+    endpoint_id: int | None, cluster_id: int | None, attribute_id: int | None
+) -> tuple[Any, ...] | None:
+    """Convert an attribute path to the (tuple) format the SDK expects.
+
+    Returns None if the path can not be expressed (e.g. an unknown cluster).
+    """
+    if cluster_id is None:
+        if attribute_id is not None:
+            return None
+        return () if endpoint_id is None else (endpoint_id,)
+    if (cluster := ALL_CLUSTERS.get(cluster_id)) is None:
+        return None
+    if attribute_id is None:
+        return (cluster,) if endpoint_id is None else (endpoint_id, cluster)
+    if (attribute := ALL_ATTRIBUTES.get(cluster_id, {}).get(attribute_id)) is None:
+        return None
+    return (attribute,) if endpoint_id is None else (endpoint_id, attribute)
+
+
+def _to_sdk_paths(paths: set[AttributePathTuple], max_paths: int) -> list[Any] | None:
+    """Convert the attribute paths to the SDK format, None if that is not possible."""
+    if len(paths) > max_paths:
+        return None
+    sdk_paths: list[Any] = []
+    for path in sorted(paths, key=str):
+        if (sdk_path := _to_sdk_path(*path)) is None:
+            return None
+        sdk_paths.append(sdk_path)
+    return sdk_paths
+
+
+def _get_paths(
+    node: MatterNodeData, exclude_clusters: set[int]
+) -> set[AttributePathTuple]:
+    """Return the attribute paths to subscribe to for the node."""
+    essential_paths = {(None, cluster_id, None) for cluster_id in ESSENTIAL_CLUSTERS}
+    if node.attribute_subscriptions:
+        return set(node.attribute_subscriptions) | essential_paths
+    return {
+        (None, cluster_id, None)
+        for attribute_path in node.attributes
+        if (cluster_id := parse_attribute_path(attribute_path)[1]) is not None
+        and cluster_id not in exclude_clusters
+    } | essential_paths
+
+
+def get_subscription_paths(
+    node: MatterNodeData,
+    exclude_clusters: set[int],
+    max_paths: int,
+) -> list[Any] | None:
+    """Return the attribute paths to subscribe to for the node.
+
+    If the node has (persisted) attribute subscriptions, only those paths (and the
+    essential clusters) are subscribed. Otherwise all clusters of the node, except
+    the excluded clusters, are subscribed (with a wildcard endpoint).
+    Returns None if the node should be subscribed with a full wildcard: when there
+    is nothing to exclude, if there are more than `max_paths` paths or if a path
+    can not be expressed for the SDK.
+    """
+    excluded = exclude_clusters - ESSENTIAL_CLUSTERS
+    if not node.attribute_subscriptions and not any(
+        parse_attribute_path(attribute_path)[1] in excluded
+        for attribute_path in node.attributes
+    ):
+        return None
+    return _to_sdk_paths(_get_paths(node, exclude_clusters), max_paths)
+
+
+def _get_tiered_paths(
+    node: MatterNodeData, exclude_clusters: set[int]
+) -> tuple[set[AttributePathTuple], set[AttributePathTuple]]:
+    """Return the (fast, slow) attribute paths to subscribe to for the node.
+
+    Without (persisted) attribute subscriptions, the paths are clusters with a
+    wildcard endpoint and attribute, and the root endpoint (except the fast root
+    clusters) is a single path of the slow tier, which keeps the number of paths
+    per tier small.
+    """
+    fast_paths: set[AttributePathTuple] = set()
+    slow_paths: set[AttributePathTuple] = set()
+    if node.attribute_subscriptions:
+        for path in _get_paths(node, exclude_clusters):
+            if path[1] in SLOW_CLUSTERS:
+                slow_paths.add(path)
+            else:
+                fast_paths.add(path)
+        return fast_paths, slow_paths
+    fast_paths = {(None, cluster_id, None) for cluster_id in ESSENTIAL_CLUSTERS}
+    excluded = exclude_clusters - ESSENTIAL_CLUSTERS
+    root_clusters: set[int] = set()
+    root_excluded = False
+    for attribute_path in node.attributes:
+        endpoint_id, cluster_id, _ = parse_attribute_path(attribute_path)
+        if cluster_id is None:
+            continue
+        if cluster_id in excluded:
+            root_excluded |= endpoint_id == ROOT_ENDPOINT
+        elif endpoint_id == ROOT_ENDPOINT and cluster_id not in FAST_ROOT_CLUSTERS:
+            root_clusters.add(cluster_id)
+        elif cluster_id in SLOW_CLUSTERS:
+            slow_paths.add((None, cluster_id, None))
+        else:
+            fast_paths.add((None, cluster_id, None))
+    if root_excluded:
+        # the root endpoint has excluded clusters, so it can not be a wildcard
+        slow_paths.update(
+            (ROOT_ENDPOINT, cluster_id, None) for cluster_id in root_clusters
+        )
+    elif root_clusters:
+        slow_paths.add((ROOT_ENDPOINT, None, None))
+    return fast_paths, slow_paths
+
+
+def get_tiered_subscription_paths(
+    node: MatterNodeData,
+    exclude_clusters: set[int],
+    max_paths: int,
+) -> dict[SubscriptionTier, list[Any]] | None:
+    """Return the attribute paths to subscribe to for the node per tier.
+
+    The diagnostic and measurement clusters and the configuration clusters of the
+    root endpoint go to the slow tier, all other clusters (including paths with a
+    wildcard cluster) go to the fast tier. Returns None if the node can not be (or
+    does not need to be) subscribed with tiered subscriptions, e.g. if it has no
+    slow clusters or if a tier would have more than `max_paths` paths.
+    """
+    fast_paths, slow_paths = _get_tiered_paths(node, exclude_clusters)
+    if not slow_paths:
+        return None
+    if (fast_sdk_paths := _to_sdk_paths(fast_paths, max_paths)) is None:
+        return None
+    if (slow_sdk_paths := _to_sdk_paths(slow_paths, max_paths)) is None:
+        return None
+    return {
+        SubscriptionTier.FAST: fast_sdk_paths,
+        SubscriptionTier.SLOW: slow_sdk_paths,
+    }
@@ -0,0 +1,208 @@
+"""Prioritized (multi-lane) queue of the messages to write to a websocket client."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from enum import IntEnum
+import time
+from typing import Any
+
+from ...common.models import EventType, WriteLaneMetrics
+
+
+class WriteLane(IntEnum):
+    """Lane of an outgoing message, lower values are written first."""
+
+    # command results (and the server info)
+    RESULT = 0
+    # node events and other (low rate) events
+    EVENT = 1
+    # bulk traffic such as attribute updates
+    BULK = 2
+
+
+# number of messages written from a lane per round (while other lanes have messages
+# waiting), which guarantees every lane a share of the writes
+DEFAULT_LANE_WEIGHTS: dict[WriteLane, int] = {
+    WriteLane.RESULT: 8,
+    WriteLane.EVENT: 4,
+    WriteLane.BULK: 1,
+}
+
+BULK_EVENTS = {EventType.ATTRIBUTE_UPDATED, EventType.NODE_SETUP_PROGRESS}
+# events that change the node (or endpoint) list, which are written in order with
+# all other messages (e.g. never before the attribute updates of a removed node)
+BARRIER_EVENTS = {
+    EventType.NODE_ADDED,
+    EventType.NODE_UPDATED,
+    EventType.NODE_REMOVED,
+    EventType.ENDPOINT_ADDED,
+    EventType.ENDPOINT_REMOVED,
+}
+
+
+def get_event_lane(evt: EventType) -> WriteLane:
+    """Return the lane of an event message."""
+    return WriteLane.BULK if evt in BULK_EVENTS else WriteLane.EVENT
+
+
+@dataclass
+class WriteLaneStats:
+    """Statistics of the messages written from a lane (across connections)."""
+
+    queued: int = 0
+    written: int = 0
+    # time (in seconds) messages waited in the queue
+    wait_time_total: float = 0
+    wait_time_max: float = 0
+
+    def get_metrics(self) -> WriteLaneMetrics:
+        """Return the metrics of the lane."""
+        return WriteLaneMetrics(
+            queued=self.queued,
+            written=self.written,
+            wait_time_avg=self.wait_time_total / self.written if self.written else 0,
+            wait_time_max=self.wait_time_max,
+        )
+
+
+def create_lane_stats() -> dict[WriteLane, WriteLaneStats]:
+    """Return (empty) statistics for all lanes."""
+    return {lane: WriteLaneStats() for lane in WriteLane}
+
+
+class WriteLaneQueue:
+    """Bounded queue of outgoing messages with a (weighted round robin) lane each.
+
+    Messages are written in order of lane, within a lane in order of arrival. Each
+    round a lane may write at most its weight of messages while other lanes have
+    messages waiting, so bulk traffic is delayed but never starved.
+
+    A barrier message is written after all messages queued before it and before
+    all messages queued after it, regardless of their lanes.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        stats: dict[WriteLane, WriteLaneStats] | None = None,
+        weights: dict[WriteLane, int] | None = None,
+    ) -> None:
+        """Initialize the queue."""
+        self.maxsize = maxsize
+        self.weights = {**DEFAULT_LANE_WEIGHTS, **(weights or {})}
+        if any(weight < 1 for weight in self.weights.values()):
+            raise ValueError("Lane weight must be at least 1.")
+        self.stats = stats if stats is not None else create_lane_stats()
+        # queued messages per lane as (sequence number, time queued, message)
+        self._lanes: dict[WriteLane, deque[tuple[int, float, Any]]] = {
+            lane: deque() for lane in WriteLane
+        }
+        self._credits = dict(self.weights)
+        self._size = 0
+        self._sequence = 0
+        # sequence numbers of the queued barrier messages
+        self._barriers: deque[int] = deque()
+        self._closed = False
+        self._waiter: asyncio.Future[None] | None = None
+
+    def __len__(self) -> int:
+        """Return the number of queued messages."""
+        return self._size
+
+    def full(self) -> bool:
+        """Return if the queue is full."""
+        return self._size >= self.maxsize
+
+    def put_nowait(self, item: Any, lane: WriteLane, barrier: bool = False) -> None:
+        """Queue a message, raise asyncio.QueueFull if the queue is full."""
+        if self.full():
+            raise asyncio.QueueFull
+        self._sequence += 1
+        self._lanes[lane].append((self._sequence, time.monotonic(), item))
+        if barrier:
+            self._barriers.append(self._sequence)
+        self._size += 1
+        self.stats[lane].queued += 1
+        self._wakeup()
+
+    def close(self) -> None:
+        """Stop the queue, get returns None once the queued messages are written."""
+        self._closed = True
+        self._wakeup()
+
+    async def get(self) -> Any:
+        """Wait for and return the next message (or None if the queue is closed)."""
+        if await self.next_lane() is None:
+            return None
+        return self.get_nowait()
+
+    async def next_lane(self) -> WriteLane | None:
+        """Wait for a message, return its lane (or None if the queue is closed)."""
+        while not self._size:
+            if self._closed:
+                return None
+            await self._wait()
+        return self._next_lane()
+
+    def peek_lane(self) -> WriteLane | None:
+        """Return the lane of the next message (or None if the queue is empty)."""
+        return self._next_lane() if self._size else None
+
+    def get_nowait(self) -> Any:
+        """Return the next message, raise asyncio.QueueEmpty if the queue is empty."""
+        if not self._size:
+            raise asyncio.QueueEmpty
+        lane = self._next_lane()
+        sequence, queued_at, item = self._lanes[lane].popleft()
+        if self._barriers and self._barriers[0] == sequence:
+            self._barriers.popleft()
+        self._size -= 1
+        self._credits[lane] -= 1
+        stats = self.stats[lane]
+        wait_time = time.monotonic() - queued_at
+        stats.queued -= 1
+        stats.written += 1
+        stats.wait_time_total += wait_time
+        stats.wait_time_max = max(stats.wait_time_max, wait_time)
+        return item
+
+    def clear(self) -> None:
+        """Drop all queued messages (e.g. when the connection is closed)."""
+        for lane, messages in self._lanes.items():
+            self.stats[lane].queued -= len(messages)
+            messages.clear()
+        self._barriers.clear()
+        self._size = 0
+
+    def _next_lane(self) -> WriteLane:
+        """Return the lane to write the next message from."""
+        waiting = [lane for lane in WriteLane if self._lanes[lane]]
+        if self._barriers:
+            # the messages queued before the (first) barrier are written first,
+            # then the barrier itself
+            barrier = self._barriers[0]
+            waiting = [
+                lane for lane in waiting if self._lanes[lane][0][0] < barrier
+            ] or [lane for lane in waiting if self._lanes[lane][0][0] == barrier]
+        for lane in waiting:
+            if self._credits[lane] > 0:
+                return lane
+        # all waiting lanes used up their share, start a new round
+        self._credits = dict(self.weights)
+        return waiting[0]
+
+    async def _wait(self) -> None:
+        """Wait until a message is queued (or the queue is woken up otherwise)."""
+        self._waiter = asyncio.get_running_loop().create_future()
+        try:
+            await self._waiter
+        finally:
+            self._waiter = None
+
+    def _wakeup(self) -> None:
+        """Wake up the waiting reader (if any)."""
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
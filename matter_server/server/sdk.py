@@ -8,6 +8,8 @@ also makes the API more pythonic where possible.
 from __future__ import annotations
 
 import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from functools import lru_cache, partial
 import logging
 import time
@@ -18,12 +20,18 @@ from chip.clusters.Attribute import AttributeWriteResult
 from chip.discovery import FilterType
 from chip.exceptions import ChipStackError
 
+from ..common.const import VERBOSE_LOG_LEVEL
 from ..common.errors import (
     NodeNotResolving,
 )
+from ..common.models import NetworkType
+from .helpers.admission import AdmissionController
+from .helpers.airtime import ThreadAirtimeThrottle
+from .helpers.interaction_queue import InteractionPriority, NodeInteractionQueue
+from .helpers.subscriptions import SubscriptionTier
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import AsyncIterator, Callable
     from concurrent.futures import ThreadPoolExecutor
     from pathlib import Path
 
@@ -35,12 +43,65 @@ if TYPE_CHECKING:
     from chip.discovery import DiscoveryType
     from chip.native import PyChipError
 
+    from ..common.models import (
+        AdmissionMetrics,
+        NodeInteractionQueueMetrics,
+        ThreadAirtimeMetrics,
+    )
     from .server import MatterServer
 
 _T = TypeVar("_T")
 
 LOGGER = logging.getLogger(__name__)
 
+# max number of simultaneous interactions with a single node
+NODE_INTERACTION_CONCURRENCY = 1
+# max number of interactions that may wait for a slot on a single node
+NODE_INTERACTION_MAX_QUEUED = 64
+
+# endpoint_id, cluster_id, attribute_id where None means wildcard
+AttributePathKey = tuple[int | None, int | None, int | None]
+
+
+@dataclass
+class _InflightRead:
+    """A read interaction which is currently in flight."""
+
+    attribute_paths: set[AttributePathKey]
+    fabric_filtered: bool
+    priority: InteractionPriority
+    task: asyncio.Task[Attribute.AsyncReadTransaction.ReadResponse]
+
+    def covers(
+        self,
+        attribute_paths: set[AttributePathKey],
+        fabric_filtered: bool,
+        priority: InteractionPriority,
+    ) -> bool:
+        """Return if this read also reads all of the given attribute paths.
+
+        A read with a lower priority (which may be queued behind other interactions)
+        does not cover a read with a higher priority.
+        """
+        if fabric_filtered != self.fabric_filtered or priority < self.priority:
+            return False
+        return all(
+            any(
+                _attribute_path_covers(inflight_path, attribute_path)
+                for inflight_path in self.attribute_paths
+            )
+            for attribute_path in attribute_paths
+        )
+
+
+def _attribute_path_covers(path: AttributePathKey, other: AttributePathKey) -> bool:
+    """Return if (wildcard) attribute path includes the other attribute path."""
+    return all(
+        part is None or part == other_part
+        for part, other_part in zip(path, other, strict=True)
+    )
+
+
 # pylint: disable=too-many-public-methods
 
 
@@ -59,8 +120,18 @@ class ChipDeviceControllerWrapper:
         """Initialize the device controller."""
         self.server = server
 
-        self._node_lock: dict[int, asyncio.Lock] = {}
-        self._subscriptions: dict[int, Attribute.SubscriptionTransaction] = {}
+        self._node_queues: dict[int, NodeInteractionQueue] = {}
+        self._node_network_types: dict[int, NetworkType] = {}
+        self._admission = AdmissionController(server.interaction_budgets)
+        self._node_thread_networks: dict[int, int | None] = {}
+        self._airtime = ThreadAirtimeThrottle()
+        # the (fast and optionally slow) subscription(s) per node
+        self._subscriptions: dict[
+            int, dict[SubscriptionTier, Attribute.SubscriptionTransaction]
+        ] = {}
+        self._inflight_reads: dict[int, list[_InflightRead]] = {}
+        self._device_proxies: dict[int, DeviceProxyWrapper] = {}
+        self._session_establishment: dict[int, asyncio.Task[DeviceProxyWrapper]] = {}
 
         # Instantiate the underlying ChipDeviceController instance on the Fabric
         self._chip_controller = self.server.stack.fabric_admin.NewController(
@@ -68,11 +139,112 @@ class ChipDeviceControllerWrapper:
         )
         LOGGER.debug("CHIP Device Controller Initialized")
 
-    def _get_node_lock(self, node_id: int) -> asyncio.Lock:
-        """Return lock for given node."""
-        if node_id not in self._node_lock:
-            self._node_lock[node_id] = asyncio.Lock()
-        return self._node_lock[node_id]
+    def _get_node_queue(self, node_id: int) -> NodeInteractionQueue:
+        """Return (prioritized) interaction queue for given node."""
+        if node_id not in self._node_queues:
+            self._node_queues[node_id] = NodeInteractionQueue(
+                NODE_INTERACTION_CONCURRENCY, NODE_INTERACTION_MAX_QUEUED
+            )
+        return self._node_queues[node_id]
+
+    def get_node_interaction_metrics(self) -> dict[int, NodeInteractionQueueMetrics]:
+        """Return the interaction queue metrics of all nodes."""
+        return {
+            node_id: queue.get_metrics() for node_id, queue in self._node_queues.items()
+        }
+
+    def get_admission_metrics(self) -> dict[str, AdmissionMetrics]:
+        """Return the admission metrics per network type."""
+        return self._admission.get_metrics()
+
+    def get_thread_airtime_metrics(self) -> dict[str, ThreadAirtimeMetrics]:
+        """Return the airtime throttling metrics per Thread network."""
+        return self._airtime.get_metrics()
+
+    def set_node_network_type(
+        self,
+        node_id: int,
+        network_type: NetworkType,
+        extended_pan_id: int | None = None,
+    ) -> None:
+        """Set the (type of) network the node is connected to.
+
+        Used for admission control and, for Thread nodes, airtime throttling.
+        """
+        self._node_network_types[node_id] = network_type
+        self._node_thread_networks[node_id] = extended_pan_id
+
+    @asynccontextmanager
+    async def _node_interaction(
+        self, node_id: int, priority: InteractionPriority
+    ) -> AsyncIterator[None]:
+        """Wait for (and hold) a slot to interact with the node.
+
+        The slot on the interaction queue of the node is acquired first, so
+        interactions waiting for a busy node do not hold any of the (global)
+        admission budget of the node's network.
+        Background interactions with Thread nodes first need to acquire a token
+        from the airtime bucket of the Thread network, other interactions are
+        charged without waiting so they take precedence over background traffic.
+        A failed interaction drops the cached device proxy (session) of the node.
+        """
+        network_type = self._node_network_types.get(node_id, NetworkType.UNKNOWN)
+        airtime_bucket = None
+        if network_type == NetworkType.THREAD:
+            airtime_bucket = self._airtime.get_bucket(
+                self._node_thread_networks.get(node_id)
+            )
+            if priority == InteractionPriority.BACKGROUND:
+                await airtime_bucket.acquire()
+        async with (
+            self._get_node_queue(node_id).slot(priority),
+            self._admission.admit(network_type, priority),
+        ):
+            if airtime_bucket and priority != InteractionPriority.BACKGROUND:
+                airtime_bucket.charge()
+            try:
+                yield
+            except ChipStackError:
+                # the session may have been lost, establish a new one next time
+                self.invalidate_session(node_id)
+                raise
+
+    async def _get_connected_device(self, node_id: int) -> DeviceProxyWrapper:
+        """Return device proxy for the node, establishing a CASE session if needed.
+
+        The device proxy is cached until the session gets invalidated. Concurrent
+        callers share a single session establishment.
+        """
+        if (device := self._device_proxies.get(node_id)) is not None:
+            return device
+        if (task := self._session_establishment.get(node_id)) is None:
+            task = asyncio.create_task(self._establish_session(node_id))
+            self._session_establishment[node_id] = task
+
+            def _establishment_done(task: asyncio.Task[DeviceProxyWrapper]) -> None:
+                self._session_establishment.pop(node_id, None)
+                # mark exception as retrieved, all waiters (if any) receive it already
+                if not task.cancelled():
+                    task.exception()
+
+            task.add_done_callback(_establishment_done)
+        return await asyncio.shield(task)
+
+    async def _establish_session(self, node_id: int) -> DeviceProxyWrapper:
+        """Establish a CASE session with the node and cache the device proxy."""
+        network_type = self._node_network_types.get(node_id, NetworkType.UNKNOWN)
+        async with self._admission.admit(network_type, InteractionPriority.READ):
+            device = await self._chip_controller.GetConnectedDevice(
+                nodeid=node_id,
+                allowPASE=False,
+                timeoutMs=None,
+            )
+        self._device_proxies[node_id] = device
+        return device
+
+    def invalidate_session(self, node_id: int) -> None:
+        """Drop the cached device proxy of a node, e.g. when its session got lost."""
+        self._device_proxies.pop(node_id, None)
 
     async def _call_sdk_executor(
         self,
@@ -115,8 +287,9 @@ class ChipDeviceControllerWrapper:
     async def shutdown(self) -> None:
         """Shutdown the device controller."""
         # unsubscribe all node subscriptions
-        for sub in self._subscriptions.values():
-            await self._call_sdk(sub.Shutdown)
+        for node_subscriptions in self._subscriptions.values():
+            for sub in node_subscriptions.values():
+                await self._call_sdk(sub.Shutdown)
         self._subscriptions = {}
 
         await self._call_sdk(self._chip_controller.Shutdown)
@@ -200,7 +373,8 @@ class ChipDeviceControllerWrapper:
         option: ChipDeviceController.CommissioningWindowPasscode,
     ) -> CommissioningParameters:
         """Open a commissioning window to commission a device present on this controller to another."""
-        async with self._get_node_lock(node_id):
+        await self._get_connected_device(node_id)
+        async with self._node_interaction(node_id, InteractionPriority.COMMAND):
             return await self._chip_controller.OpenCommissioningWindow(
                 nodeid=node_id,
                 timeout=timeout,
@@ -259,21 +433,27 @@ class ChipDeviceControllerWrapper:
             tuple[int, type[Clusters.ClusterEvent], int]
         ]
         | None = None,
+        event_number_filter: int | None = None,
         return_cluster_objects: bool = False,
         report_interval: tuple[int, int] | None = None,
         fabric_filtered: bool = True,
         auto_resubscribe: bool = True,
+        priority: InteractionPriority = InteractionPriority.READ,
+        subscription_tier: SubscriptionTier = SubscriptionTier.FAST,
     ) -> (
         Attribute.SubscriptionTransaction
         | Attribute.AsyncReadTransaction.ReadResponse
         | None
     ):
         """Read an attribute on a node."""
-        async with self._get_node_lock(node_id):
+        # make sure a session exists before entering the interaction queue
+        await self._get_connected_device(node_id)
+        async with self._node_interaction(node_id, priority):
             result = await self._chip_controller.Read(
                 nodeid=node_id,
                 attributes=attributes,
                 events=events,
+                eventNumberFilter=event_number_filter,
                 returnClusterObject=return_cluster_objects,
                 reportInterval=report_interval,
                 fabricFiltered=fabric_filtered,
@@ -291,7 +471,7 @@ class ChipDeviceControllerWrapper:
 
         # if we reach this point, it means the node could be resolved
         # and the initial subscription succeeded, mark the node available.
-        self._subscriptions[node_id] = result
+        self._subscriptions.setdefault(node_id, {})[subscription_tier] = result
         return result
 
     async def send_command(
@@ -302,9 +482,11 @@ class ChipDeviceControllerWrapper:
         response_type: Any | None = None,
         timed_request_timeout_ms: int | None = None,
         interaction_timeout_ms: int | None = None,
+        priority: InteractionPriority = InteractionPriority.COMMAND,
     ) -> Any:
         """Send a command to a Matter node/device."""
-        async with self._get_node_lock(node_id):
+        await self._get_connected_device(node_id)
+        async with self._node_interaction(node_id, priority):
             return await self._chip_controller.SendCommand(
                 nodeid=node_id,
                 endpoint=endpoint_id,
@@ -319,25 +501,96 @@ class ChipDeviceControllerWrapper:
         node_id: int,
         attributes: list[Attribute.AttributePath],
         fabric_filtered: bool = True,
+        priority: InteractionPriority = InteractionPriority.READ,
+    ) -> Attribute.AsyncReadTransaction.ReadResponse:
+        """Read a list of attributes and/or events from a target node.
+
+        Concurrent reads on the same node which request the same attribute paths (or
+        a subset of them) as a read that is already in flight with the same (or a
+        higher) priority, share the result of that read instead of doing another
+        interaction with the node.
+        """
+        attribute_paths = {
+            (x.EndpointId, x.ClusterId, x.AttributeId) for x in attributes
+        }
+        for inflight_read in self._inflight_reads.get(node_id, []):
+            if inflight_read.covers(attribute_paths, fabric_filtered, priority):
+                LOGGER.log(
+                    VERBOSE_LOG_LEVEL,
+                    "Node %s: joining in-flight read for %s",
+                    node_id,
+                    attribute_paths,
+                )
+                return await asyncio.shield(inflight_read.task)
+
+        inflight_read = _InflightRead(
+            attribute_paths=attribute_paths,
+            fabric_filtered=fabric_filtered,
+            priority=priority,
+            task=asyncio.create_task(
+                self._read(node_id, attributes, fabric_filtered, priority)
+            ),
+        )
+        self._inflight_reads.setdefault(node_id, []).append(inflight_read)
+
+        def _read_done(
+            task: asyncio.Task[Attribute.AsyncReadTransaction.ReadResponse],
+        ) -> None:
+            inflight_reads = self._inflight_reads[node_id]
+            inflight_reads.remove(inflight_read)
+            if not inflight_reads:
+                del self._inflight_reads[node_id]
+            # mark exception as retrieved, all waiters (if any) receive it already
+            if not task.cancelled():
+                task.exception()
+
+        inflight_read.task.add_done_callback(_read_done)
+        # shield the read from cancellation as other callers might be waiting on it
+        return await asyncio.shield(inflight_read.task)
+
+    async def _read(
+        self,
+        node_id: int,
+        attributes: list[Attribute.AttributePath],
+        fabric_filtered: bool,
+        priority: InteractionPriority,
     ) -> Attribute.AsyncReadTransaction.ReadResponse:
-        """Read a list of attributes and/or events from a target node."""
+        """Read a list of attributes and/or events from a target node.
+
+        The read is retried once (with a new session) if it fails, as the cached
+        session may have been lost.
+        """
+        try:
+            return await self._read_once(node_id, attributes, fabric_filtered, priority)
+        except ChipStackError as err:
+            LOGGER.debug(
+                "Node %s: read failed (%s), retrying with a new session", node_id, err
+            )
+        return await self._read_once(node_id, attributes, fabric_filtered, priority)
+
+    async def _read_once(
+        self,
+        node_id: int,
+        attributes: list[Attribute.AttributePath],
+        fabric_filtered: bool,
+        priority: InteractionPriority,
+    ) -> Attribute.AsyncReadTransaction.ReadResponse:
+        """Read a list of attributes and/or events from a target node (once)."""
         if TYPE_CHECKING:
             assert self.server.loop
 
         # Read a list of attributes and/or events from a target node.
         # This is basically a re-implementation of the chip controller's Read function
         # but one that allows us to send/request custom attributes.
+        # The (CASE) session is established before entering the interaction queue,
+        # so establishing it does not block other interactions with the node.
+        # _get_connected_device is guaranteed to return a deviceProxy
+        # otherwise it will raise a ChipStackError exception. A caller to
+        # this function should handle the exception in any case, as the Read
+        # below might raise such exceptions too.
+        device = await self._get_connected_device(node_id)
         future = self.server.loop.create_future()
-        async with self._get_node_lock(node_id):
-            # GetConnectedDevice is guaranteed to return a deviceProxy
-            # otherwise it will raise a ChipStackError exception. A caller to
-            # this function should handle the exception in any case, as the Read
-            # below might raise such exceptions too.
-            device = await self._chip_controller.GetConnectedDevice(
-                nodeid=node_id,
-                allowPASE=False,
-                timeoutMs=None,
-            )
+        async with self._node_interaction(node_id, priority):
             transaction = Attribute.AsyncReadTransaction(
                 future, self.server.loop, self._chip_controller, True
             )
@@ -356,7 +609,8 @@ class ChipDeviceControllerWrapper:
         attributes: list[tuple[int, Clusters.ClusterAttributeDescriptor]],
     ) -> list[AttributeWriteResult] | None:
         """Write an attribute on a target node."""
-        async with self._get_node_lock(node_id):
+        await self._get_connected_device(node_id)
+        async with self._node_interaction(node_id, InteractionPriority.WRITE):
             result = await self._chip_controller.WriteAttribute(
                 nodeid=node_id,
                 attributes=attributes,
@@ -388,12 +642,7 @@ class ChipDeviceControllerWrapper:
                     retries,
                 )
                 time_start = time.time()
-                async with self._get_node_lock(node_id):
-                    return await self._chip_controller.GetConnectedDevice(
-                        nodeid=node_id,
-                        allowPASE=False,
-                        timeoutMs=None,
-                    )
+                return await self._get_connected_device(node_id)
             except ChipStackError as err:
                 if attempt >= retries:
                     # when we're out of retries, raise NodeNotResolving
@@ -410,20 +659,20 @@ class ChipDeviceControllerWrapper:
         return None
 
     async def shutdown_subscription(self, node_id: int) -> None:
-        """Shutdown a subscription for a node."""
-        if sub := self._subscriptions.pop(node_id, None):
+        """Shutdown the subscription(s) of a node."""
+        for sub in self._subscriptions.pop(node_id, {}).values():
             await self._call_sdk(sub.Shutdown)
 
     async def subscription_override_liveness_timeout(
         self, node_id: int, liveness_timeout_ms: int
     ) -> None:
-        """Override the liveness timeout for the subscription of the node."""
-        if sub := self._subscriptions.get(node_id):
+        """Override the liveness timeout for the subscription(s) of the node."""
+        for sub in list(self._subscriptions.get(node_id, {}).values()):
             await self._call_sdk(sub.OverrideLivenessTimeoutMs, liveness_timeout_ms)
 
     def node_has_subscription(self, node_id: int) -> bool:
         """Check if a node has an active subscription."""
-        return node_id in self._subscriptions
+        return bool(self._subscriptions.get(node_id))
 
     async def trigger_resubscribe_if_scheduled(self, node_id: int, reason: str) -> None:
         """Trigger resubscribe now if a resubscribe is scheduled.
@@ -433,5 +682,5 @@ class ChipDeviceControllerWrapper:
         when the server side is up and communicating, and it's a good time to
         try to resubscribe.
         """
-        if sub := self._subscriptions.get(node_id, None):
+        for sub in list(self._subscriptions.get(node_id, {}).values()):
             await sub.TriggerResubscribeIfScheduled(reason)
@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import asyncio
+from dataclasses import dataclass
 from functools import cached_property, partial
 import inspect
 import ipaddress
 import logging
 import os
 from pathlib import Path
+import sys
 import traceback
 from typing import TYPE_CHECKING, Any, cast
 import weakref
@@ -16,24 +18,42 @@ import weakref
 from aiohttp import web
 
 from matter_server.server.helpers.custom_web_runner import MultiHostTCPSite
+from matter_server.server.helpers.event_bus import EventBus
+from matter_server.server.helpers.frontend import FrontendProcess
 from matter_server.server.helpers.paa_certificates import fetch_certificates
+from matter_server.server.helpers.write_lanes import create_lane_stats
 
 from ..common.const import SCHEMA_VERSION
 from ..common.errors import VersionMismatch
 from ..common.helpers.api import APICommandHandler, api_command
 from ..common.helpers.json import json_dumps
-from ..common.helpers.util import chip_clusters_version, chip_core_version
+from ..common.helpers.msgpack import msgpack_available
+from ..common.helpers.util import (
+    chip_clusters_version,
+    chip_core_version,
+    dataclass_to_dict,
+)
 from ..common.models import (
     APICommand,
-    EventCallBackType,
     EventType,
+    MatterNodeData,
+    NetworkType,
     ServerDiagnostics,
     ServerInfoMessage,
+    ServerMetrics,
 )
 from ..server.client_handler import WebsocketClientHandler
 from .const import (
+    CONTROLLER_SOCKET_NAME,
+    DEFAULT_AGGREGATE_WINDOWS,
+    DEFAULT_AGGREGATED_ATTRIBUTES,
+    DEFAULT_ATTRIBUTE_HISTORY_SIZE,
+    DEFAULT_EVENT_LOG_SIZE,
     DEFAULT_OTA_PROVIDER_DIR,
     DEFAULT_PAA_ROOT_CERTS_DIR,
+    DEFAULT_POLL_INTERVAL_MAX,
+    DEFAULT_POLL_INTERVAL_MIN,
+    DEFAULT_UNIX_SOCKET_MODE,
     MIN_SCHEMA_VERSION,
 )
 from .device_controller import MatterDeviceController
@@ -42,8 +62,12 @@ from .storage import StorageController
 from .vendor_info import VendorInfo
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable
+
+    from .helpers.attribute_throttle import AttributeThrottleRule
 
+# number of (latest) node events included in the diagnostics
+DIAGNOSTICS_EVENT_COUNT = 25
 DASHBOARD_DIR = Path(__file__).parent.joinpath("../dashboard/").resolve()
 DASHBOARD_DIR_EXISTS = DASHBOARD_DIR.exists()
 
@@ -93,6 +117,35 @@ def mount_websocket(server: MatterServer, path: str) -> None:
     server.app.router.add_route("GET", path, _handle_ws)
 
 
+@dataclass
+class ServerOptions:
+    """Optional (tuning) settings of the Matter server."""
+
+    # pylint: disable=too-many-instance-attributes
+
+    # max number of simultaneous interactions per network type (None = default)
+    interaction_budgets: dict[NetworkType, int] | None = None
+    # clusters to exclude from the (wildcard) node subscriptions
+    subscription_exclude_clusters: set[int] | None = None
+    tiered_subscriptions: bool = False
+    attribute_throttle_rules: list[AttributeThrottleRule] | None = None
+    # bounds of the (adaptive) poll interval of custom attributes
+    poll_interval_min: float = DEFAULT_POLL_INTERVAL_MIN
+    poll_interval_max: float = DEFAULT_POLL_INTERVAL_MAX
+    attribute_history_clusters: set[int] | None = None
+    attribute_history_size: int = DEFAULT_ATTRIBUTE_HISTORY_SIZE
+    aggregated_attributes: list[str] | None = None
+    aggregate_windows: list[int] | None = None
+    event_log_size: int = DEFAULT_EVENT_LOG_SIZE
+    # (optional) path of a unix domain socket to serve the api on (as well)
+    unix_socket: str | None = None
+    # permissions of the unix socket, which gives full (admin) access to the api
+    unix_socket_mode: int = DEFAULT_UNIX_SOCKET_MODE
+    # serve the clients from a separate (front-end) process, which connects to
+    # the (controller) process over the unix socket
+    split_frontend: bool = False
+
+
 class MatterServer:
     """Serve Matter stack over WebSockets."""
 
@@ -100,6 +153,8 @@ class MatterServer:
 
     _runner: web.AppRunner | None = None
     _http: MultiHostTCPSite | None = None
+    _unix: web.UnixSite | None = None
+    _frontend: FrontendProcess | None = None
 
     def __init__(  # noqa: PLR0913, pylint: disable=too-many-positional-arguments, too-many-arguments
         self,
@@ -114,8 +169,11 @@ class MatterServer:
         bluetooth_adapter_id: int | None = None,
         ota_provider_dir: Path | None = None,
         enable_server_interactions: bool = True,
+        *,
+        options: ServerOptions | None = None,
     ) -> None:
         """Initialize the Matter Server."""
+        options = options or ServerOptions()
         self.storage_path = storage_path
         self.vendor_id = vendor_id
         self.fabric_id = fabric_id
@@ -132,6 +190,32 @@ class MatterServer:
             self.ota_provider_dir = DEFAULT_OTA_PROVIDER_DIR
         else:
             self.ota_provider_dir = Path(ota_provider_dir).absolute()
+        self.interaction_budgets = options.interaction_budgets
+        self.subscription_exclude_clusters = (
+            options.subscription_exclude_clusters or set()
+        )
+        self.tiered_subscriptions = options.tiered_subscriptions
+        self.attribute_throttle_rules = options.attribute_throttle_rules or []
+        self.poll_interval_min = options.poll_interval_min
+        self.poll_interval_max = options.poll_interval_max
+        self.attribute_history_clusters = options.attribute_history_clusters or set()
+        self.attribute_history_size = options.attribute_history_size
+        self.aggregated_attributes = (
+            list(DEFAULT_AGGREGATED_ATTRIBUTES)
+            if options.aggregated_attributes is None
+            else options.aggregated_attributes
+        )
+        self.aggregate_windows = (
+            list(DEFAULT_AGGREGATE_WINDOWS)
+            if options.aggregate_windows is None
+            else options.aggregate_windows
+        )
+        self.event_log_size = options.event_log_size
+        self.unix_socket = options.unix_socket
+        self.unix_socket_mode = options.unix_socket_mode
+        self.split_frontend = options.split_frontend
+        if options.split_frontend and options.unix_socket is None:
+            self.unix_socket = os.path.join(storage_path, CONTROLLER_SOCKET_NAME)
         self.logger = logging.getLogger(__name__)
         self.app = web.Application()
         self.loop: asyncio.AbstractEventLoop | None = None
@@ -142,7 +226,9 @@ class MatterServer:
         # we dynamically register command handlers
         self.command_handlers: dict[str, APICommandHandler] = {}
         self._device_controller: MatterDeviceController | None = None
-        self._subscribers: set[EventCallBackType] = set()
+        self.event_bus = EventBus()
+        # statistics of the (prioritized) messages written to the websocket clients
+        self.write_lane_stats = create_lane_stats()
         if MIN_SCHEMA_VERSION > SCHEMA_VERSION:
             raise RuntimeError(
                 "Minimum supported schema version can't be higher than current schema version."
@@ -168,6 +254,7 @@ class MatterServer:
                 "CHIP Core version does not match CHIP Clusters version."
             )
         self.loop = asyncio.get_running_loop()
+        self.event_bus.loop = self.loop
         self.loop.set_exception_handler(_global_loop_exception_handler)
         self.loop.set_debug(os.environ.get("PYTHONDEBUG", "") != "")
 
@@ -210,20 +297,37 @@ class MatterServer:
 
         self._runner = web.AppRunner(self.app, access_log=None)
         await self._runner.setup()
-        self._http = MultiHostTCPSite(
-            self._runner, host=self.listen_addresses, port=self.port
-        )
-        await self._http.start()
+        if not self.split_frontend:
+            self._http = MultiHostTCPSite(
+                self._runner, host=self.listen_addresses, port=self.port
+            )
+            await self._http.start()
+        if self.unix_socket:
+            self._unix = web.UnixSite(self._runner, self.unix_socket)
+            await self._unix.start()
+            # the socket is created with the permissions of the process umask
+            await asyncio.get_running_loop().run_in_executor(
+                None, Path(self.unix_socket).chmod, self.unix_socket_mode
+            )
+            self.logger.info("Listening on unix socket %s", self.unix_socket)
+        if self.split_frontend:
+            self._frontend = FrontendProcess(self._get_frontend_command())
+            await self._frontend.start()
         self.logger.info("Matter Server successfully initialized.")
 
     async def stop(self) -> None:
         """Stop running the server."""
         self.logger.info("Stopping the Matter Server...")
-        if self._http is None or self._runner is None:
+        if self._runner is None:
             raise RuntimeError("Server not started.")
 
         self.signal_event(EventType.SERVER_SHUTDOWN)
-        await self._http.stop()
+        if self._frontend is not None:
+            await self._frontend.stop()
+        if self._http is not None:
+            await self._http.stop()
+        if self._unix is not None:
+            await self._unix.stop()
         await self._runner.cleanup()
         await self.app.shutdown()
         await self.app.cleanup()
@@ -232,20 +336,44 @@ class MatterServer:
         self.stack.shutdown()
         self.logger.debug("Cleanup complete")
 
+    def _get_frontend_command(self) -> list[str]:
+        """Return the command to run the front-end process (in split mode)."""
+        command = [
+            sys.executable,
+            "-m",
+            "matter_server.relay",
+            "--upstream-url",
+            f"unix://{self.unix_socket}",
+            "--port",
+            str(self.port),
+            "--batch-messages",
+            "--log-level",
+            logging.getLevelName(
+                max(logging.DEBUG, logging.getLogger().getEffectiveLevel())
+            ).lower(),
+        ]
+        if msgpack_available():
+            command.append("--binary")
+        for address in self.listen_addresses or []:
+            command.extend(["--listen-address", address])
+        return command
+
+    def get_nodes(self) -> list[MatterNodeData]:
+        """Return all nodes known to the server."""
+        return self.device_controller.get_nodes()
+
     def subscribe(
-        self, callback: Callable[[EventType, Any], None]
+        self,
+        callback: Callable[[EventType, Any], None],
+        event_types: Iterable[EventType] | None = None,
     ) -> Callable[[], None]:
         """
         Subscribe to events.
 
+        Optionally only to the given event type(s).
         Returns handle to remove subscription.
         """
-
-        def unsub() -> None:
-            self._subscribers.remove(callback)
-
-        self._subscribers.add(callback)
-        return unsub
+        return self.event_bus.subscribe(callback, event_types)
 
     @api_command(APICommand.SERVER_INFO)
     def get_info(self) -> ServerInfoMessage:
@@ -269,18 +397,33 @@ class MatterServer:
         return ServerDiagnostics(
             info=self.get_info(),
             nodes=self.device_controller.get_nodes(),
-            events=list(self.device_controller.event_history),
+            events=[
+                dataclass_to_dict(event)
+                for event in self.device_controller.event_log.get_latest(
+                    DIAGNOSTICS_EVENT_COUNT
+                )
+            ],
+        )
+
+    @api_command(APICommand.GET_METRICS)
+    def get_metrics(self) -> ServerMetrics:
+        """Return runtime metrics of the server."""
+        return ServerMetrics(
+            node_interactions=self.device_controller.get_node_interaction_metrics(),
+            admission=self.device_controller.get_admission_metrics(),
+            thread_airtime=self.device_controller.get_thread_airtime_metrics(),
+            node_setup=self.device_controller.get_node_setup_progress(),
+            node_setup_retries=self.device_controller.get_node_setup_retries(),
+            resubscription_storm=self.device_controller.get_resubscription_storm_metrics(),
+            websocket_lanes={
+                lane.name.lower(): stats.get_metrics()
+                for lane, stats in self.write_lane_stats.items()
+            },
         )
 
     def signal_event(self, evt: EventType, data: Any = None) -> None:
         """Signal event to listeners."""
-        if TYPE_CHECKING:
-            assert self.loop
-        for callback in self._subscribers:
-            if asyncio.iscoroutinefunction(callback):
-                asyncio.create_task(callback(evt, data))
-            else:
-                self.loop.call_soon(callback, evt, data)
+        self.event_bus.publish(evt, data)
 
     def scope_ipv6_lla(self, ip_addr: str) -> str:
         """Scope IPv6 link-local addresses to primary interface.
@@ -162,7 +162,7 @@ class StorageController:
             # use atomomic write to avoid corrupting the file
             # if power is cut during write, we don't write a corrupted file
             with atomic_write(self.filename, encoding="utf-8", overwrite=True) as _file:
-                _file.write(json_dumps(self._data))
+                _file.write(json_dumps(self._data, indent=True))
 
             LOGGER.debug("Saved data to persistent storage")
 
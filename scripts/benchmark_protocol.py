@@ -0,0 +1,104 @@
+"""Benchmark the size and (de)serialization time of the websocket API encodings."""
+
+import argparse
+from datetime import UTC, datetime
+import random
+import time
+from typing import Any
+
+from matter_server.common.helpers.json import json_dumps, json_loads
+from matter_server.common.helpers.msgpack import msgpack_dumps, msgpack_loads
+from matter_server.common.models import (
+    EventMessage,
+    EventType,
+    MatterNodeData,
+    SuccessResultMessage,
+)
+
+# fixed seed, so every run benchmarks the same messages
+RANDOM = random.Random(0)  # noqa: S311
+
+
+def create_node(node_id: int, endpoints: int) -> MatterNodeData:
+    """Create a node with (roughly) the attributes of a typical device."""
+    attributes: dict[str, Any] = {}
+    for endpoint in range(endpoints):
+        for cluster in (3, 4, 6, 8, 29, 768, 1026):
+            for attribute in range(12):
+                attributes[f"{endpoint}/{cluster}/{attribute}"] = RANDOM.randint(
+                    0, 65535
+                )
+            attributes[f"{endpoint}/{cluster}/65531"] = list(range(16))
+        attributes[f"{endpoint}/40/5"] = f"Device {node_id}/{endpoint}"
+    # binary values such as certificates and network ids
+    attributes["0/62/0"] = [{"1": RANDOM.randbytes(400), "2": RANDOM.randbytes(240)}]
+    attributes["0/49/1"] = [{"0": RANDOM.randbytes(8), "1": True}]
+    now = datetime.now(UTC)
+    return MatterNodeData(
+        node_id=node_id,
+        date_commissioned=now,
+        last_interview=now,
+        interview_version=6,
+        available=True,
+        attributes=attributes,
+    )
+
+
+def create_messages(nodes: int, events: int) -> list[Any]:
+    """Create a start_listening result followed by attribute updated events."""
+    node_list = [create_node(node_id, 3) for node_id in range(1, nodes + 1)]
+    messages: list[Any] = [SuccessResultMessage("1", node_list)]
+    messages.extend(
+        EventMessage(
+            event=EventType.ATTRIBUTE_UPDATED,
+            data=[
+                RANDOM.randint(1, nodes),
+                "1/1026/0",
+                RANDOM.randint(0, 4000),
+            ],
+        )
+        for _ in range(events)
+    )
+    return messages
+
+
+def benchmark(messages: list[Any], dumps: Any, loads: Any) -> tuple[int, float, float]:
+    """Return the total size, encode and decode time of the messages."""
+    start = time.perf_counter()
+    encoded = [dumps(message) for message in messages]
+    encode_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for message in encoded:
+        loads(message)
+    decode_time = time.perf_counter() - start
+    size = sum(
+        len(x.encode("utf-8")) if isinstance(x, str) else len(x) for x in encoded
+    )
+    return size, encode_time, decode_time
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=100)
+    parser.add_argument("--events", type=int, default=10000)
+    args = parser.parse_args()
+
+    messages = create_messages(args.nodes, args.events)
+    encodings = {
+        "json (indented)": (lambda x: json_dumps(x, indent=True), json_loads),
+        "json (compact)": (json_dumps, json_loads),
+        "msgpack": (msgpack_dumps, msgpack_loads),
+    }
+    print(f"{args.nodes} nodes, {args.events} attribute_updated events")
+    print(f"{'encoding':<16} {'bytes':>12} {'encode (ms)':>12} {'decode (ms)':>12}")
+    for name, (dumps, loads) in encodings.items():
+        size, encode_time, decode_time = benchmark(messages, dumps, loads)
+        print(
+            f"{name:<16} {size:>12} {encode_time * 1000:>12.1f} "
+            f"{decode_time * 1000:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
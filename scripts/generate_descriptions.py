@@ -119,9 +119,9 @@ export interface ClusterDescription {
 
 """
 output += f"""
-export const device_types: Record<number, DeviceType> = {json_dumps(device_types)}
+export const device_types: Record<number, DeviceType> = {json_dumps(device_types, indent=True)}
 
-export const clusters: Record<number, ClusterDescription> = {json_dumps(clusters)}
+export const clusters: Record<number, ClusterDescription> = {json_dumps(clusters, indent=True)}
 
 """
 
@@ -0,0 +1,75 @@
+"""Test the websocket connection of the client."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from aiohttp import ClientSession, web
+import pytest
+
+from matter_server.client.connection import MatterClientConnection
+from matter_server.client.exceptions import CannotConnect
+from matter_server.common.const import SCHEMA_VERSION
+from matter_server.common.helpers.json import json_dumps
+from matter_server.common.models import ServerInfoMessage
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+    from pathlib import Path
+
+SERVER_INFO = ServerInfoMessage(
+    fabric_id=1,
+    compressed_fabric_id=1234,
+    schema_version=SCHEMA_VERSION,
+    min_supported_schema_version=SCHEMA_VERSION,
+    sdk_version="test",
+    wifi_credentials_set=False,
+    thread_credentials_set=False,
+    bluetooth_enabled=False,
+)
+
+
+async def _handle_ws(request: web.Request) -> web.WebSocketResponse:
+    """Send the server info to the connected client."""
+    wsock = web.WebSocketResponse()
+    await wsock.prepare(request)
+    await wsock.send_str(json_dumps(SERVER_INFO))
+    async for _ in wsock:
+        pass
+    return wsock
+
+
+@pytest.fixture(name="unix_socket")
+async def unix_socket_fixture(tmp_path: Path) -> AsyncGenerator[str, None]:
+    """Yield the path of a unix socket serving the websocket api."""
+    app = web.Application()
+    app.router.add_route("GET", "/ws", _handle_ws)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    path = str(tmp_path / "api.sock")
+    await web.UnixSite(runner, path).start()
+    yield path
+    await runner.cleanup()
+
+
+async def test_connect_unix_socket(unix_socket: str) -> None:
+    """Test the client connects over a unix socket with a unix:// url."""
+    async with ClientSession() as session:
+        connection = MatterClientConnection(f"unix://{unix_socket}", session)
+        await connection.connect()
+        assert connection.connected
+        assert connection.server_info == SERVER_INFO
+        # the connection owns the session (with the unix connector)
+        assert connection._unix_session is not None
+        await connection.disconnect()
+        assert not connection.connected
+        assert connection._unix_session is None
+
+
+async def test_connect_unix_socket_missing(tmp_path: Path) -> None:
+    """Test connecting to a missing unix socket fails (and cleans up)."""
+    async with ClientSession() as session:
+        connection = MatterClientConnection(f"unix://{tmp_path}/missing.sock", session)
+        with pytest.raises(CannotConnect):
+            await connection.connect()
+        assert connection._unix_session is None
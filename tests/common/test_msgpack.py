@@ -0,0 +1,42 @@
+"""Test the MessagePack helpers."""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from matter_server.common.helpers.msgpack import (
+    msgpack_array,
+    msgpack_dumps,
+    msgpack_loads,
+)
+from matter_server.common.models import EventMessage, EventType, MatterNodeData
+
+pytest.importorskip("msgpack")
+
+
+def test_msgpack() -> None:
+    """Test messages are (de)serialized with native bytes values."""
+    now = datetime(2024, 1, 1, tzinfo=UTC)
+    node = MatterNodeData(
+        node_id=1,
+        date_commissioned=now,
+        last_interview=now,
+        interview_version=6,
+        attributes={"0/62/0": b"\x01\x02", "1/6/0": True},
+    )
+    assert msgpack_loads(msgpack_dumps(node)) == {
+        "node_id": 1,
+        "date_commissioned": now.isoformat(),
+        "last_interview": now.isoformat(),
+        "interview_version": 6,
+        "available": False,
+        "is_bridge": False,
+        "attributes": {"0/62/0": b"\x01\x02", "1/6/0": True},
+        "attribute_subscriptions": [],
+    }
+    messages = [
+        EventMessage(event=EventType.NODE_REMOVED, data=index) for index in range(20)
+    ]
+    assert msgpack_loads(msgpack_array([msgpack_dumps(x) for x in messages])) == [
+        {"event": "node_removed", "data": index} for index in range(20)
+    ]
@@ -0,0 +1 @@
+"""Test the relay."""
@@ -0,0 +1,312 @@
+"""Test the relay of the websocket API."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import unused_port
+import pytest
+
+from matter_server.client.client import MatterClient
+from matter_server.common.const import SCHEMA_VERSION
+from matter_server.common.errors import InvalidCommand, UpstreamNotConnected
+from matter_server.common.helpers.json import json_dumps, json_loads
+from matter_server.common.models import (
+    APICommand,
+    ErrorResultMessage,
+    EventMessage,
+    EventType,
+    MatterNodeData,
+    ServerInfoMessage,
+    SuccessResultMessage,
+)
+from matter_server.relay import relay as relay_module
+from matter_server.relay.relay import MatterRelay
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+    from pytest_aiohttp import AiohttpServer
+
+SERVER_INFO = ServerInfoMessage(
+    fabric_id=1,
+    compressed_fabric_id=1234,
+    schema_version=SCHEMA_VERSION,
+    min_supported_schema_version=SCHEMA_VERSION,
+    sdk_version="test",
+    wifi_credentials_set=False,
+    thread_credentials_set=False,
+    bluetooth_enabled=False,
+)
+
+
+def create_node(node_id: int) -> MatterNodeData:
+    """Create the data of a node."""
+    return MatterNodeData(
+        node_id=node_id,
+        date_commissioned=datetime.now(UTC),
+        last_interview=datetime.now(UTC),
+        interview_version=6,
+        available=True,
+        attributes={"0/40/5": f"Node {node_id}", "1/6/0": False},
+    )
+
+
+class Upstream:
+    """Minimal upstream Matter server, answering ping_node and start_listening."""
+
+    def __init__(self) -> None:
+        """Initialize the upstream server."""
+        self.nodes = {node_id: create_node(node_id) for node_id in (1, 2)}
+        self.app = web.Application()
+        self.app.router.add_route("GET", "/ws", self.handle_ws)
+        self.app.router.add_route("*", "/echo", self.handle_echo)
+        self.app.router.add_route("GET", "/stream", self.handle_stream)
+        self.sockets: set[web.WebSocketResponse] = set()
+        self.connected = asyncio.Event()
+        self.available = True
+        self.refused = asyncio.Event()
+        # commands received (except start_listening)
+        self.commands: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        # the end of the streamed HTTP response is sent once released
+        self.stream_release = asyncio.Event()
+
+    async def handle_ws(self, request: web.Request) -> web.WebSocketResponse:
+        """Handle a websocket connection (of the relay)."""
+        if not self.available:
+            self.refused.set()
+            raise web.HTTPServiceUnavailable
+        wsock = web.WebSocketResponse()
+        await wsock.prepare(request)
+        self.sockets.add(wsock)
+        await wsock.send_str(json_dumps(SERVER_INFO))
+        async for msg in wsock:
+            command = json_loads(msg.data)
+            if command["command"] == APICommand.START_LISTENING:
+                await wsock.send_str(
+                    json_dumps(
+                        SuccessResultMessage(
+                            command["message_id"], list(self.nodes.values())
+                        )
+                    )
+                )
+                self.connected.set()
+                continue
+            await self.commands.put(command)
+            if command["command"] == APICommand.PING_NODE:
+                await wsock.send_str(
+                    json_dumps(
+                        SuccessResultMessage(command["message_id"], {"fd00::1": True})
+                    )
+                )
+            elif command["command"] != APICommand.INTERVIEW_NODE:
+                # interview_node is left unanswered (as a long running command)
+                await wsock.send_str(
+                    json_dumps(
+                        ErrorResultMessage(
+                            command["message_id"],
+                            InvalidCommand.error_code,
+                            "Invalid command",
+                        )
+                    )
+                )
+        self.sockets.discard(wsock)
+        return wsock
+
+    async def handle_echo(self, request: web.Request) -> web.Response:
+        """Echo the method, (custom) headers and body of a request."""
+        return web.json_response(
+            {
+                "method": request.method,
+                "query": dict(request.query),
+                "test_header": request.headers.get("X-Test"),
+                "hop_by_hop": request.headers.get("X-Hop"),
+                "body": (await request.text()) if request.body_exists else None,
+            },
+            status=201,
+            headers={"X-Upstream": "upstream", "Connection": "X-Hop", "X-Hop": "1"},
+        )
+
+    async def handle_stream(self, request: web.Request) -> web.StreamResponse:
+        """Send a (chunked) body of which the end waits for the relay's client."""
+        response = web.StreamResponse()
+        await response.prepare(request)
+        await response.write(b"first,")
+        await self.stream_release.wait()
+        await response.write(b"last")
+        await response.write_eof()
+        return response
+
+    async def send_event(self, event: EventType, data: Any) -> None:
+        """Send an event to the connected relay."""
+        for wsock in self.sockets:
+            await wsock.send_str(json_dumps(EventMessage(event=event, data=data)))
+
+    async def disconnect(self) -> None:
+        """Close the connection(s) of the relay."""
+        self.connected.clear()
+        for wsock in list(self.sockets):
+            await wsock.close()
+
+
+@pytest.fixture(name="upstream")
+async def upstream_fixture(
+    aiohttp_server: AiohttpServer,
+) -> AsyncGenerator[tuple[Upstream, str], None]:
+    """Yield the upstream server and its websocket url."""
+    upstream = Upstream()
+    server = await aiohttp_server(upstream.app)
+    yield upstream, f"ws://{server.host}:{server.port}/ws"
+    await upstream.disconnect()
+
+
+@pytest.fixture(name="relay")
+async def relay_fixture(
+    upstream: tuple[Upstream, str], monkeypatch: pytest.MonkeyPatch
+) -> AsyncGenerator[MatterRelay, None]:
+    """Yield a relay connected to the upstream server."""
+    monkeypatch.setattr(relay_module, "RECONNECT_DELAY_MIN", 0.01)
+    relay = MatterRelay(upstream[1], unused_port(), ["127.0.0.1"])
+    await relay.start()
+    yield relay
+    await relay.stop()
+
+
+@pytest.fixture(name="client")
+async def client_fixture(
+    relay: MatterRelay,
+) -> AsyncGenerator[tuple[MatterClient, asyncio.Queue[tuple[EventType, Any]]], None]:
+    """Yield a (listening) client of the relay and a queue of its events."""
+    events: asyncio.Queue[tuple[EventType, Any]] = asyncio.Queue()
+    async with ClientSession() as session:
+        client = MatterClient(f"ws://127.0.0.1:{relay.port}/ws", session)
+        client.subscribe_events(lambda evt, data: events.put_nowait((evt, data)))
+        init_ready = asyncio.Event()
+        listen_task = asyncio.create_task(client.start_listening(init_ready))
+        await init_ready.wait()
+        yield client, events
+        await client.disconnect()
+        await listen_task
+
+
+async def test_relay_mirror(
+    upstream: tuple[Upstream, str],
+    relay: MatterRelay,
+    client: tuple[MatterClient, asyncio.Queue[tuple[EventType, Any]]],
+) -> None:
+    """Test the relay mirrors the nodes and forwards the events."""
+    matter_client, events = client
+    assert [node.node_id for node in matter_client.get_nodes()] == [1, 2]
+    assert matter_client.server_info == SERVER_INFO
+
+    await upstream[0].send_event(EventType.ATTRIBUTE_UPDATED, [1, "1/6/0", True])
+    assert await events.get() == (EventType.ATTRIBUTE_UPDATED, True)
+    assert matter_client.get_node(1).get_attribute_value(1, 6, 0) is True
+    # the mirrored node data is served to (new) clients
+    assert relay.get_nodes()[0].attributes["1/6/0"] is True
+    node = await matter_client.send_command(APICommand.GET_NODE, node_id=1)
+    assert node["attributes"]["1/6/0"] is True
+
+    await upstream[0].send_event(
+        EventType.ENDPOINT_REMOVED, {"node_id": 1, "endpoint_id": 1}
+    )
+    assert (await events.get())[0] == EventType.ENDPOINT_REMOVED
+    assert "1/6/0" not in relay.get_nodes()[0].attributes
+
+    # commands answered by the relay are not forwarded
+    assert upstream[0].commands.empty()
+
+
+async def test_relay_forward(
+    upstream: tuple[Upstream, str],
+    relay: MatterRelay,
+    client: tuple[MatterClient, asyncio.Queue[tuple[EventType, Any]]],
+) -> None:
+    """Test the relay forwards the other commands (and their errors) upstream."""
+    matter_client = client[0]
+    assert await matter_client.ping_node(1) == {"fd00::1": True}
+    command = await upstream[0].commands.get()
+    assert command["command"] == APICommand.PING_NODE
+    assert command["args"] == {"node_id": 1}
+
+    with pytest.raises(InvalidCommand):
+        await matter_client.send_command("unknown_command")
+
+    # a pending command fails (instead of hanging) when the upstream connection
+    # is lost
+    interview = asyncio.create_task(matter_client.interview_node(1))
+    await upstream[0].commands.get()
+    await upstream[0].disconnect()
+    with pytest.raises(UpstreamNotConnected):
+        await asyncio.wait_for(interview, 5)
+
+    # commands fail while the relay is not connected upstream
+    await asyncio.wait_for(upstream[0].connected.wait(), 5)
+    upstream[0].available = False
+    await upstream[0].disconnect()
+    await asyncio.wait_for(upstream[0].refused.wait(), 5)
+    assert not relay.client.connection.connected
+    with pytest.raises(UpstreamNotConnected):
+        await asyncio.wait_for(matter_client.ping_node(1), 5)
+    assert upstream[0].commands.empty()
+
+
+async def test_relay_resync(
+    upstream: tuple[Upstream, str],
+    relay: MatterRelay,
+    client: tuple[MatterClient, asyncio.Queue[tuple[EventType, Any]]],
+) -> None:
+    """Test the relay signals the changed nodes after reconnecting upstream."""
+    matter_client, events = client
+    upstream[0].nodes.pop(2)
+    upstream[0].nodes[3] = create_node(3)
+    upstream[0].nodes[1].attributes["1/6/0"] = True
+    await upstream[0].disconnect()
+    await asyncio.wait_for(upstream[0].connected.wait(), 5)
+    received = [await asyncio.wait_for(events.get(), 5) for _ in range(3)]
+    assert [evt for evt, _ in received] == [
+        EventType.NODE_REMOVED,
+        EventType.NODE_UPDATED,
+        EventType.NODE_ADDED,
+    ]
+    assert received[0][1] == 2
+    assert [node.node_id for node in matter_client.get_nodes()] == [1, 3]
+    assert matter_client.get_node(1).get_attribute_value(1, 6, 0) is True
+    assert [node.node_id for node in relay.get_nodes()] == [1, 3]
+
+
+async def test_relay_http(upstream: tuple[Upstream, str], relay: MatterRelay) -> None:
+    """Test the relay forwards HTTP requests (of any method) upstream."""
+    async with ClientSession() as session:
+        async with session.post(
+            f"http://127.0.0.1:{relay.port}/echo?key=value",
+            data=b"payload",
+            headers={"X-Test": "test", "Connection": "X-Hop", "X-Hop": "1"},
+        ) as resp:
+            assert resp.status == 201
+            assert resp.headers["X-Upstream"] == "upstream"
+            assert "X-Hop" not in resp.headers
+            assert await resp.json() == {
+                "method": "POST",
+                "query": {"key": "value"},
+                "test_header": "test",
+                "hop_by_hop": None,
+                "body": "payload",
+            }
+        async with session.delete(f"http://127.0.0.1:{relay.port}/echo") as resp:
+            assert resp.status == 201
+            assert (await resp.json())["method"] == "DELETE"
+            assert (await resp.json())["body"] is None
+
+        # the response is streamed (instead of buffered) to the client
+        async with session.get(f"http://127.0.0.1:{relay.port}/stream") as resp:
+            assert resp.status == 200
+            assert await resp.content.readexactly(6) == b"first,"
+            upstream[0].stream_release.set()
+            assert await resp.read() == b"last"
+
+        async with session.get(f"http://127.0.0.1:{relay.port}/missing") as resp:
+            assert resp.status == 404
@@ -0,0 +1,46 @@
+"""Test the global admission control of interactions."""
+
+import asyncio
+
+import pytest
+
+from matter_server.common.errors import ServerBusy
+from matter_server.common.models import NetworkType
+from matter_server.server.helpers.admission import AdmissionController
+from matter_server.server.helpers.interaction_queue import InteractionPriority
+
+
+async def test_admission_budget() -> None:
+    """Test interactions beyond the budget of a network type wait for admission."""
+    admission = AdmissionController({NetworkType.THREAD: 2}, max_queued=1)
+    release = asyncio.Event()
+
+    async def interact(network_type: NetworkType) -> None:
+        async with admission.admit(network_type, InteractionPriority.READ):
+            await release.wait()
+
+    tasks = [asyncio.create_task(interact(NetworkType.THREAD)) for _ in range(3)]
+    # other network types have their own budget
+    tasks.append(asyncio.create_task(interact(NetworkType.WIFI)))
+    await asyncio.sleep(0)
+    metrics = admission.get_metrics()
+    assert metrics["thread"].in_flight == 2
+    assert metrics["thread"].queued == 1
+    assert metrics["wifi"].in_flight == 1
+
+    with pytest.raises(ServerBusy):
+        await interact(NetworkType.THREAD)
+    assert admission.get_metrics()["thread"].rejected == 1
+
+    release.set()
+    await asyncio.gather(*tasks)
+    metrics = admission.get_metrics()
+    assert metrics["thread"].in_flight == 0
+    assert metrics["thread"].admitted == 3
+    assert metrics["thread"].wait_time_max >= 0
+
+
+def test_admission_invalid_budget() -> None:
+    """Test a budget of less than one interaction is refused."""
+    with pytest.raises(ValueError, match="at least 1"):
+        AdmissionController({NetworkType.WIFI: 0})
@@ -0,0 +1,58 @@
+"""Test the rolling attribute aggregates."""
+
+from matter_server.common.models import AttributeAggregate
+from matter_server.server.helpers.aggregates import AttributeAggregator, RollingWindow
+
+
+def test_rolling_window() -> None:
+    """Test the min/max/(time weighted) mean of the values within the window."""
+    window = RollingWindow(60)
+    for timestamp, value in ((0, 5), (10, 1), (20, 9), (70, 3)):
+        window.add(timestamp, value)
+    # the value at 0 is out of the window, the value at 10 holds until 20
+    assert window.get_aggregate(75, 3) == AttributeAggregate(
+        window=60, count=2, min=1, max=9, mean=(1 * 5 + 9 * 50 + 3 * 5) / 60, last=3
+    )
+    # the last value holds over the full window
+    assert window.get_aggregate(200, 3) == AttributeAggregate(
+        window=60, count=0, min=3, max=3, mean=3, last=3
+    )
+
+
+def test_rolling_window_time_weighted() -> None:
+    """Test a burst of reports does not bias the mean."""
+    window = RollingWindow(100)
+    window.add(0, 10)
+    for timestamp in range(90, 100):
+        window.add(timestamp, 0)
+    aggregate = window.get_aggregate(100, 0)
+    assert aggregate.count == 11
+    assert aggregate.mean == 9
+    assert (aggregate.min, aggregate.max) == (0, 10)
+
+
+def test_rolling_window_max_values() -> None:
+    """Test the number of values kept is capped."""
+    window = RollingWindow(3600, max_values=3)
+    for timestamp, value in ((0, 100), (10, 2), (20, 4), (30, 6)):
+        window.add(timestamp, value)
+    assert window.get_aggregate(40, 6) == AttributeAggregate(
+        window=3600, count=3, min=2, max=6, mean=(2 * 10 + 4 * 10 + 6 * 10) / 30, last=6
+    )
+
+
+def test_attribute_aggregator() -> None:
+    """Test only the numeric values of the matching attribute paths are aggregated."""
+    aggregator = AttributeAggregator(["*/144/*"], [60, 3600])
+    assert aggregator.record(1, "1/144/8", 100, 0)
+    assert aggregator.record(1, "1/144/8", 200, 100)
+    assert not aggregator.record(1, "1/144/9", True, 100)
+    assert not aggregator.record(1, "1/6/0", 1, 100)
+    aggregates = aggregator.get_aggregates(1, ["1/144/*"], 130)
+    assert list(aggregates) == ["1/144/8"]
+    assert [(x.window, x.count, x.mean) for x in aggregates["1/144/8"]] == [
+        (60, 1, 150),
+        (3600, 2, (100 * 100 + 200 * 30) / 130),
+    ]
+    aggregator.remove_node(1)
+    assert aggregator.get_aggregates(1, ["*/*/*"], 100) == {}
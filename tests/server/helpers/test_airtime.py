@@ -0,0 +1,41 @@
+"""Test the token-bucket airtime throttling."""
+
+import asyncio
+import time
+
+from matter_server.server.helpers.airtime import ThreadAirtimeThrottle, TokenBucket
+
+
+async def test_token_bucket_throttles() -> None:
+    """Test acquiring tokens waits once the bucket is empty."""
+    bucket = TokenBucket(rate=50, capacity=2)
+    start = time.monotonic()
+    for _ in range(3):
+        await bucket.acquire()
+    # the third token is only available after 1/50th of a second
+    assert time.monotonic() - start >= 0.015
+    metrics = bucket.get_metrics()
+    assert metrics.acquired == 3
+    assert metrics.throttled == 1
+
+
+async def test_token_bucket_charge_preempts() -> None:
+    """Test charged (interactive) traffic delays waiting background traffic."""
+    bucket = TokenBucket(rate=50, capacity=1)
+    bucket.charge()
+    bucket.charge()
+    assert bucket.tokens < 0
+    waiter = asyncio.create_task(bucket.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    assert bucket.get_metrics().waiting == 1
+    await waiter
+    assert bucket.get_metrics().charged == 2
+
+
+def test_thread_airtime_buckets() -> None:
+    """Test each Thread network gets its own bucket."""
+    throttle = ThreadAirtimeThrottle()
+    assert throttle.get_bucket(0x1234) is throttle.get_bucket(0x1234)
+    assert throttle.get_bucket(0x1234) is not throttle.get_bucket(None)
+    assert set(throttle.get_metrics()) == {"0000000000001234", "unknown"}
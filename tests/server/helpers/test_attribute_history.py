@@ -0,0 +1,33 @@
+"""Test the in-memory attribute history."""
+
+from matter_server.server.helpers.attribute_history import (
+    AttributeHistory,
+    AttributeRingBuffer,
+)
+
+
+def test_ring_buffer() -> None:
+    """Test the ring buffer keeps the most recent samples (with their timestamps)."""
+    buffer = AttributeRingBuffer(3)
+    for second, value in enumerate((10, 11, None, 13)):
+        buffer.append(1000 + second * 1.5, value)
+    assert len(buffer) == 3
+    assert buffer.get_samples() == [(1001.5, 11), (1003.0, None), (1004.5, 13)]
+    assert buffer.get_samples(start=1002, end=1004) == [(1003.0, None)]
+
+
+def test_attribute_history() -> None:
+    """Test only the numeric attributes of the opted-in clusters are recorded."""
+    history = AttributeHistory({1026}, capacity=10, max_buffers=2)
+    assert history.record(1, "1/1026/0", 2150, 1000)
+    assert history.record(1, "1/1026/0", 2160, 1010)
+    assert not history.record(1, "1/6/0", True, 1000)
+    assert not history.record(1, "1/1026/1", [1, 2], 1000)
+    assert history.record(2, "1/1026/0", 1800, 1000)
+    # the max number of buffers is reached
+    assert not history.record(2, "2/1026/0", 1800, 1000)
+    assert history.get_history(1, ["*/1026/*"]) == {
+        "1/1026/0": [(1000, 2150), (1010, 2160)]
+    }
+    history.remove_node(2)
+    assert history.record(2, "2/1026/0", 1800, 1000)
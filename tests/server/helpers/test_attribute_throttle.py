@@ -0,0 +1,48 @@
+"""Test the throttling and deadband filtering of attribute updates."""
+
+import asyncio
+from typing import Any
+
+from matter_server.server.helpers.attribute_throttle import (
+    AttributeThrottle,
+    AttributeThrottleRule,
+)
+
+
+async def test_throttle_window_flushes_latest_value() -> None:
+    """Test updates within the window are held back and the latest is flushed."""
+    flushed: list[tuple[int, str, Any]] = []
+    throttle = AttributeThrottle(
+        [AttributeThrottleRule("*/144/*", window=0.05)],
+        lambda *args: flushed.append(args),
+    )
+    # paths without a matching rule are never throttled
+    assert throttle.process(1, "1/6/0", True)
+    assert throttle.process(1, "1/6/0", False)
+
+    assert throttle.process(1, "1/144/8", 100)
+    assert not throttle.process(1, "1/144/8", 101)
+    assert not throttle.process(1, "1/144/8", 102)
+    # other nodes have their own window
+    assert throttle.process(2, "1/144/8", 100)
+    await asyncio.sleep(0.1)
+    assert flushed == [(1, "1/144/8", 102)]
+    assert throttle.process(1, "1/144/8", 103)
+    throttle.stop()
+
+
+async def test_deadband() -> None:
+    """Test updates of numeric values within the deadband are dropped."""
+    flushed: list[tuple[int, str, Any]] = []
+    throttle = AttributeThrottle(
+        [AttributeThrottleRule("*/1024/0", deadband=10)],
+        lambda *args: flushed.append(args),
+    )
+    assert throttle.process(1, "1/1024/0", 100)
+    assert not throttle.process(1, "1/1024/0", 105)
+    assert not throttle.process(1, "1/1024/0", 91)
+    assert throttle.process(1, "1/1024/0", 110)
+    # non numeric values are not filtered
+    assert throttle.process(1, "1/1024/0", None)
+    await asyncio.sleep(0)
+    assert not flushed
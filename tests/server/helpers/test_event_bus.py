@@ -0,0 +1,78 @@
+"""Test the server event bus."""
+
+import asyncio
+from typing import Any
+
+from matter_server.common.models import EventType
+from matter_server.server.helpers.event_bus import EventBus
+
+
+async def test_event_bus() -> None:
+    """Test events are only dispatched to the interested subscribers."""
+    event_bus = EventBus()
+    all_events: list[tuple[EventType, Any]] = []
+    node_events: list[tuple[EventType, Any]] = []
+    async_events: list[tuple[EventType, Any]] = []
+
+    async def async_callback(evt: EventType, data: Any) -> None:
+        async_events.append((evt, data))
+
+    unsub_all = event_bus.subscribe(lambda *args: all_events.append(args))
+    event_bus.subscribe(
+        lambda *args: node_events.append(args),
+        [EventType.NODE_ADDED, EventType.NODE_REMOVED],
+    )
+    event_bus.subscribe(async_callback, [EventType.NODE_REMOVED])
+    event_bus.publish(EventType.ATTRIBUTE_UPDATED, (1, "1/6/0", True))
+    event_bus.publish(EventType.ATTRIBUTE_UPDATED, (2, "1/6/0", True))
+    event_bus.publish(EventType.NODE_REMOVED, 2)
+    # events are dispatched in a batch from the event loop
+    assert not all_events
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert len(all_events) == 3
+    assert node_events == [(EventType.NODE_REMOVED, 2)]
+    assert async_events == [(EventType.NODE_REMOVED, 2)]
+
+    unsub_all()
+    event_bus.publish(EventType.SERVER_SHUTDOWN)
+    assert not event_bus.has_subscribers(EventType.SERVER_SHUTDOWN)
+    await asyncio.sleep(0)
+    assert len(all_events) == 3
+
+
+async def test_event_bus_subscribed_twice() -> None:
+    """Test a callback subscribed more than once is called once per event."""
+    event_bus = EventBus()
+    events: list[tuple[EventType, Any]] = []
+
+    def callback(evt: EventType, data: Any) -> None:
+        events.append((evt, data))
+
+    event_bus.subscribe(callback)
+    event_bus.subscribe(callback)
+    unsub = event_bus.subscribe(callback, [EventType.NODE_REMOVED])
+    event_bus.publish(EventType.NODE_REMOVED, 2)
+    event_bus.publish(EventType.NODE_ADDED, 3)
+    await asyncio.sleep(0)
+    assert events == [(EventType.NODE_REMOVED, 2), (EventType.NODE_ADDED, 3)]
+    unsub()
+    event_bus.publish(EventType.NODE_REMOVED, 4)
+    await asyncio.sleep(0)
+    assert events[-1] == (EventType.NODE_REMOVED, 4)
+    assert len(events) == 3
+
+
+def test_event_bus_publish_outside_loop() -> None:
+    """Test events can be published from outside the (running) loop of the bus."""
+    loop = asyncio.new_event_loop()
+    try:
+        event_bus = EventBus(loop)
+        events: list[tuple[EventType, Any]] = []
+        event_bus.subscribe(lambda *args: events.append(args))
+        event_bus.publish(EventType.NODE_REMOVED, 2)
+        assert not events
+        loop.run_until_complete(asyncio.sleep(0))
+        assert events == [(EventType.NODE_REMOVED, 2)]
+    finally:
+        loop.close()
@@ -0,0 +1,127 @@
+"""Test the persistent node event log."""
+
+import asyncio
+from pathlib import Path
+
+from matter_server.common.models import MatterNodeEvent
+from matter_server.server.helpers.event_log import NodeEventLog
+
+
+def _create_event(
+    node_id: int, event_number: int, event_id: int = 1, timestamp: int | None = None
+) -> MatterNodeEvent:
+    """Create a (switch) event for testing."""
+    return MatterNodeEvent(
+        node_id=node_id,
+        endpoint_id=1,
+        cluster_id=59,
+        event_id=event_id,
+        event_number=event_number,
+        priority=1,
+        timestamp=1000 + event_number if timestamp is None else timestamp,
+        timestamp_type=0,
+        data={"newPosition": 1},
+    )
+
+
+async def test_event_log_query() -> None:
+    """Test the events can be filtered and paginated."""
+    event_log = NodeEventLog(max_events=5)
+    for event_number in range(1, 5):
+        event_log.append(_create_event(1, event_number, event_id=event_number % 2))
+    event_log.append(_create_event(2, 1))
+    event_log.append(_create_event(2, 2))
+    # the oldest event is dropped
+    assert len(event_log) == 5
+
+    page = event_log.query(node_id=1, limit=2)
+    assert [x.event_number for x in page.events] == [2, 3]
+    assert page.more
+    page = event_log.query(node_id=1, cursor=page.cursor, limit=2)
+    assert [x.event_number for x in page.events] == [4]
+    assert not page.more
+    page = event_log.query(node_id=1, since_event_number=3, limit=2)
+    assert [x.event_number for x in page.events] == [4]
+    assert not page.more
+    page = event_log.query(node_id=1, cluster_id=59, event_id=1)
+    assert [x.event_number for x in page.events] == [3]
+    page = event_log.query(since_timestamp=1001)
+    assert [(x.node_id, x.event_number) for x in page.events] == [
+        (1, 2),
+        (1, 3),
+        (1, 4),
+        (2, 2),
+    ]
+    event_log.remove_node(1)
+    assert [x.node_id for x in event_log.get_latest(5)] == [2, 2]
+
+
+async def test_event_log_persistence(tmp_path: Path) -> None:
+    """Test the events are written to (and loaded from) disk."""
+    filename = tmp_path / "events.jsonl"
+    event_log = NodeEventLog(max_events=3)
+    await event_log.start(filename)
+    for event_number in range(1, 6):
+        event_log.append(_create_event(1, event_number))
+    await event_log.stop()
+
+    event_log = NodeEventLog(max_events=3)
+    await event_log.start(filename)
+    assert [x.event_number for x in event_log.get_latest(3)] == [3, 4, 5]
+    assert event_log.get_latest(1)[0].data == {"newPosition": 1}
+    await event_log.stop()
+
+
+async def test_event_log_cursor() -> None:
+    """Test paginating with the cursor does not skip (or repeat) any events."""
+    event_log = NodeEventLog(max_events=10)
+    # events of different nodes (and timestamp types) with equal timestamps
+    event_log.append(_create_event(1, 100, timestamp=5000))
+    event_log.append(_create_event(2, 1, timestamp=5000))
+    event_log.append(_create_event(1, 101, timestamp=5000))
+    event_log.append(_create_event(2, 2, timestamp=10))
+    events = []
+    page = event_log.query(limit=1)
+    events += page.events
+    while page.more:
+        page = event_log.query(cursor=page.cursor, limit=1)
+        events += page.events
+    assert [(x.node_id, x.event_number) for x in events] == [
+        (1, 100),
+        (2, 1),
+        (1, 101),
+        (2, 2),
+    ]
+    # an empty page keeps the cursor
+    assert event_log.query(cursor=page.cursor) == page.__class__(
+        events=[], more=False, cursor=page.cursor
+    )
+    event_log.append(_create_event(2, 3))
+    page = event_log.query(cursor=page.cursor)
+    assert [x.event_number for x in page.events] == [3]
+
+
+async def test_event_log_persisted_cursor(tmp_path: Path) -> None:
+    """Test the cursor remains valid after a restart and a compaction."""
+    filename = tmp_path / "events.jsonl"
+    event_log = NodeEventLog(max_events=3, flush_delay=0)
+    await event_log.start(filename)
+    for event_number in range(1, 4):
+        event_log.append(_create_event(1, event_number))
+    cursor = event_log.query(limit=2).cursor
+    # an append and a compaction (after a removal) of the file at the same time
+    # write each event once
+    append = asyncio.create_task(event_log._flush())
+    event_log.append(_create_event(2, 1))
+    event_log.remove_node(2)
+    await asyncio.gather(append, event_log._flush())
+    await event_log.stop()
+    assert len(filename.read_bytes().splitlines()) == 2
+
+    event_log = NodeEventLog(max_events=3)
+    await event_log.start(filename)
+    page = event_log.query(cursor=cursor)
+    assert [x.event_number for x in page.events] == [3]
+    event_log.append(_create_event(1, 4))
+    assert [x.event_number for x in event_log.query(cursor=page.cursor).events] == [4]
+    await event_log.stop()
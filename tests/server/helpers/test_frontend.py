@@ -0,0 +1,66 @@
+"""Test the supervision of the front-end process."""
+
+import asyncio
+import logging
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from matter_server.server.helpers import frontend as frontend_module
+from matter_server.server.helpers.frontend import FrontendProcess
+
+
+async def test_frontend_process_stop() -> None:
+    """Test the (running) front-end process is stopped."""
+    frontend = FrontendProcess([sys.executable, "-c", "import time; time.sleep(30)"])
+    await frontend.start()
+    assert frontend.pid is not None
+    await frontend.stop()
+    assert frontend.pid is None
+    assert frontend.restarts == 0
+
+
+async def test_frontend_process_crash_loop(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test the front-end process is restarted with a backoff, until it crash loops."""
+    monkeypatch.setattr(frontend_module, "FRONTEND_RESTART_DELAY_MIN", 0.01)
+    monkeypatch.setattr(frontend_module, "FRONTEND_RESTART_DELAY_MAX", 0.02)
+    monkeypatch.setattr(frontend_module, "FRONTEND_MAX_FAILURES", 4)
+    frontend = FrontendProcess([sys.executable, "-c", "raise SystemExit(1)"])
+    with caplog.at_level(logging.WARNING, frontend_module.__name__):
+        await frontend.start()
+        await asyncio.wait_for(frontend.wait(), 30)
+    assert frontend.restarts == 3
+    assert frontend.pid is None
+    assert [record.getMessage() for record in caplog.records] == [
+        "Front-end process exited (code 1), restarting in 0.01 seconds",
+        "Front-end process exited (code 1), restarting in 0.02 seconds",
+        "Front-end process exited (code 1), restarting in 0.02 seconds",
+        "Front-end process exited (code 1) 4 times in a row, not restarting it",
+    ]
+    await frontend.stop()
+
+
+async def test_frontend_process_stable(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test exits of a process which ran long enough do not count as a crash loop."""
+    monkeypatch.setattr(frontend_module, "FRONTEND_RESTART_DELAY_MIN", 0)
+    monkeypatch.setattr(frontend_module, "FRONTEND_STABLE_TIME", 0)
+    monkeypatch.setattr(frontend_module, "FRONTEND_MAX_FAILURES", 2)
+    frontend = FrontendProcess([sys.executable, "-c", "raise SystemExit(1)"])
+    restarted = asyncio.Event()
+    spawn = frontend._spawn
+
+    async def spawn_counted() -> None:
+        """Start the process, signal the restarts."""
+        await spawn()
+        if frontend.restarts >= 2:
+            restarted.set()
+
+    with patch.object(frontend, "_spawn", spawn_counted):
+        await frontend.start()
+        await asyncio.wait_for(restarted.wait(), 30)
+    assert frontend._task is not None
+    assert not frontend._task.done()
+    await frontend.stop()
@@ -0,0 +1,58 @@
+"""Test the (prioritized) node interaction queue."""
+
+import asyncio
+
+import pytest
+
+from matter_server.common.errors import NodeBusy
+from matter_server.server.helpers.interaction_queue import (
+    InteractionPriority,
+    NodeInteractionQueue,
+)
+
+
+async def test_interaction_queue_priority() -> None:
+    """Test waiting interactions are served in order of priority."""
+    queue = NodeInteractionQueue(concurrency=1)
+    order: list[str] = []
+    release = asyncio.Event()
+
+    async def interact(name: str, priority: InteractionPriority) -> None:
+        async with queue.slot(priority):
+            order.append(name)
+            if name == "first":
+                await release.wait()
+
+    first = asyncio.create_task(interact("first", InteractionPriority.BACKGROUND))
+    await asyncio.sleep(0)
+    tasks = [
+        asyncio.create_task(interact("poll", InteractionPriority.BACKGROUND)),
+        asyncio.create_task(interact("read", InteractionPriority.READ)),
+        asyncio.create_task(interact("command", InteractionPriority.COMMAND)),
+    ]
+    await asyncio.sleep(0)
+    metrics = queue.get_metrics()
+    assert metrics.in_flight == 1
+    assert metrics.queued == {"command": 1, "write": 0, "read": 1, "background": 1}
+
+    release.set()
+    await asyncio.gather(first, *tasks)
+    assert order == ["first", "command", "read", "poll"]
+    assert queue.idle
+
+
+async def test_interaction_queue_bounded() -> None:
+    """Test interactions get rejected when too many are waiting."""
+    queue = NodeInteractionQueue(concurrency=1, max_queued=1)
+    await queue.acquire(InteractionPriority.READ)
+    waiter = asyncio.create_task(queue.acquire(InteractionPriority.READ))
+    await asyncio.sleep(0)
+    with pytest.raises(NodeBusy):
+        await queue.acquire(InteractionPriority.COMMAND)
+    assert queue.get_metrics().rejected == 1
+
+    # a cancelled waiter does not get a slot
+    waiter.cancel()
+    await asyncio.sleep(0)
+    queue.release()
+    assert queue.idle
@@ -0,0 +1,31 @@
+"""Test the adaptive poll schedule."""
+
+from matter_server.server.helpers.polling import AdaptivePollSchedule
+
+
+def test_adaptive_poll_schedule() -> None:
+    """Test the poll interval backs off when stable and tightens on change."""
+    schedule = AdaptivePollSchedule(30, 300)
+    schedule.set_attributes(1, {"1/319486977/319422474"}, now=0)
+    assert schedule.next_poll() == 30
+    assert schedule.get_due(10) == {}
+    assert schedule.get_due(30) == {1: ["1/319486977/319422474"]}
+
+    # unchanged values back off up to the max interval
+    now = 30.0
+    for expected_interval in (60, 120, 240, 300, 300):
+        schedule.report(1, "1/319486977/319422474", False, now)
+        assert schedule.get_attributes(1)["1/319486977/319422474"].interval == (
+            expected_interval
+        )
+        now += expected_interval
+    # a changed value resets to the min interval
+    schedule.report(1, "1/319486977/319422474", True, now)
+    assert schedule.next_poll() == now + 30
+
+    # state is retained when the attributes are set again
+    schedule.set_attributes(1, {"1/319486977/319422474", "1/319486977/*"}, now)
+    assert schedule.next_poll() == now + 30
+    schedule.remove_node(1)
+    assert not schedule
+    assert schedule.next_poll() is None
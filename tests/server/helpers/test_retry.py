@@ -0,0 +1,37 @@
+"""Test the central retry scheduler."""
+
+import asyncio
+
+from matter_server.server.helpers.retry import RetryScheduler
+
+
+async def test_retry_backoff() -> None:
+    """Test the retry delay doubles with every failed attempt (with jitter)."""
+    scheduler = RetryScheduler(lambda _: None, base_delay=10, max_delay=30, jitter=0.1)
+    delays = [scheduler.schedule(1, "timeout") for _ in range(4)]
+    assert 9 <= delays[0] <= 11
+    assert 18 <= delays[1] <= 22
+    # bounded by the max delay
+    assert 27 <= delays[2] <= 33
+    assert 27 <= delays[3] <= 33
+    state = scheduler.get_states()[1]
+    assert state.attempts == 4
+    assert state.last_error == "timeout"
+    scheduler.cancel(1)
+    assert 1 not in scheduler
+    scheduler.stop()
+
+
+async def test_retry_wake() -> None:
+    """Test a scheduled retry can be woken early."""
+    retried: list[int] = []
+    scheduler = RetryScheduler(
+        retried.append, base_delay=60, max_delay=60, wake_delay=0.01
+    )
+    scheduler.schedule(1)
+    scheduler.schedule(2)
+    assert not scheduler.wake(3)
+    assert scheduler.wake(2)
+    await asyncio.sleep(0.05)
+    assert retried == [2]
+    scheduler.stop()
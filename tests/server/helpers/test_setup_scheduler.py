@@ -0,0 +1,55 @@
+"""Test the (prioritized) node setup scheduler."""
+
+import asyncio
+
+from matter_server.common.models import NodeSetupProgress
+from matter_server.server.helpers.setup_scheduler import (
+    NodeSetupScheduler,
+    SetupPriority,
+)
+
+
+async def test_setup_scheduler_priority() -> None:
+    """Test waiting setups are served in order of priority and progress is signaled."""
+    progress: list[NodeSetupProgress] = []
+    scheduler = NodeSetupScheduler(progress.append, initial_concurrency=1)
+    order: list[str] = []
+    release = asyncio.Event()
+
+    async def setup(name: str, priority: SetupPriority) -> None:
+        async with scheduler.slot(priority):
+            order.append(name)
+            if name == "first":
+                await release.wait()
+
+    first = asyncio.create_task(setup("first", SetupPriority.END_DEVICE))
+    await asyncio.sleep(0)
+    tasks = [
+        asyncio.create_task(setup("sleepy", SetupPriority.SLEEPY_END_DEVICE)),
+        asyncio.create_task(setup("end_device", SetupPriority.END_DEVICE)),
+        asyncio.create_task(setup("router", SetupPriority.ROUTER)),
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.get_progress().pending == 3
+
+    release.set()
+    await asyncio.gather(first, *tasks)
+    assert order == ["first", "router", "end_device", "sleepy"]
+    assert progress[-1] == NodeSetupProgress(
+        total=4, completed=4, failed=0, in_progress=0, pending=0, concurrency=1
+    )
+
+
+def test_setup_scheduler_adaptive_concurrency() -> None:
+    """Test the concurrency adapts to the reported setup latency."""
+    scheduler = NodeSetupScheduler(
+        initial_concurrency=4, max_concurrency=5, target_latency=10
+    )
+    for _ in range(5):
+        scheduler.report_latency(1)
+    assert scheduler.concurrency == 5
+    scheduler.report_latency(30)
+    assert scheduler.concurrency == 2
+    # decrease only once per target latency period
+    scheduler.report_latency(30)
+    assert scheduler.concurrency == 2
@@ -0,0 +1,31 @@
+"""Test the resubscription storm detection."""
+
+import time
+
+from matter_server.server.helpers.storm import ResubscriptionStormGuard
+
+
+async def test_storm_detection_and_pacing() -> None:
+    """Test a storm is detected when many nodes fail and resubscriptions get paced."""
+    guard = ResubscriptionStormGuard(
+        threshold=3, window=30, rate=100, jitter=0, hold=60
+    )
+    # repeated failures of the same node do not count as a storm
+    assert not guard.record_failure(1)
+    assert not guard.record_failure(1)
+    assert not guard.record_failure(2)
+    start = time.monotonic()
+    await guard.pace()
+    assert guard.get_metrics().paced == 0
+
+    assert guard.record_failure(3)
+    metrics = guard.get_metrics()
+    assert metrics.active
+    assert metrics.failing_nodes == 3
+    assert metrics.storms == 1
+
+    # paced to 100 resubscriptions per second
+    for _ in range(3):
+        await guard.pace()
+    assert time.monotonic() - start >= 0.015
+    assert guard.get_metrics().paced == 3
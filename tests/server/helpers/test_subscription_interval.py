@@ -0,0 +1,41 @@
+"""Test the adaptive subscription interval selection."""
+
+from matter_server.server.helpers.subscription_interval import (
+    NodeSubscriptionStats,
+    SubscriptionIntervalTuner,
+)
+
+DAY = 24 * 3600
+
+
+def test_stable_node_gets_longer_ceiling() -> None:
+    """Test the ceiling of a stable (quiet) node grows up to the max."""
+    tuner = SubscriptionIntervalTuner(min_ceiling=30, max_ceiling=300)
+    assert tuner.choose_ceiling(1, 60, now=0) == 60
+    assert tuner.choose_ceiling(1, 60, now=DAY) == 120
+    assert tuner.choose_ceiling(1, 60, now=DAY + 1) == 240
+    assert tuner.choose_ceiling(1, 60, now=DAY + 2) == 300
+
+
+def test_busy_node_keeps_default_ceiling() -> None:
+    """Test a node which reports more often than the ceiling keeps the default."""
+    tuner = SubscriptionIntervalTuner(min_ceiling=30, max_ceiling=300)
+    tuner.choose_ceiling(1, 60, now=0)
+    for second in range(0, 7200, 10):
+        tuner.record_report(1, second)
+    assert tuner.get_stats(1).reports_per_hour > 60
+    assert tuner.choose_ceiling(1, 60, now=DAY) == 60
+
+
+def test_flaky_node_gets_shorter_ceiling() -> None:
+    """Test a node with several recent failures gets a shorter ceiling."""
+    tuner = SubscriptionIntervalTuner(min_ceiling=30, max_ceiling=300)
+    tuner.set_stats(1, NodeSubscriptionStats(ceiling=240))
+    for now in (100, 200, 300):
+        tuner.record_failure(1, now)
+    assert tuner.choose_ceiling(1, 60, now=400) == 30
+    # ICD nodes never get a ceiling below their idle mode duration
+    assert tuner.choose_ceiling(1, 60, now=500, icd_idle_mode_duration=120) == 120
+    # failures older than a day are forgotten
+    assert tuner.choose_ceiling(1, 60, now=DAY + 250) == 60
+    assert tuner.get_stats(1).failures == [300]
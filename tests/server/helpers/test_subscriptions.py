@@ -0,0 +1,109 @@
+"""Test the selection of the attribute paths to subscribe to."""
+
+from datetime import datetime
+
+from chip.clusters import Objects as Clusters
+
+from matter_server.common.models import MatterNodeData
+from matter_server.server.helpers.subscriptions import (
+    SubscriptionTier,
+    get_subscription_paths,
+    get_tiered_subscription_paths,
+)
+
+NODE_ATTRIBUTES = {
+    "0/29/0": [],
+    "0/40/1": "Vendor",
+    "0/51/0": [],
+    "0/53/7": [],
+    "1/6/0": True,
+}
+
+
+def _create_node(**kwargs) -> MatterNodeData:
+    """Create a (minimal) node for testing."""
+    return MatterNodeData(
+        node_id=1,
+        date_commissioned=datetime(2024, 1, 1),
+        last_interview=datetime(2024, 1, 1),
+        interview_version=6,
+        attributes=NODE_ATTRIBUTES,
+        **kwargs,
+    )
+
+
+def test_wildcard_without_exclusions() -> None:
+    """Test a node without attribute subscriptions and exclusions uses a wildcard."""
+    assert get_subscription_paths(_create_node(), set(), 16) is None
+    # excluding clusters the node does not have does not change anything
+    assert get_subscription_paths(_create_node(), {0x0300}, 16) is None
+
+
+def test_excluded_clusters() -> None:
+    """Test excluded clusters are left out of the subscription."""
+    paths = get_subscription_paths(_create_node(), {51, 53, 29}, 16)
+    assert paths is not None
+    assert set(paths) == {
+        (Clusters.Descriptor,),
+        (Clusters.BasicInformation,),
+        (Clusters.OnOff,),
+    }
+    # too many paths results in a wildcard subscription
+    assert get_subscription_paths(_create_node(), {51, 53}, 2) is None
+
+
+def test_attribute_subscriptions() -> None:
+    """Test the attribute subscriptions of a node are used if set."""
+    node = _create_node(attribute_subscriptions={(1, 6, 0), (None, 8, None)})
+    paths = get_subscription_paths(node, set(), 16)
+    assert paths is not None
+    assert set(paths) == {
+        (Clusters.Descriptor,),
+        (Clusters.BasicInformation,),
+        (1, Clusters.OnOff.Attributes.OnOff),
+        (Clusters.LevelControl,),
+    }
+
+
+def test_tiered_subscriptions() -> None:
+    """Test the slow clusters are split off into the slow subscription."""
+    paths = get_tiered_subscription_paths(_create_node(), {51}, 16)
+    assert paths is not None
+    assert set(paths[SubscriptionTier.FAST]) == {
+        (Clusters.Descriptor,),
+        (Clusters.BasicInformation,),
+        (Clusters.OnOff,),
+    }
+    # the root endpoint has an excluded cluster, so its clusters are listed
+    assert paths[SubscriptionTier.SLOW] == [(0, Clusters.ThreadNetworkDiagnostics)]
+    # no slow clusters results in a single subscription
+    assert get_tiered_subscription_paths(_create_node(), {51, 53}, 16) is None
+
+
+def test_tiered_subscriptions_typical_node() -> None:
+    """Test the tiers of a typical (extended color) light fit within the limit."""
+    root_clusters = (29, 31, 40, 42, 43, 44, 48, 49, 51, 52, 53, 60, 62, 63, 64, 65)
+    attributes = {f"0/{cluster_id}/65533": 1 for cluster_id in root_clusters}
+    attributes.update(
+        {f"1/{cluster_id}/65533": 1 for cluster_id in (3, 4, 6, 8, 29, 768, 1026)}
+    )
+    node = _create_node()
+    node.attributes = attributes
+    paths = get_tiered_subscription_paths(node, set(), 16)
+    assert paths is not None
+    assert set(paths[SubscriptionTier.FAST]) == {
+        (Clusters.Descriptor,),
+        (Clusters.BasicInformation,),
+        (Clusters.OtaSoftwareUpdateRequestor,),
+        (Clusters.Identify,),
+        (Clusters.Groups,),
+        (Clusters.OnOff,),
+        (Clusters.LevelControl,),
+        (Clusters.ColorControl,),
+    }
+    # the configuration and diagnostics clusters of the root endpoint are a
+    # single (endpoint wildcard) path
+    assert set(paths[SubscriptionTier.SLOW]) == {
+        (0,),
+        (Clusters.TemperatureMeasurement,),
+    }
@@ -0,0 +1,112 @@
+"""Test the prioritized queue of messages written to websocket clients."""
+
+import asyncio
+
+import pytest
+
+from matter_server.common.models import EventType
+from matter_server.server.helpers.write_lanes import (
+    BARRIER_EVENTS,
+    WriteLane,
+    WriteLaneQueue,
+    get_event_lane,
+)
+
+
+async def test_write_lanes() -> None:
+    """Test messages are written in order of lane, without starving bulk traffic."""
+    queue = WriteLaneQueue(100, weights={WriteLane.RESULT: 2, WriteLane.BULK: 1})
+    for index in range(3):
+        queue.put_nowait(f"bulk{index}", WriteLane.BULK)
+    for index in range(5):
+        queue.put_nowait(f"result{index}", WriteLane.RESULT)
+    queue.put_nowait("event0", WriteLane.EVENT)
+    written = [await queue.get() for _ in range(len(queue))]
+    assert written == [
+        "result0",
+        "result1",
+        "event0",
+        "bulk0",
+        "result2",
+        "result3",
+        "bulk1",
+        "result4",
+        "bulk2",
+    ]
+    metrics = queue.stats[WriteLane.BULK].get_metrics()
+    assert metrics.queued == 0
+    assert metrics.written == 3
+
+    assert get_event_lane(EventType.ATTRIBUTE_UPDATED) == WriteLane.BULK
+    assert get_event_lane(EventType.NODE_EVENT) == WriteLane.EVENT
+
+
+async def test_write_lanes_barrier() -> None:
+    """Test node lifecycle events are never reordered with other messages."""
+    assert EventType.NODE_REMOVED in BARRIER_EVENTS
+    assert EventType.NODE_EVENT not in BARRIER_EVENTS
+    queue = WriteLaneQueue(100)
+    for index in range(3):
+        queue.put_nowait(f"attribute_updated{index}", WriteLane.BULK)
+    queue.put_nowait("node_removed", WriteLane.EVENT, barrier=True)
+    queue.put_nowait("result0", WriteLane.RESULT)
+    queue.put_nowait("node_added", WriteLane.EVENT, barrier=True)
+    queue.put_nowait("attribute_updated3", WriteLane.BULK)
+    queue.put_nowait("result1", WriteLane.RESULT)
+    written = [await queue.get() for _ in range(len(queue))]
+    assert written == [
+        "attribute_updated0",
+        "attribute_updated1",
+        "attribute_updated2",
+        "node_removed",
+        "result0",
+        "node_added",
+        "result1",
+        "attribute_updated3",
+    ]
+    # messages before the barrier are still written in order of lane
+    queue.put_nowait("attribute_updated4", WriteLane.BULK)
+    queue.put_nowait("result2", WriteLane.RESULT)
+    queue.put_nowait("node_removed", WriteLane.EVENT, barrier=True)
+    assert [await queue.get() for _ in range(len(queue))] == [
+        "result2",
+        "attribute_updated4",
+        "node_removed",
+    ]
+
+
+async def test_write_lanes_close() -> None:
+    """Test the queue is bounded and returns None when closed and drained."""
+    queue = WriteLaneQueue(2)
+    reader = asyncio.create_task(queue.get())
+    await asyncio.sleep(0)
+    queue.put_nowait("result", WriteLane.RESULT)
+    assert await reader == "result"
+    queue.put_nowait("bulk0", WriteLane.BULK)
+    queue.put_nowait("bulk1", WriteLane.BULK)
+    with pytest.raises(asyncio.QueueFull):
+        queue.put_nowait("result", WriteLane.RESULT)
+    queue.close()
+    assert await queue.get() == "bulk0"
+    queue.clear()
+    assert queue.stats[WriteLane.BULK].queued == 0
+    assert await queue.get() is None
+
+
+async def test_write_lanes_next_lane() -> None:
+    """Test the lane of the next message can be awaited and peeked."""
+    queue = WriteLaneQueue(10)
+    assert queue.peek_lane() is None
+    with pytest.raises(asyncio.QueueEmpty):
+        queue.get_nowait()
+    asyncio.get_running_loop().call_later(
+        0.01, queue.put_nowait, "event", WriteLane.EVENT
+    )
+    assert await queue.next_lane() == WriteLane.EVENT
+    queue.put_nowait("result", WriteLane.RESULT)
+    assert queue.peek_lane() == WriteLane.RESULT
+    assert queue.get_nowait() == "result"
+    assert queue.peek_lane() == WriteLane.EVENT
+    assert queue.get_nowait() == "event"
+    queue.close()
+    assert await queue.next_lane() is None
@@ -0,0 +1,175 @@
+"""Test the wrapper of the CHIP SDK device controller."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from chip.clusters import Attribute
+from chip.exceptions import ChipStackError
+import pytest
+
+from matter_server.server.helpers.interaction_queue import InteractionPriority
+from matter_server.server.sdk import ChipDeviceControllerWrapper
+
+ON_OFF = Attribute.AttributePath(EndpointId=1, ClusterId=6, AttributeId=0)
+ON_OFF_CLUSTER = Attribute.AttributePath(EndpointId=1, ClusterId=6)
+
+
+class FakeRead:
+    """Replacement of the (SDK) read which completes when released."""
+
+    def __init__(self) -> None:
+        """Initialize the fake read."""
+        self.calls: list[tuple[Any, ...]] = []
+        self.release = asyncio.Event()
+        self.error: Exception | None = None
+
+    async def __call__(self, *args: Any) -> list[tuple[Any, ...]]:
+        """Read the attributes."""
+        self.calls.append(args)
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return [args]
+
+
+@pytest.fixture(name="wrapper")
+def wrapper_fixture() -> ChipDeviceControllerWrapper:
+    """Return the SDK wrapper (with a mocked SDK device controller)."""
+    return ChipDeviceControllerWrapper(MagicMock(interaction_budgets=None), Path("paa"))
+
+
+@pytest.fixture(name="sdk")
+def sdk_fixture(
+    wrapper: ChipDeviceControllerWrapper,
+) -> tuple[ChipDeviceControllerWrapper, FakeRead]:
+    """Return the SDK wrapper with a fake read."""
+    sdk = wrapper
+    fake_read = FakeRead()
+    sdk._read = fake_read  # type: ignore[method-assign]
+    return sdk, fake_read
+
+
+async def test_read_single_flight(
+    sdk: tuple[ChipDeviceControllerWrapper, FakeRead],
+) -> None:
+    """Test concurrent reads of the same (or covered) paths share a single read."""
+    wrapper, fake_read = sdk
+    first = asyncio.create_task(wrapper.read(1, [ON_OFF_CLUSTER]))
+    await asyncio.sleep(0)
+    same = asyncio.create_task(wrapper.read(1, [ON_OFF_CLUSTER]))
+    subset = asyncio.create_task(wrapper.read(1, [ON_OFF]))
+    # lower priority reads join as well
+    background = asyncio.create_task(
+        wrapper.read(1, [ON_OFF], priority=InteractionPriority.BACKGROUND)
+    )
+    await asyncio.sleep(0)
+    fake_read.release.set()
+    results = await asyncio.gather(first, same, subset, background)
+    assert len(fake_read.calls) == 1
+    assert all(result is results[0] for result in results)
+    assert wrapper._inflight_reads == {}
+
+
+async def test_read_not_covered(
+    sdk: tuple[ChipDeviceControllerWrapper, FakeRead],
+) -> None:
+    """Test reads which are not covered by the in-flight read are not joined."""
+    wrapper, fake_read = sdk
+    tasks = [
+        asyncio.create_task(
+            wrapper.read(1, [ON_OFF], priority=InteractionPriority.BACKGROUND)
+        )
+    ]
+    await asyncio.sleep(0)
+    tasks += [
+        # other paths
+        asyncio.create_task(
+            wrapper.read(1, [Attribute.AttributePath(EndpointId=1, ClusterId=8)])
+        ),
+        # other node
+        asyncio.create_task(wrapper.read(2, [ON_OFF])),
+        # not fabric filtered
+        asyncio.create_task(
+            wrapper.read(
+                1,
+                [ON_OFF],
+                fabric_filtered=False,
+                priority=InteractionPriority.BACKGROUND,
+            )
+        ),
+        # a higher priority does not wait for the (queued) background read
+        asyncio.create_task(wrapper.read(1, [ON_OFF])),
+    ]
+    # let the reads (and the read tasks they create) start
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert len(fake_read.calls) == 5
+    assert fake_read.calls[-1][3] == InteractionPriority.READ
+    fake_read.release.set()
+    await asyncio.gather(*tasks)
+    assert wrapper._inflight_reads == {}
+
+
+async def test_read_single_flight_errors(
+    sdk: tuple[ChipDeviceControllerWrapper, FakeRead],
+) -> None:
+    """Test the shared read survives cancelled callers and its error is shared."""
+    wrapper, fake_read = sdk
+    first = asyncio.create_task(wrapper.read(1, [ON_OFF]))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(wrapper.read(1, [ON_OFF]))
+    await asyncio.sleep(0)
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert len(wrapper._inflight_reads[1]) == 1
+    fake_read.error = RuntimeError("read failed")
+    fake_read.release.set()
+    with pytest.raises(RuntimeError, match="read failed"):
+        await second
+    assert len(fake_read.calls) == 1
+    assert wrapper._inflight_reads == {}
+
+
+async def test_failed_interaction_invalidates_session(
+    wrapper: ChipDeviceControllerWrapper,
+) -> None:
+    """Test a failed interaction drops the cached session of the node."""
+    chip_controller = MagicMock()
+    chip_controller.GetConnectedDevice = AsyncMock(return_value=MagicMock())
+    chip_controller.SendCommand = AsyncMock(
+        side_effect=[ChipStackError(0x32, "Timeout"), "result"]
+    )
+    wrapper._chip_controller = chip_controller
+    with pytest.raises(ChipStackError):
+        await wrapper.send_command(1, 1, MagicMock())
+    assert wrapper._device_proxies == {}
+    assert await wrapper.send_command(1, 1, MagicMock()) == "result"
+    assert chip_controller.GetConnectedDevice.await_count == 2
+    assert 1 in wrapper._device_proxies
+
+
+async def test_read_retry(wrapper: ChipDeviceControllerWrapper) -> None:
+    """Test a failed read is retried once (with a new session)."""
+    with patch.object(
+        wrapper,
+        "_read_once",
+        AsyncMock(side_effect=[ChipStackError(0x32, "Timeout"), "result"]),
+    ) as read_once:
+        assert await wrapper.read(1, [ON_OFF]) == "result"
+    assert read_once.await_count == 2
+
+    with (
+        patch.object(
+            wrapper,
+            "_read_once",
+            AsyncMock(side_effect=ChipStackError(0x32, "Timeout")),
+        ) as read_once,
+        pytest.raises(ChipStackError),
+    ):
+        await wrapper.read(1, [ON_OFF])
+    assert read_once.await_count == 2
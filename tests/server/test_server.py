@@ -9,10 +9,11 @@ import pytest
 
 from matter_server.common.helpers.api import parse_arguments
 from matter_server.common.models import APICommand
-from matter_server.server.server import MatterServer
+from matter_server.server.server import MatterServer, ServerOptions
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator, Generator
+    from pathlib import Path
 
 pytestmark = pytest.mark.usefixtures(
     "application",
@@ -300,3 +301,25 @@ async def test_server_start(
             {"node_id": 1, "invalid": 2},
             strict=True,
         )
+
+
+async def test_server_unix_socket(tmp_path: Path) -> None:
+    """Test the server serves the api on a unix socket (owner and group only)."""
+    unix_socket = tmp_path / "api.sock"
+    server = MatterServer(
+        "test_storage_path",
+        1234,
+        5678,
+        5580,
+        None,
+        options=ServerOptions(unix_socket=str(unix_socket)),
+    )
+    with patch("matter_server.server.server.web.UnixSite", autospec=True) as unix_site:
+        # the (mocked) site does not create the socket
+        unix_socket.touch(0o666)
+        await server.start()
+        assert unix_site.call_args.args[1] == str(unix_socket)
+        assert unix_site.return_value.start.call_count == 1
+        assert unix_socket.stat().st_mode & 0o777 == 0o660
+        await server.stop()
+    assert unix_site.return_value.stop.call_count == 1
@@ -0,0 +1,113 @@
+"""Test the server in split process mode (with a separate front-end process)."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, patch
+
+from aiohttp import ClientSession
+from aiohttp.test_utils import unused_port
+import pytest
+
+from matter_server.client.client import MatterClient
+from matter_server.client.exceptions import CannotConnect
+from matter_server.common.models import MatterNodeData
+from matter_server.server.server import MatterServer, ServerOptions
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+NODE = MatterNodeData(
+    node_id=1,
+    date_commissioned=datetime.now(UTC),
+    last_interview=datetime.now(UTC),
+    interview_version=6,
+    available=True,
+    attributes={"0/40/5": "Node 1", "1/6/0": False},
+)
+
+
+@pytest.fixture(name="device_controller", autouse=True)
+def device_controller_fixture() -> Generator[MagicMock, None, None]:
+    """Return a mocked device controller (and mock the other CHIP dependencies)."""
+    with (
+        patch("matter_server.server.server.MatterStack", autospec=True),
+        patch("matter_server.server.server.StorageController", autospec=True),
+        patch("matter_server.server.server.VendorInfo", autospec=True),
+        patch("matter_server.server.server.fetch_certificates", autospec=True),
+        patch(
+            "matter_server.server.server.MatterDeviceController", autospec=True
+        ) as device_controller,
+    ):
+        controller = device_controller.return_value
+        controller.compressed_fabric_id = 1234
+        controller.wifi_credentials_set = False
+        controller.thread_credentials_set = False
+        controller.get_nodes.return_value = [NODE]
+        yield device_controller
+
+
+async def _connect(client: MatterClient) -> None:
+    """Connect to the front-end process once it is listening."""
+    for _ in range(300):
+        try:
+            await client.connect()
+        except CannotConnect:
+            await asyncio.sleep(0.1)
+        else:
+            return
+    await client.connect()
+
+
+async def test_split_process(tmp_path: Path) -> None:
+    """Test clients are served by the front-end process (relaying to the server)."""
+    server = MatterServer(
+        str(tmp_path),
+        1234,
+        5678,
+        unused_port(),
+        ["127.0.0.1"],
+        options=ServerOptions(split_frontend=True),
+    )
+    await server.start()
+    frontend = server._frontend
+    assert frontend is not None
+    try:
+        assert frontend.pid is not None
+        await _check_frontend(server)
+    finally:
+        await server.stop()
+    assert frontend.pid is None
+    assert frontend.restarts == 0
+
+
+async def _check_frontend(server: MatterServer) -> None:
+    """Check the api of the server is served by the front-end process."""
+
+    async def echo(value: int) -> int:
+        """Return the value."""
+        return value
+
+    server.register_api_command("echo", echo)
+    async with ClientSession() as session:
+        client = MatterClient(f"ws://127.0.0.1:{server.port}/ws", session)
+        await asyncio.wait_for(_connect(client), 60)
+        init_ready = asyncio.Event()
+        listen_task = asyncio.create_task(client.start_listening(init_ready))
+        await asyncio.wait_for(init_ready.wait(), 10)
+        # the nodes are served from the mirror of the front-end process
+        assert client.server_info is not None
+        assert client.server_info.compressed_fabric_id == 1234
+        assert [node.node_id for node in client.get_nodes()] == [1]
+        # commands are forwarded to the server
+        assert await client.send_command("echo", value=1) == 1
+        await client.disconnect()
+        await listen_task
+
+        # and so are the (other) HTTP requests
+        async with session.get(f"http://127.0.0.1:{server.port}/info") as resp:
+            assert resp.status == 200
+            assert (await resp.json())["compressed_fabric_id"] == 1234
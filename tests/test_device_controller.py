@@ -1,8 +1,25 @@
 """Device controller tests."""
 
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from pathlib import Path
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from chip.clusters import Objects as Clusters
+from chip.exceptions import ChipStackError
 import pytest
 
-from matter_server.server.device_controller import RE_MDNS_SERVICE_NAME
+from matter_server.common.errors import ServerBusy
+from matter_server.common.models import MatterNodeData
+from matter_server.server.device_controller import (
+    DATA_KEY_LAST_EVENT_NUMBERS,
+    RE_MDNS_SERVICE_NAME,
+    MatterDeviceController,
+)
+from matter_server.server.helpers.subscriptions import SubscriptionTier
 
 
 @pytest.mark.parametrize(
@@ -37,3 +54,166 @@ def test_valid_mdns_service_names(name, expected):
 def test_invalid_mdns_service_names(name):
     """Test invalid mDNS service names."""
     assert RE_MDNS_SERVICE_NAME.match(name) is None
+
+
+@pytest.fixture(name="controller")
+def controller_fixture() -> MatterDeviceController:
+    """Return a device controller (with a mocked SDK wrapper) with a single node."""
+    server = MagicMock(
+        event_log_size=100,
+        attribute_throttle_rules=[],
+        poll_interval_min=30,
+        poll_interval_max=300,
+        attribute_history_clusters=set(),
+        attribute_history_size=10,
+        aggregated_attributes=[],
+        aggregate_windows=[],
+        subscription_exclude_clusters={53},
+        tiered_subscriptions=False,
+    )
+    with patch(
+        "matter_server.server.device_controller.ChipDeviceControllerWrapper",
+        autospec=True,
+    ):
+        controller = MatterDeviceController(server, Path("paa"), Path("ota"))
+    controller._nodes[1] = MatterNodeData(
+        node_id=1,
+        date_commissioned=datetime(2024, 1, 1),
+        last_interview=datetime(2024, 1, 1),
+        interview_version=6,
+        attributes={"0/29/0": [], "0/40/1": "Vendor", "0/53/7": [], "1/6/0": True},
+    )
+    return controller
+
+
+def _create_subscription() -> MagicMock:
+    """Return a (mocked) subscription transaction."""
+    sub = MagicMock()
+    sub.GetTLVAttributes.return_value = {}
+    sub.GetReportingIntervalsSeconds.return_value = (1, 60)
+    return sub
+
+
+async def test_subscribe_wildcard_fallback(controller: MatterDeviceController) -> None:
+    """Test a refused selective subscription falls back to a wildcard subscription."""
+    sdk = controller._chip_device_controller
+    sdk.shutdown_subscription = AsyncMock()
+    sdk.read_attribute = AsyncMock(
+        side_effect=[ChipStackError(0x5C8, "Paths exhausted"), _create_subscription()]
+    )
+    await controller._subscribe_node(1)
+    assert sdk.read_attribute.call_count == 2
+    # the first subscription leaves out the excluded cluster
+    selective_paths = sdk.read_attribute.call_args_list[0].args[1]
+    assert len(selective_paths) == 3
+    assert sdk.read_attribute.call_args_list[1].args[1] == [()]
+    assert (
+        sdk.read_attribute.call_args_list[1].kwargs["subscription_tier"]
+        == SubscriptionTier.FAST
+    )
+    assert sdk.shutdown_subscription.call_count == 2
+    assert controller._nodes[1].available
+
+    # a failing wildcard subscription is not retried
+    sdk.read_attribute = AsyncMock(side_effect=ChipStackError(0x32, "Timeout"))
+    controller.server.subscription_exclude_clusters = set()
+    with pytest.raises(ChipStackError):
+        await controller._subscribe_node(1)
+    assert sdk.read_attribute.call_count == 1
+
+
+def _create_event(event_number: int, data: object | None = None) -> MagicMock:
+    """Return a (mocked) event of the basic information cluster."""
+    return MagicMock(
+        Header=MagicMock(
+            EventNumber=event_number,
+            EndpointId=0,
+            ClusterId=Clusters.BasicInformation.id,
+            EventId=0,
+            Priority=1,
+            Timestamp=0,
+            TimestampType=0,
+        ),
+        Data=data,
+    )
+
+
+async def test_event_deduplication(controller: MatterDeviceController) -> None:
+    """Test replayed events are dropped and a reset event counter is followed."""
+    controller.server.loop = asyncio.get_running_loop()
+    sdk = controller._chip_device_controller
+    sdk.shutdown_subscription = AsyncMock()
+    sdk.read_attribute = AsyncMock(return_value=_create_subscription())
+    await controller._subscribe_node(1)
+    assert sdk.read_attribute.call_args.kwargs["event_number_filter"] is None
+    sub = sdk.read_attribute.return_value
+    event_callback = sub.SetEventUpdateCallback.call_args.args[0]
+
+    async def send_events(*events: MagicMock) -> list[int]:
+        """Send the events, return the event numbers which were not dropped."""
+        for event in events:
+            event_callback(event, sub)
+        await asyncio.sleep(0)
+        return [x.event_number for x in controller.event_log.get_latest(100)]
+
+    assert await send_events(_create_event(10), _create_event(11)) == [10, 11]
+    # replayed events are dropped
+    assert await send_events(_create_event(10), _create_event(11)) == [10, 11]
+    assert await send_events(_create_event(12)) == [10, 11, 12]
+    assert controller._last_event_numbers[1] == 12
+    # a (re)start of the node resets the event numbers
+    startup = Clusters.BasicInformation.Events.StartUp(softwareVersion=1)
+    assert await send_events(_create_event(1, startup), _create_event(2)) == [
+        10,
+        11,
+        12,
+        1,
+        2,
+    ]
+    # as does a large regression of the event number
+    controller._last_event_numbers[1] = 5000
+    assert await send_events(_create_event(3)) == [10, 11, 12, 1, 2, 3]
+
+    # the events are not filtered (and hidden) after the reset of the node
+    await controller._subscribe_node(1)
+    assert sdk.read_attribute.call_args.kwargs["event_number_filter"] is None
+    # but resume after the last event otherwise
+    await controller._subscribe_node(1)
+    assert sdk.read_attribute.call_args.kwargs["event_number_filter"] == 4
+
+
+async def test_last_event_numbers_saved(controller: MatterDeviceController) -> None:
+    """Test the last event numbers are written to storage in batches."""
+    controller.server.loop = asyncio.get_running_loop()
+    controller._nodes[2] = controller._nodes[1]
+    storage = controller.server.storage
+    for node_id, event_number in ((1, 5), (2, 7), (1, 6)):
+        controller._last_event_numbers[node_id] = event_number
+        controller._schedule_save_last_event_numbers(node_id)
+    storage.set.assert_not_called()
+    assert controller._last_event_numbers_timer is not None
+    controller._save_last_event_numbers()
+    assert sorted(x.kwargs["subkey"] for x in storage.set.call_args_list) == ["1", "2"]
+    storage.set.assert_any_call(DATA_KEY_LAST_EVENT_NUMBERS, value=6, subkey="1")
+    assert controller._last_event_numbers_timer is None
+
+
+async def test_custom_attributes_poller_busy(
+    controller: MatterDeviceController,
+) -> None:
+    """Test a poll rejected by the admission control is postponed (not dropped)."""
+    controller.server.loop = asyncio.get_running_loop()
+    controller._nodes[1].available = True
+    controller._polled_attributes.set_attributes(1, {"1/6/0"}, time.time() - 3600)
+    with (
+        patch.object(
+            controller, "_read_attribute", AsyncMock(side_effect=ServerBusy("busy"))
+        ),
+        patch("matter_server.server.device_controller.asyncio.sleep"),
+    ):
+        await controller._custom_attributes_poller()
+    attribute = controller._polled_attributes.get_attributes(1)["1/6/0"]
+    assert attribute.next_poll > time.time()
+    # the poller is rescheduled
+    assert controller._custom_attribute_poller_timer is not None
+    controller._custom_attribute_poller_timer.cancel()